@@ -2,27 +2,39 @@ import base64
 import re
 import time
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from functools import cached_property
+from pathlib import Path
+from threading import Lock
 from typing import Any, Generator
 
 import orjson
 import requests
-from cachetools import Cache, LRUCache
 from pydantic.v1 import Field
 from sekoia_automation.checkpoint import CheckpointTimestamp, TimeUnit
 from sekoia_automation.connector import Connector, DefaultConnectorConfiguration
 
 from . import AkamaiModule
 from .client import ApiClient
+from .dedup import DedupCache
 from .logging import get_logger
-from .metrics import EVENTS_LAG, FORWARD_EVENTS_DURATION, INCOMING_MESSAGES, OUTCOMING_EVENTS
+from .metrics import (
+    DEDUP_CACHE_HITS,
+    DEDUP_CACHE_MISSES,
+    EVENTS_LAG,
+    FORWARD_EVENTS_DURATION,
+    INCOMING_MESSAGES,
+    OUTCOMING_EVENTS,
+)
 
 logger = get_logger()
 
 
 class AkamaiWAFLogsConnectorConfiguration(DefaultConnectorConfiguration):
-    config_id: str = Field(..., description="The Web Security Configuration ID")
+    config_id: str = Field(
+        ..., description="The Web Security Configuration ID. Several IDs can be separated by commas"
+    )
     frequency: int = Field(60, description="Batch frequency in seconds", ge=1)
 
 
@@ -35,32 +47,82 @@ class AkamaiWAFLogsConnector(Connector):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
 
-        self.cursor = CheckpointTimestamp(
-            path=self._data_path,
+        # The checkpoint of the first configuration
+        self.cursor = self.create_cursor(Path(self._data_path))
+        self.from_timestamp: int = self.cursor.offset
+
+        # The checkpoints of the other configurations, by configuration ID
+        self.cursors: dict[str, CheckpointTimestamp] = {}
+        self.from_timestamps: dict[str, int] = {}
+
+        # This cache should be big enough to cover all events within 1 second.
+        self.cache_path = Path(self._data_path) / "events_cache.bin"
+        self.cache_size = 100_000
+        self.events_cache: DedupCache = self.load_events_cache()
+        self.events_cache_lock = Lock()
+
+    @staticmethod
+    def create_cursor(path: Path) -> CheckpointTimestamp:
+        return CheckpointTimestamp(
+            path=path,
             time_unit=TimeUnit.SECOND,
             start_at=timedelta(hours=1),
             ignore_older_than=timedelta(hours=12),
         )
-        self.from_timestamp: int = self.cursor.offset
 
-        # This cache should be big enough to cover all events within 1 second.
-        self.cache_size = 10_000
-        self.events_cache: Cache = self.load_events_cache()
+    @property
+    def config_ids(self) -> list[str]:
+        return [config_id.strip() for config_id in str(self.configuration.config_id).split(",") if config_id.strip()]
+
+    def is_first_config(self, config_id: str) -> bool:
+        return config_id == self.config_ids[0]
+
+    def get_cursor(self, config_id: str) -> CheckpointTimestamp:
+        if self.is_first_config(config_id):
+            return self.cursor
+
+        if config_id not in self.cursors:
+            # each additional configuration has its own context file
+            path = Path(self._data_path) / f"config_{config_id}"
+            path.mkdir(parents=True, exist_ok=True)
+            self.cursors[config_id] = self.create_cursor(path)
+
+        return self.cursors[config_id]
+
+    def get_from_timestamp(self, config_id: str) -> int:
+        if self.is_first_config(config_id):
+            return self.from_timestamp
+
+        if config_id not in self.from_timestamps:
+            self.from_timestamps[config_id] = self.get_cursor(config_id).offset
+
+        return self.from_timestamps[config_id]
+
+    def set_from_timestamp(self, config_id: str, timestamp: int) -> None:
+        if self.is_first_config(config_id):
+            self.from_timestamp = timestamp
+        else:
+            self.from_timestamps[config_id] = timestamp
 
-    def load_events_cache(self) -> Cache:
-        result: LRUCache = LRUCache(maxsize=self.cache_size)
+        self.get_cursor(config_id).offset = timestamp
 
+    def load_events_cache(self) -> DedupCache:
+        result = DedupCache(maxsize=self.cache_size)
+
+        if self.cache_path.exists():
+            result.load(self.cache_path)
+            return result
+
+        # migrate the cache previously persisted as a list of identifiers in the context
         with self.cursor._context as cache:
             events_ids = cache.get("events_cache", [])
 
-        for event_id in events_ids:
-            result[event_id] = True
-
+        result.update(events_ids)
         return result
 
     def save_events_cache(self) -> None:
-        with self.cursor._context as cache:
-            cache["events_cache"] = list(self.events_cache.keys())
+        # only the new identifiers are appended to the cache file
+        self.events_cache.flush(self.cache_path)
 
     @cached_property
     def client(self) -> ApiClient:
@@ -130,8 +192,8 @@ class AkamaiWAFLogsConnector(Connector):
         if "responseHeaders" in event.get("httpMessage", {}):
             event["httpMessage"]["responseHeaders"] = response_headers
 
-    def __fetch_next_events(self, from_date: int) -> Generator[list, None, None]:
-        url = f"{self.module.configuration.base_url}/siem/v1/configs/{self.configuration.config_id}"
+    def __fetch_next_events(self, config_id: str, from_date: int) -> Generator[tuple[list, int], None, None]:
+        url = f"{self.module.configuration.base_url}/siem/v1/configs/{config_id}"
         response = self.client.get(
             url=url, params={"from": from_date, "limit": self.PAGE_SIZE}, timeout=60, stream=True
         )
@@ -140,6 +202,7 @@ class AkamaiWAFLogsConnector(Connector):
             self.__handle_response_error(response)
 
             page = []
+            latest_timestamp = 0
             offset = None
 
             for line in response.iter_lines():
@@ -149,12 +212,17 @@ class AkamaiWAFLogsConnector(Connector):
                         self.process_event(item)
                         page.append(item)
 
+                        # track the most recent event while reading the page
+                        timestamp = int(item["httpMessage"]["start"])
+                        if timestamp > latest_timestamp:
+                            latest_timestamp = timestamp
+
                     else:
                         offset = item["offset"]
                         # response context - last JSON line
                         if len(page) > 0:
                             INCOMING_MESSAGES.labels(intake_key=self.configuration.intake_key).inc(len(page))
-                            yield page
+                            yield page, latest_timestamp
 
                         else:
                             EVENTS_LAG.labels(intake_key=self.configuration.intake_key).set(0)
@@ -167,14 +235,13 @@ class AkamaiWAFLogsConnector(Connector):
                 url=url, params={"offset": offset, "limit": self.PAGE_SIZE}, timeout=60, stream=True
             )
 
-    def fetch_events(self) -> Generator[list, None, None]:
-        most_recent_date_seen: int = self.from_timestamp
+    def fetch_events(self, config_id: str | None = None) -> Generator[list, None, None]:
+        config_id = config_id or self.config_ids[0]
+        from_timestamp = self.get_from_timestamp(config_id)
+        most_recent_date_seen: int = from_timestamp
 
-        for next_events in self.__fetch_next_events(most_recent_date_seen):
+        for next_events, latest_timestamp in self.__fetch_next_events(config_id, most_recent_date_seen):
             if next_events:
-                latest_event = max(next_events, key=lambda x: int(x["httpMessage"]["start"]))
-                latest_timestamp = int(latest_event["httpMessage"]["start"])
-
                 if latest_timestamp > most_recent_date_seen:
                     most_recent_date_seen = latest_timestamp
 
@@ -182,9 +249,8 @@ class AkamaiWAFLogsConnector(Connector):
                 yield next_events
 
         # save the most recent date
-        if most_recent_date_seen > self.from_timestamp:
-            self.from_timestamp = most_recent_date_seen
-            self.cursor.offset = most_recent_date_seen
+        if most_recent_date_seen > from_timestamp:
+            self.set_from_timestamp(config_id, most_recent_date_seen)
 
             delta_time = datetime.now(timezone.utc).timestamp() - most_recent_date_seen
             current_lag = int(delta_time)
@@ -229,13 +295,16 @@ class AkamaiWAFLogsConnector(Connector):
             self.events_cache[event_id] = True
             yield event
 
-    def next_batch(self):
-        # save the starting time
-        batch_start_time = time.time()
+    def forward_events(self, config_id: str) -> None:
+        for events in self.fetch_events(config_id):
+            with self.events_cache_lock:
+                new_events = list(self.filter_processed_events(events))
+                cache_hits, cache_misses = self.events_cache.pop_stats()
+
+            DEDUP_CACHE_HITS.labels(intake_key=self.configuration.intake_key).inc(cache_hits)
+            DEDUP_CACHE_MISSES.labels(intake_key=self.configuration.intake_key).inc(cache_misses)
 
-        # Fetch next batch
-        for events in self.fetch_events():
-            batch_of_events = [orjson.dumps(event).decode("utf-8") for event in self.filter_processed_events(events)]
+            batch_of_events = [orjson.dumps(event).decode("utf-8") for event in new_events]
 
             # if the batch is full, push it
             if len(batch_of_events) > 0:
@@ -246,7 +315,9 @@ class AkamaiWAFLogsConnector(Connector):
                 OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(batch_of_events))
 
                 self.push_events_to_intakes(events=batch_of_events)
-                self.save_events_cache()
+
+                with self.events_cache_lock:
+                    self.save_events_cache()
 
             else:
                 self.log(
@@ -254,6 +325,19 @@ class AkamaiWAFLogsConnector(Connector):
                     level="info",
                 )
 
+    def next_batch(self):
+        # save the starting time
+        batch_start_time = time.time()
+
+        # Fetch next batch, concurrently for each configuration
+        config_ids = self.config_ids
+        if len(config_ids) == 1:
+            self.forward_events(config_ids[0])
+        else:
+            with ThreadPoolExecutor(max_workers=len(config_ids)) as executor:
+                for future in [executor.submit(self.forward_events, config_id) for config_id in config_ids]:
+                    future.result()
+
         # get the ending time and compute the duration to fetch the events
         batch_end_time = time.time()
         batch_duration = int(batch_end_time - batch_start_time)
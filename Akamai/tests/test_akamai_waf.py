@@ -1,4 +1,5 @@
 from datetime import datetime, timezone
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -255,3 +256,77 @@ def test_long_next_batch_should_not_sleep(trigger, response_1, response_2):
 
         assert trigger.push_events_to_intakes.call_count == 1
         assert mock_time.sleep.call_count == 0
+
+
+def test_events_cache_migration_and_persistence(trigger, data_storage):
+    # the cache was previously persisted as a list of identifiers in the context
+    with trigger.cursor._context as cache:
+        cache["events_cache"] = ["request-1", "request-2"]
+
+    trigger.cache_path.unlink(missing_ok=True)
+    events_cache = trigger.load_events_cache()
+    assert "request-1" in events_cache
+    assert "request-3" not in events_cache
+
+    trigger.events_cache = events_cache
+    trigger.events_cache.add("request-3")
+    trigger.save_events_cache()
+
+    assert trigger.cache_path.exists()
+    assert "request-3" in trigger.load_events_cache()
+
+
+def test_next_batch_with_several_configurations(trigger, data_storage, fake_time, response_1, response_2):
+    trigger.configuration.config_id = "1, 2"
+
+    with patch("akamai_modules.connector_akamai_waf.time") as mock_time, requests_mock.Mocker() as mock_requests:
+        for config_id in ("1", "2"):
+            mock_requests.get(
+                f"https://example.com/siem/v1/configs/{config_id}?limit=60000",
+                status_code=200,
+                content=response_1.replace(b'"requestId": 1', f'"requestId": "{config_id}"'.encode()),
+            )
+            mock_requests.get(
+                f"https://example.com/siem/v1/configs/{config_id}?offset=OFFSET_TOKEN&limit=60000",
+                status_code=200,
+                content=response_2,
+            )
+
+        mock_time.time.side_effect = [1666711174.0, 1666711174.0 + 120]
+
+        with freeze_time(fake_time):
+            trigger.next_batch()
+
+    assert trigger.push_events_to_intakes.call_count == 2
+    assert trigger.from_timestamp == 1743505200
+    assert trigger.from_timestamps == {"2": 1743505200}
+
+    # each configuration has its own checkpoint
+    with freeze_time(fake_time):
+        assert trigger.create_cursor(Path(data_storage) / "config_2").offset == 1743505200
+
+
+def test_next_batch_reports_dedup_cache_stats(trigger, response_1, response_2):
+    with (
+        patch("akamai_modules.connector_akamai_waf.time") as mock_time,
+        patch("akamai_modules.connector_akamai_waf.DEDUP_CACHE_HITS") as mock_hits,
+        patch("akamai_modules.connector_akamai_waf.DEDUP_CACHE_MISSES") as mock_misses,
+        requests_mock.Mocker() as mock_requests,
+    ):
+        mock_requests.get(
+            "https://example.com/siem/v1/configs/1?from=1743505199&limit=60000",
+            status_code=200,
+            content=response_1,
+        )
+        mock_requests.get(
+            "https://example.com/siem/v1/configs/1?offset=OFFSET_TOKEN&limit=60000",
+            status_code=200,
+            content=response_2,
+        )
+        mock_time.time.side_effect = [1666711174.0, 1666711174.0 + 16]
+
+        trigger.next_batch()
+
+    # the three events share the same identifier
+    assert sum(call.args[0] for call in mock_hits.labels.return_value.inc.call_args_list) == 2
+    assert sum(call.args[0] for call in mock_misses.labels.return_value.inc.call_args_list) == 1
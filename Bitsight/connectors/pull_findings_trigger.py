@@ -2,13 +2,12 @@ import asyncio
 import time
 from asyncio import Queue
 from datetime import datetime, timedelta, timezone
-from functools import reduce
 from typing import Annotated, Any, Optional, TypeAlias, cast
 
 import orjson
 from loguru import logger
 from pydantic import Field
-from pydantic.v1 import BaseModel
+from pydantic.v1 import BaseModel, PrivateAttr
 from sekoia_automation.aio.connector import AsyncConnector
 from sekoia_automation.connector import DefaultConnectorConfiguration
 from sekoia_automation.storage import PersistentJSON
@@ -59,13 +58,28 @@ class Checkpoint(BaseModel):
     values: list[CompanyCheckpoint] = []
     time_delta: int = cast(int, None)
 
+    # position of the checkpoint of each company in `values`
+    _positions: dict[str, int] = PrivateAttr(default_factory=dict)
+
+    def __init__(self, **data: Any) -> None:
+        super().__init__(**data)
+        self._positions = {value.company_uuid: position for position, value in enumerate(self.values)}
+
     def get_company_checkpoint(self, company_uuid: str) -> CompanyCheckpoint:
-        for value in self.values:
-            if value.company_uuid == company_uuid:
-                return value.with_updated_last_seen(time_delta=self.time_delta)
+        position = self._positions.get(company_uuid)
+        if position is not None:
+            return self.values[position].with_updated_last_seen(time_delta=self.time_delta)
 
         return CompanyCheckpoint(company_uuid=company_uuid).with_updated_last_seen(time_delta=self.time_delta)
 
+    def set_company_checkpoint(self, company_checkpoint: CompanyCheckpoint) -> None:
+        position = self._positions.get(company_checkpoint.company_uuid)
+        if position is None:
+            self._positions[company_checkpoint.company_uuid] = len(self.values)
+            self.values.append(company_checkpoint)
+        else:
+            self.values[position] = company_checkpoint
+
     def recalculate_company_checkpoint(self, company_uuid: str) -> None:
         company_checkpoint = self.get_company_checkpoint(company_uuid)
         if company_checkpoint is None:
@@ -85,7 +99,7 @@ class Checkpoint(BaseModel):
             company_checkpoint.last_seen = next_day.strftime("%Y-%m-%d")
             company_checkpoint.offset = 1
 
-        self.values = [value for value in self.values if value.company_uuid != company_uuid] + [company_checkpoint]
+        self.set_company_checkpoint(company_checkpoint)
 
     def increment_company_checkpoint(self, company_uuid: str, last_seen: str) -> None:
         company_checkpoint = self.get_company_checkpoint(company_uuid)
@@ -103,7 +117,7 @@ class Checkpoint(BaseModel):
         elif last_seen_datetime == checkpoint_last_seen_datetime:
             company_checkpoint.offset = (company_checkpoint.offset or 0) + 1
 
-        self.values = [value for value in self.values if value.company_uuid != company_uuid] + [company_checkpoint]
+        self.set_company_checkpoint(company_checkpoint)
 
 
 class PullFindingsConnectorConfiguration(DefaultConnectorConfiguration):
@@ -112,6 +126,11 @@ class PullFindingsConnectorConfiguration(DefaultConnectorConfiguration):
     frequency: int = 60
     batch_limit: int = 100
     timedelta: int = 2
+    max_concurrent_companies: int = 10
+
+
+# Minimal interval, in seconds, between two savings of the checkpoint while the findings are collected
+CHECKPOINT_SAVE_INTERVAL = 10
 
 
 class PullFindingsConnector(AsyncConnector):
@@ -127,6 +146,7 @@ class PullFindingsConnector(AsyncConnector):
 
         super().__init__(*args, **kwargs)
         self.context = PersistentJSON("context.json", self._data_path)
+        self._last_checkpoint_save = time.monotonic()
 
     def get_checkpoint(self) -> Checkpoint:
         """
@@ -152,6 +172,20 @@ class PullFindingsConnector(AsyncConnector):
         with self.context as cache:
             cache["checkpoints"] = checkpoint.dict()
 
+        self._last_checkpoint_save = time.monotonic()
+
+    def save_checkpoint_periodically(self, checkpoint: Checkpoint) -> None:
+        """
+        Save checkpoints, unless they were saved less than `CHECKPOINT_SAVE_INTERVAL` seconds ago.
+
+        The companies are collected concurrently, so their progress is persisted by batches.
+
+        Args:
+            checkpoint: Checkpoint
+        """
+        if time.monotonic() - self._last_checkpoint_save >= CHECKPOINT_SAVE_INTERVAL:
+            self.save_checkpoint(checkpoint)
+
     @property
     def bitsight_client(self) -> BitsightClient:
         """
@@ -198,8 +232,26 @@ class PullFindingsConnector(AsyncConnector):
 
         return result
 
+    async def push_findings(self, data_to_push: list[dict[str, Any]]) -> int:
+        """
+        Push formatted findings to the intake.
+
+        Args:
+            data_to_push: list[dict[str, Any]]
+
+        Returns:
+            int: the number of pushed events
+        """
+        await self.push_data_to_intakes([orjson.dumps(event).decode("utf-8") for event in data_to_push])
+        pushed_events = len(data_to_push)
+        logger.info("Pushed {0} events to intakes", pushed_events)
+
+        return pushed_events
+
     async def process_findings_for_company(self, checkpoint: Checkpoint, company_id: str) -> int:
+        # The progress of the company is tracked apart, and reported in the shared checkpoint once pushed
         company_checkpoint = checkpoint.get_company_checkpoint(company_id)
+        company_progress = Checkpoint(values=[company_checkpoint.copy()], time_delta=checkpoint.time_delta)
         last_seen = company_checkpoint.last_seen
         offset = company_checkpoint.offset
 
@@ -214,27 +266,22 @@ class PullFindingsConnector(AsyncConnector):
         total_pushed_events = 0
 
         async for finding in self.bitsight_client.findings_result(company_id, last_seen, offset):
-            checkpoint.increment_company_checkpoint(company_id, finding["last_seen"])
+            company_progress.increment_company_checkpoint(company_id, finding["last_seen"])
             data_to_push.extend(self.format_finding(finding, company_id))
 
             if len(data_to_push) >= self.configuration.batch_limit:
-                await self.push_data_to_intakes([orjson.dumps(event).decode("utf-8") for event in data_to_push])
-                pushed_events = len(data_to_push)
-                logger.info("Pushed {0} events to intakes", pushed_events)
-                total_pushed_events += pushed_events
+                total_pushed_events += await self.push_findings(data_to_push)
                 data_to_push = []
-                self.save_checkpoint(checkpoint)
+                checkpoint.set_company_checkpoint(company_progress.get_company_checkpoint(company_id).copy())
+                self.save_checkpoint_periodically(checkpoint)
 
         if len(data_to_push) > 0:
-            await self.push_data_to_intakes([orjson.dumps(event).decode("utf-8") for event in data_to_push])
-            pushed_events = len(data_to_push)
-            logger.info("Pushed {0} events to intakes", pushed_events)
-            total_pushed_events += pushed_events
+            total_pushed_events += await self.push_findings(data_to_push)
 
-        checkpoint.recalculate_company_checkpoint(company_id)
-        self.save_checkpoint(checkpoint)
+        company_progress.recalculate_company_checkpoint(company_id)
+        checkpoint.set_company_checkpoint(company_progress.get_company_checkpoint(company_id).copy())
+        self.save_checkpoint_periodically(checkpoint)
 
-        # Add None to queue to indicate that all findings for this company have been fetched
         logger.info("Finished fetching findings for company {0}", company_id)
 
         return total_pushed_events
@@ -242,17 +289,27 @@ class PullFindingsConnector(AsyncConnector):
     async def next_batch(self) -> tuple[int, Checkpoint]:
         """
         Fetch next batch of findings.
+
+        The companies are processed concurrently, up to `max_concurrent_companies` at once.
+        The requests to the Bitsight API are paced by the rate limiter of the client, shared by all the companies.
         """
         logger.info("Start fetching next batch of findings. Companies {0}", self.module.configuration.company_uuids)
         checkpoint = self.get_checkpoint()
 
         company_ids = self.module.configuration.company_uuids
+        semaphore = asyncio.Semaphore(self.configuration.max_concurrent_companies)
+
+        async def process_company(company_id: str) -> int:
+            async with semaphore:
+                return await self.process_findings_for_company(checkpoint, company_id)
 
-        processed_result: Any = [
-            await self.process_findings_for_company(checkpoint, company) for company in company_ids
-        ]
+        try:
+            processed_result = await asyncio.gather(*[process_company(company) for company in company_ids])
+        finally:
+            # persist the progress of all the companies, even if one of them failed
+            self.save_checkpoint(checkpoint)
 
-        pushed_events: int = reduce(lambda x, y: x + y, processed_result)
+        pushed_events: int = sum(processed_result)
         logger.info("Finished with pushing events intakes. Total count is {0}", pushed_events)
 
         return pushed_events, self.get_checkpoint()
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
@@ -276,15 +277,75 @@ async def test_pull_findings_connector_next_batch(connector: PullFindingsConnect
 
         one_company_events = (len(findings_1) + len(findings_2)) * 2 * 3
         assert result == one_company_events * 2
-        assert (
-            finish_checkpoint
-            == Checkpoint(
-                values=[
-                    CompanyCheckpoint(company_uuid=company_id_1, last_seen=now.strftime("%Y-%m-%d"), offset=7),
-                    CompanyCheckpoint(company_uuid=company_id_2, last_seen=now.strftime("%Y-%m-%d"), offset=130),
-                ],
-                time_delta=1,
-            ).dict()
-        )
+        assert finish_checkpoint.time_delta == 1
+        assert sorted(finish_checkpoint.values, key=lambda value: value.company_uuid) == [
+            CompanyCheckpoint(company_uuid=company_id_1, last_seen=now.strftime("%Y-%m-%d"), offset=7),
+            CompanyCheckpoint(company_uuid=company_id_2, last_seen=now.strftime("%Y-%m-%d"), offset=130),
+        ]
 
         assert connector.get_checkpoint().dict() == finish_checkpoint.dict()
+
+
+def test_checkpoint_indexes_companies(session_faker: Faker):
+    """
+    Test Checkpoint updates the company checkpoints in place.
+
+    Args:
+        session_faker: Faker
+    """
+    now = datetime.utcnow().replace(microsecond=0, second=0, minute=0, hour=0)
+    last_seen = now.isoformat()
+    company_ids = [f"company{index}" for index in range(5)]
+
+    checkpoint = Checkpoint.parse_obj(
+        {"values": [{"company_uuid": company_ids[0], "last_seen": now.strftime("%Y-%m-%d"), "offset": 3}]}
+    )
+    checkpoint.time_delta = 1
+
+    for company_id in company_ids:
+        checkpoint.increment_company_checkpoint(company_id, last_seen)
+        checkpoint.increment_company_checkpoint(company_id, last_seen)
+
+    assert [value.company_uuid for value in checkpoint.values] == company_ids
+    assert checkpoint.get_company_checkpoint(company_ids[0]).offset == 5
+    assert [checkpoint.get_company_checkpoint(company_id).offset for company_id in company_ids[1:]] == [2] * 4
+
+
+@pytest.mark.asyncio
+async def test_pull_findings_connector_next_batch_processes_companies_concurrently(
+    connector: PullFindingsConnector, company_uuids: list[str], session_faker: Faker
+):
+    """
+    Test PullFindingsConnector.next_batch processes the companies concurrently and saves the checkpoint once.
+
+    Args:
+        connector: PullFindingsConnector
+        company_uuids: list[str]
+        session_faker: Faker
+    """
+    connector.configuration.max_concurrent_companies = 4
+    date = (datetime.utcnow() - timedelta(days=connector.configuration.timedelta)).strftime("%Y-%m-%d")
+
+    running = 0
+    max_running = 0
+
+    async def findings_result(company_id, last_seen, offset):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        yield new_finding(date, session_faker)
+
+    connector._bitsight_client = MagicMock()
+    connector._bitsight_client.findings_result = findings_result
+    connector.save_checkpoint = MagicMock(wraps=connector.save_checkpoint)
+
+    result, checkpoint = await connector.next_batch()
+
+    # each finding has 2 assets and 3 vulnerabilities
+    assert result == len(company_uuids) * 6
+    assert max_running == 4
+    assert connector.save_checkpoint.call_count == 1
+    assert sorted(value.company_uuid for value in checkpoint.values) == sorted(company_uuids)
+    assert all(value.offset == 1 for value in checkpoint.values)
@@ -15,6 +15,8 @@ from multidict import CIMultiDictProxy
 from sekoia_automation.aio.helpers.http.utils import save_aiohttp_response
 from yarl import URL
 
+from client.elff import ElffLineParser, format_time, parse_datetime, parse_time
+
 
 class BroadcomCloudSwgClient(object):
     """BroadcomCloudSwgClient."""
@@ -316,38 +318,9 @@ class BroadcomCloudSwgClient(object):
         Returns:
             dict[str, str]
         """
-        _fields = fields or cls.full_list_of_elff_fields()
-        _str_to_work = value.rstrip("\n")
-        _values = []
-
-        delimiter = " "
-        while len(_str_to_work) > 1:
-            try:
-                end_index = _str_to_work.index(delimiter)
-            except ValueError:
-                end_index = len(_str_to_work)
-
-            if end_index == 0:
-                _str_to_work = _str_to_work[1:]
-
-                continue
-
-            _field_value = _str_to_work[0:end_index]
-            _str_to_work = _str_to_work[end_index + 1 :]
-
-            if _str_to_work.startswith('"'):
-                delimiter = '" '
-            else:
-                delimiter = " "
-
-            if _field_value.startswith('"'):
-                _values.append(_field_value[1:])
-            else:
-                _values.append(_field_value)
+        result, _ = ElffLineParser(fields or cls.full_list_of_elff_fields()).parse(value)
 
-        result = dict(zip(_fields, _values))
-
-        return {key: result.get(key, "") for key in result.keys() if result.get(key) != "-"}
+        return result
 
     async def perform_download_file_request(
         self, url: str, headers: dict[str, str]
@@ -574,8 +547,8 @@ class BroadcomCloudSwgClient(object):
         for key, group in grouped_data.items():
             if len(group) > 0:
                 time_taken = int(group[0].get("time-taken", 0))
-                start_time = datetime.strptime(group[0].get("time", ""), cls._time_format)
-                end_time = datetime.strptime(group[0].get("time", ""), cls._time_format)
+                start_time = parse_time(group[0].get("time", ""))
+                end_time = start_time
                 count = 0
 
                 for entry in group:
@@ -583,13 +556,8 @@ class BroadcomCloudSwgClient(object):
                     if time_taken < entry_time_taken:
                         time_taken = entry_time_taken
 
-                    entry_start_time = datetime.strptime(
-                        entry.get("start-time") or entry.get("time", ""), cls._time_format
-                    )
-
-                    entry_end_time = datetime.strptime(
-                        entry.get("end-time") or entry.get("time", ""), cls._time_format
-                    )
+                    entry_start_time = parse_time(entry.get("start-time") or entry.get("time", ""))
+                    entry_end_time = parse_time(entry.get("end-time") or entry.get("time", ""))
 
                     if start_time > entry_start_time:
                         start_time = entry_start_time
@@ -607,8 +575,8 @@ class BroadcomCloudSwgClient(object):
                         **group[0],
                         "count": count,
                         "time-taken": time_taken,
-                        "start-time": start_time.strftime(cls._time_format),
-                        "end-time": end_time.strftime(cls._time_format),
+                        "start-time": format_time(start_time),
+                        "end-time": format_time(end_time),
                     }
                 )
 
@@ -626,9 +594,6 @@ class BroadcomCloudSwgClient(object):
             datetime | None
         """
         if data.get("date") and data.get("time"):
-            return datetime.strptime(
-                "{0} {1}".format(data.get("date"), data.get("time")),
-                "{0} {1}".format(cls._date_format, cls._time_format),
-            )
+            return parse_datetime(data["date"], data["time"])
 
         return None
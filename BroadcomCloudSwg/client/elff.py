@@ -0,0 +1,145 @@
+"""Contains the parser of ELFF access log lines."""
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+TIME_FORMAT = "%H:%M:%S"
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def tokenize_elff_line(value: str) -> list[str]:
+    """
+    Split an ELFF line into its values, in a single pass over the line.
+
+    Values are separated by spaces. A value starting with a quote ends with a quote followed by a space,
+    and the leading quote is removed. Repeated spaces are skipped.
+
+    Args:
+        value: str
+
+    Returns:
+        list[str]:
+    """
+    line = value.rstrip("\n")
+    length = len(line)
+    values: list[str] = []
+
+    position = 0
+    delimiter = " "
+    while length - position > 1:
+        end_index = line.find(delimiter, position)
+        if end_index == -1:
+            end_index = length
+
+        if end_index == position:
+            position += 1
+
+            continue
+
+        field_value = line[position:end_index]
+        position = end_index + 1
+
+        delimiter = '" ' if line.startswith('"', position) else " "
+
+        values.append(field_value[1:] if field_value[0] == '"' else field_value)
+
+    return values
+
+
+@lru_cache(maxsize=64)
+def parse_date(value: str) -> datetime:
+    """
+    Parse a date, a log file only holds a few distinct dates so they are cached.
+
+    Args:
+        value: str
+
+    Returns:
+        datetime:
+    """
+    return datetime.strptime(value, DATE_FORMAT)
+
+
+def parse_time(value: str) -> int:
+    """
+    Parse a time into a number of seconds since midnight.
+
+    The common `HH:MM:SS` form is parsed with integer arithmetic, other forms go through `strptime`.
+
+    Args:
+        value: str
+
+    Returns:
+        int:
+    """
+    if len(value) == 8 and value[2] == ":" and value[5] == ":":
+        hours, minutes, seconds = value[0:2], value[3:5], value[6:8]
+        if hours.isdigit() and minutes.isdigit() and seconds.isdigit():
+            _hours, _minutes, _seconds = int(hours), int(minutes), int(seconds)
+            if _hours < 24 and _minutes < 60 and _seconds < 60:
+                return _hours * 3600 + _minutes * 60 + _seconds
+
+    parsed = datetime.strptime(value, TIME_FORMAT)
+
+    return parsed.hour * 3600 + parsed.minute * 60 + parsed.second
+
+
+def format_time(value: int) -> str:
+    """
+    Format a number of seconds since midnight as a time.
+
+    Args:
+        value: int
+
+    Returns:
+        str:
+    """
+    minutes, seconds = divmod(value, 60)
+    hours, minutes = divmod(minutes, 60)
+
+    return "{0:02d}:{1:02d}:{2:02d}".format(hours, minutes, seconds)
+
+
+def parse_datetime(date: str, time: str) -> datetime:
+    """
+    Parse the date and time of an event, as `datetime.strptime` would.
+
+    Args:
+        date: str
+        time: str
+
+    Returns:
+        datetime:
+    """
+    return parse_date(date) + timedelta(seconds=parse_time(time))
+
+
+class ElffLineParser(object):
+    """Parser of the lines of an ELFF file with a given list of fields."""
+
+    def __init__(self, fields: list[str]) -> None:
+        """
+        Initialize ElffLineParser.
+
+        Args:
+            fields: list[str]
+        """
+        self.fields = fields
+
+    def parse(self, line: str) -> tuple[dict[str, str], datetime | None]:
+        """
+        Parse a line and returns its dict representation along with the date of the event.
+
+        Args:
+            line: str
+
+        Returns:
+            tuple[dict[str, str], datetime | None]:
+        """
+        values = dict(zip(self.fields, tokenize_elff_line(line)))
+        result = {key: value for key, value in values.items() if value != "-"}
+
+        date, time = result.get("date"), result.get("time")
+        event_date = parse_datetime(date, time) if date and time else None
+
+        return result, event_date
@@ -22,6 +22,7 @@ from sekoia_automation.connector import DefaultConnectorConfiguration
 from sekoia_automation.storage import PersistentJSON
 
 from client.broadcom_cloud_swg_client import BroadcomCloudSwgClient
+from client.elff import ElffLineParser
 from connectors import BroadcomCloudModule
 from connectors.metrics import EVENTS_LAG, FORWARD_EVENTS_DURATION, OUTCOMING_EVENTS
 from utils import files as file_utils
@@ -228,7 +229,7 @@ class BroadcomCloudSwgConnector(AsyncConnector):
 
         return self._broadcom_cloud_swg_client
 
-    async def consume_file_events(self, queue: Queue[dict[str, str] | None], tag: str | None = None) -> int:
+    async def consume_file_events(self, queue: Queue[list[dict[str, str]] | None], tag: str | None = None) -> int:
         """
         Consumer function for specified queue with optional index of consumer.
 
@@ -237,7 +238,7 @@ class BroadcomCloudSwgConnector(AsyncConnector):
         Provides total amount of messages that where pushed to intake.
 
         Args:
-            queue: Queue[dict[str, str] | None]
+            queue: Queue[list[dict[str, str]] | None]
             tag: str | None = None
 
         Returns:
@@ -256,7 +257,7 @@ class BroadcomCloudSwgConnector(AsyncConnector):
             if item is None:
                 break
 
-            data_to_push.append(item)
+            data_to_push.extend(item)
 
             if len(data_to_push) >= self.configuration.chunk_size:  # pragma: no cover
                 result += len(
@@ -285,23 +286,32 @@ class BroadcomCloudSwgConnector(AsyncConnector):
 
     @staticmethod
     async def produce_file_to_queue(
-        file_path: str, queue: Queue[dict[str, str] | None], date_range: DatetimeRange, consumers_count: int = 1
+        file_path: str,
+        queue: Queue[list[dict[str, str]] | None],
+        date_range: DatetimeRange,
+        consumers_count: int = 1,
+        batch_size: int = 1000,
     ) -> DatetimeRange:
         """
         Reads zipped archive line by line and produce parsed messages to queue.
 
+        Messages are put to the queue by batches of `batch_size` messages.
+
         As result after producing we get new lowest and highest datetime.
 
         Args:
             file_path: str
             queue: Queue
-            consumers_count: int
             date_range: DatetimeRange
+            consumers_count: int
+            batch_size: int
 
         Returns:
             DatetimeRange:
         """
         headers = None
+        parser: ElffLineParser | None = None
+        batch: list[dict[str, str]] = []
         total_produced = 0
         total_skipped = 0
 
@@ -325,14 +335,16 @@ class BroadcomCloudSwgConnector(AsyncConnector):
             async for line in file_utils.read_zip_lines(file_path):
                 if line.startswith("#") and headers is None:
                     headers = BroadcomCloudSwgClient.parse_string_as_headers(line)
+                    parser = None
 
                     if headers:  # pragma: no cover
                         logger.debug("File {0}: Headers for current log file: {0}".format(" ".join(headers)))
                 else:
-                    line_as_dict = BroadcomCloudSwgClient.parse_input_string(line, headers)
+                    if parser is None:
+                        parser = ElffLineParser(headers or BroadcomCloudSwgClient.full_list_of_elff_fields())
 
                     # Bug: sometimes it does not have correct direction based on date time
-                    event_date = BroadcomCloudSwgClient.get_date_time_from_data(line_as_dict)
+                    line_as_dict, event_date = parser.parse(line)
 
                     if event_date:
                         if date_range.contains(event_date):
@@ -341,12 +353,19 @@ class BroadcomCloudSwgConnector(AsyncConnector):
 
                         new_date_time_range = new_date_time_range.update_with(event_date)
 
-                    await queue.put(line_as_dict)
+                    batch.append(line_as_dict)
                     total_produced += 1
 
+                    if len(batch) >= batch_size:
+                        await queue.put(batch)
+                        batch = []
+
         except Exception as e:  # pragma: no cover
             logger.error("File {0}: Error during zip file processing: {1}".format(file_path, str(e)))
 
+        if batch:
+            await queue.put(batch)
+
         # Before pushing to queue None we should wait until all messages in queue are processed
         await queue.join()
 
@@ -419,22 +438,18 @@ class BroadcomCloudSwgConnector(AsyncConnector):
                 local_file_name, _ = await self.broadcom_cloud_swg_client.get_near_realtime_report(_date_to_process)
 
         except Exception as e:
-            logger.error(
-                """
+            logger.error("""
                     Error while getting file:
                      Date: {0}
                      File id: {1}
                      Offsets: {2}
                      Exception: {3}
-                """.format(
-                    date_to_process, file_id, _date_range, e
-                )
-            )
+                """.format(date_to_process, file_id, _date_range, e))
 
         if local_file_name is not None:
             logger.info("File {0}: Start to decompress and process zip file".format(local_file_name))
 
-            queue: Queue[dict[str, str] | None] = Queue()
+            queue: Queue[list[dict[str, str]] | None] = Queue()
             consumers_amount = int(os.getenv("BROADCOM_CONSUMERS_COUNT", 4))
             processed_result: Any = await asyncio.gather(
                 self.produce_file_to_queue(local_file_name, queue, DatetimeRange(), consumers_amount),
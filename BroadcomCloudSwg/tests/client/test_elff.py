@@ -0,0 +1,101 @@
+"""Tests related to ELFF parser."""
+
+from datetime import datetime
+
+import pytest
+
+from client.elff import ElffLineParser, format_time, parse_datetime, parse_time, tokenize_elff_line
+
+
+def tokenize_with_slicing(value: str) -> list[str]:
+    """
+    Reference implementation of the tokenizer, slicing the line after each value.
+
+    Args:
+        value: str
+
+    Returns:
+        list[str]:
+    """
+    _str_to_work = value.rstrip("\n")
+    _values = []
+
+    delimiter = " "
+    while len(_str_to_work) > 1:
+        try:
+            end_index = _str_to_work.index(delimiter)
+        except ValueError:
+            end_index = len(_str_to_work)
+
+        if end_index == 0:
+            _str_to_work = _str_to_work[1:]
+
+            continue
+
+        _field_value = _str_to_work[0:end_index]
+        _str_to_work = _str_to_work[end_index + 1 :]
+
+        delimiter = '" ' if _str_to_work.startswith('"') else " "
+
+        _values.append(_field_value[1:] if _field_value.startswith('"') else _field_value)
+
+    return _values
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "2024-01-01 10:00:00 1 10.0.0.1 - - \n",
+        '2024-01-01 10:00:00 "Mozilla/5.0 (X11; Linux x86_64)" - 200 "quoted value" end\n',
+        "a  b   c    d",
+        "value x",
+        '"only quoted"',
+        '- "unterminated quote',
+        "",
+        " ",
+        "single",
+    ],
+)
+def test_tokenize_elff_line(line: str):
+    assert tokenize_elff_line(line) == tokenize_with_slicing(line)
+
+
+@pytest.mark.parametrize("value", ["00:00:00", "10:05:09", "23:59:59", "1:2:3", "10:5:09"])
+def test_parse_time(value: str):
+    parsed = datetime.strptime(value, "%H:%M:%S")
+
+    assert parse_time(value) == parsed.hour * 3600 + parsed.minute * 60 + parsed.second
+    assert format_time(parse_time(value)) == parsed.strftime("%H:%M:%S")
+
+
+@pytest.mark.parametrize("value", ["24:00:00", "10:60:00", "aa:bb:cc", ""])
+def test_parse_time_invalid(value: str):
+    with pytest.raises(ValueError):
+        parse_time(value)
+
+
+def test_parse_datetime():
+    assert parse_datetime("2024-02-29", "13:14:15") == datetime(2024, 2, 29, 13, 14, 15)
+
+
+def test_elff_line_parser():
+    parser = ElffLineParser(["date", "time", "c-ip", "cs-host", "cs(User-Agent)"])
+
+    result, event_date = parser.parse('2024-01-01 10:00:00 10.0.0.1 - "Mozilla/5.0 (X11)" \n')
+
+    assert result == {
+        "date": "2024-01-01",
+        "time": "10:00:00",
+        "c-ip": "10.0.0.1",
+        "cs(User-Agent)": "Mozilla/5.0 (X11)",
+    }
+    assert event_date == datetime(2024, 1, 1, 10, 0, 0)
+
+
+def test_elff_line_parser_without_date():
+    parser = ElffLineParser(["date", "time", "c-ip"])
+
+    result, event_date = parser.parse("- 10:00:00 10.0.0.1")
+
+    assert result == {"time": "10:00:00", "c-ip": "10.0.0.1"}
+    assert event_date is None
@@ -1,5 +1,6 @@
 """Aws s3 client."""
 
+import zlib
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
@@ -8,6 +9,9 @@ from pydantic import Field
 
 from .client import AwsClient, AwsConfiguration
 
+GZIP_MAGIC = b"\x1f\x8b"
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
 
 class S3Configuration(AwsConfiguration):
     """AWS S3 wrapper configuration."""
@@ -49,3 +53,64 @@ class S3Wrapper(AwsClient[S3Configuration]):
                 data = await stream.read()
 
                 yield data
+
+    async def iter_lines(
+        self, key: str, bucket: str | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Reads file from S3 bucket line by line, without loading the whole object in memory.
+
+        Gzipped objects, including the ones made of several gzip members, are decompressed on the fly.
+        Empty lines are skipped.
+
+        Args:
+            key: str
+            bucket: str | None: if not provided, then use default bucket from configuration
+            chunk_size: int: size of the chunks read from the object
+
+        Yields:
+            bytes:
+        """
+        bucket = bucket or self._configuration.bucket
+
+        logger.info(f"Streaming object {key} from bucket {bucket}")
+
+        async with self.get_client("s3") as s3:
+            response = await s3.get_object(Bucket=bucket, Key=key)
+            async with response["Body"] as stream:
+                decompressor = None
+                remainder = b""
+                is_first_chunk = True
+
+                while True:
+                    chunk = await stream.read(chunk_size)
+                    if not chunk:
+                        break
+
+                    if is_first_chunk:
+                        is_first_chunk = False
+                        if chunk[0:2] == GZIP_MAGIC:
+                            logger.info(f"Decompressing file by key {key}")
+                            decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+
+                    if decompressor is not None:
+                        data = decompressor.decompress(chunk)
+                        # a new gzip member starts right after the end of the previous one
+                        while decompressor.eof and decompressor.unused_data:
+                            unused_data = decompressor.unused_data
+                            decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+                            data += decompressor.decompress(unused_data)
+                    else:
+                        data = chunk
+
+                    lines = (remainder + data).split(b"\n")
+                    remainder = lines.pop()
+                    for line in lines:
+                        if line.strip():
+                            yield line
+
+                if decompressor is not None:
+                    remainder += decompressor.flush()
+
+                if remainder.strip():
+                    yield remainder
@@ -1,11 +1,11 @@
 """Contains connector, configuration and module."""
 
-import json
 import asyncio
 import time
+from collections.abc import AsyncGenerator
 from functools import cached_property
-from gzip import decompress
 
+import orjson
 from loguru import logger
 from sekoia_automation.aio.connector import AsyncConnector
 from sekoia_automation.connector import DefaultConnectorConfiguration
@@ -39,6 +39,77 @@ EXCLUDED_EVENT_ACTIONS = [
     "ResourceUtilization",
 ]
 
+EXCLUDED_EVENT_SIMPLE_NAMES = frozenset(action.encode("utf-8") for action in EXCLUDED_EVENT_ACTIONS)
+EVENT_SIMPLE_NAME_KEY = b'"event_simpleName"'
+
+# Default number of S3 files read concurrently
+MAX_CONCURRENT_FILES = 4
+# Default maximum number of events and of bytes of a batch pushed to the intake
+DEFAULT_CHUNK_SIZE = 20000
+MAX_BATCH_SIZE_BYTES = 32 * 1024 * 1024
+
+
+def get_event_simple_name(line: bytes) -> bytes | None:
+    """
+    Extract the value of `event_simpleName` from a raw JSON line, without decoding the whole line.
+
+    Args:
+        line: bytes
+
+    Returns:
+        bytes | None: None if the key is missing or if its value is not a string
+    """
+    index = line.find(EVENT_SIMPLE_NAME_KEY)
+    # skip occurrences of the key escaped within string values
+    while index > 0 and line[index - 1] == ord("\\"):
+        index = line.find(EVENT_SIMPLE_NAME_KEY, index + 1)
+
+    if index == -1:
+        return None
+
+    position = index + len(EVENT_SIMPLE_NAME_KEY)
+    value = line[position:].lstrip()
+    if not value.startswith(b":"):
+        return None
+
+    value = value[1:].lstrip()
+    if not value.startswith(b'"'):
+        return None
+
+    end_index = value.find(b'"', 1)
+    if end_index == -1:
+        return None
+
+    return value[1:end_index]
+
+
+class EventsBatch:
+    """
+    Events waiting to be pushed to the intake.
+
+    The batch is flushed as soon as it reaches its maximum number of events or its maximum size in bytes.
+    """
+
+    def __init__(self, connector: "CrowdStrikeTelemetryConnector", max_events: int, max_bytes: int) -> None:
+        self.connector = connector
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.events: list[str] = []
+        self.size = 0
+        self.pushed = 0
+
+    async def add(self, event: str) -> None:
+        self.events.append(event)
+        self.size += len(event)
+
+        if len(self.events) >= self.max_events or self.size >= self.max_bytes:
+            await self.flush()
+
+    async def flush(self) -> None:
+        # swap the buffer before pushing, so the other files can keep filling a new one
+        events, self.events, self.size = self.events, [], 0
+        self.pushed += len(await self.connector.push_data_to_intakes(events))
+
 
 class CrowdStrikeTelemetryConfig(DefaultConnectorConfiguration):
     queue_name: str
@@ -47,6 +118,7 @@ class CrowdStrikeTelemetryConfig(DefaultConnectorConfiguration):
     frequency: int | None = None
     delete_consumed_messages: bool | None = None
     is_fifo: bool | None = None
+    max_concurrent_files: int | None = None
 
 
 class CrowdStrikeTelemetryConnector(AsyncConnector):
@@ -83,14 +155,21 @@ class CrowdStrikeTelemetryConnector(AsyncConnector):
 
         return S3Wrapper(config)
 
-    async def get_crowdstrike_events(self) -> list[str]:
+    async def get_crowdstrike_events(self) -> int:
         """
         Run CrowdStrikeTelemetry.
 
+        Files are read concurrently, up to `max_concurrent_files`, and their events are pushed by batches
+        as they are read.
+
         Returns:
-            list[str]:
+            int: the number of events pushed to the intake
         """
-        result: list[str] = []
+        batch = EventsBatch(
+            self,
+            max_events=self.configuration.chunk_size or DEFAULT_CHUNK_SIZE,
+            max_bytes=MAX_BATCH_SIZE_BYTES,
+        )
 
         async with self.sqs_wrapper.receive_messages(delete_consumed_messages=True, max_messages=10) as messages:
             validated_sqs_messages = []
@@ -103,69 +182,96 @@ class CrowdStrikeTelemetryConnector(AsyncConnector):
             if validated_sqs_messages:  # pragma: no cover
                 logger.info("Found {sqs_messages} entries in sqs", sqs_messages=len(validated_sqs_messages))
 
-                s3_data_list = await asyncio.gather(
+                semaphore = asyncio.Semaphore(self.configuration.max_concurrent_files or MAX_CONCURRENT_FILES)
+
+                async def process_file(key: str, bucket: str | None) -> int:
+                    async with semaphore:
+                        return await self.push_s3_file(batch, key, bucket)
+
+                counts = await asyncio.gather(
                     *[
-                        self.process_s3_file(file.path, record.bucket)
+                        process_file(file.path, record.bucket)
                         for record in validated_sqs_messages
                         for file in record.files
                     ]
                 )
-
-                # We have list of lists her, so we should flatten it
-                for records in s3_data_list:
-                    result.extend(records)
+                self.log(level="INFO", message=f"Found {sum(counts)} records to process")
             else:  # pragma: no cover
                 logger.info("No messages in sqs")
 
-            self.log(level="INFO", message=f"Found {len(result)} records to process")
+            await batch.flush()
 
-            pushed_ids: list[str] = await self.push_data_to_intakes(result)
+            return batch.pushed
 
-            return pushed_ids
+    async def iter_s3_file_events(self, key: str, bucket: str | None = None) -> AsyncGenerator[str, None]:
+        """
+        Read the events of an S3 object, skipping the excluded ones.
 
-    async def process_s3_file(self, key: str, bucket: str | None = None) -> list[str]:
+        The name of the event is read from the raw line, so the excluded lines are never decoded.
+        The other lines are checked to be valid JSON before being forwarded.
+
+        Args:
+            key: str
+            bucket: str | None
+
+        Yields:
+            str:
         """
-        Process S3 objects.
+        logger.info(f"Reading file {key}")
+
+        async for line in self.s3_wrapper.iter_lines(key, bucket):
+            event_simple_name = get_event_simple_name(line)
+            if event_simple_name is None or event_simple_name in EXCLUDED_EVENT_SIMPLE_NAMES:
+                DISCARDED_EVENTS.labels(intake_key=self.configuration.intake_key).inc()
+                continue
 
-        If it is a compressed file, it will be decompressed, otherwise it will be read as json.
+            try:
+                # orjson also rejects the lines that are not valid UTF-8
+                orjson.loads(line)
+            except orjson.JSONDecodeError as any_exception:
+                logger.error(
+                    "failed to read line from event stream",
+                    line=line,
+                    key=key,
+                )
+                self.log_exception(any_exception)
+                continue
+
+            yield line.decode("utf-8")
+
+    async def push_s3_file(self, batch: EventsBatch, key: str, bucket: str | None = None) -> int:
+        """
+        Add the events of an S3 object to the batch of events to push.
 
         Args:
+            batch: EventsBatch
             key: str
             bucket: str | None
 
         Returns:
-            list[dict]:
+            int: the number of events read from the object
+        """
+        count = 0
+        async for event in self.iter_s3_file_events(key, bucket):
+            await batch.add(event)
+            count += 1
+
+        return count
 
-        Raises:
-            Exception: Unexpected result type
+    async def process_s3_file(self, key: str, bucket: str | None = None) -> list[str]:
         """
-        logger.info(f"Reading file {key}")
+        Process S3 objects.
 
-        async with self.s3_wrapper.read_key(key, bucket) as content:
-            result_content = content
-            if content[0:2] == b"\x1f\x8b":
-                logger.info(f"Decompressing file by key {key}")
-                result_content = decompress(content)
-        result = []
-        for line in result_content.decode("utf-8").split("\n"):
-            if len(line.strip()) > 0:
-                try:
-                    event = json.loads(line)
-                    if (
-                        event.get("event_simpleName") is None
-                        or event.get("event_simpleName") in EXCLUDED_EVENT_ACTIONS
-                    ):
-                        DISCARDED_EVENTS.labels(intake_key=self.configuration.intake_key).inc()
-                        continue
-                    result.append(line)
-                except Exception as any_exception:
-                    logger.error(
-                        "failed to read line from event stream",
-                        line=line,
-                        stream_root_url=self.stream_root_url,
-                    )
-                    self.log_exception(any_exception)
-        return result
+        If it is a compressed file, it will be decompressed, otherwise it will be read as is.
+
+        Args:
+            key: str
+            bucket: str | None
+
+        Returns:
+            list[str]:
+        """
+        return [event async for event in self.iter_s3_file_events(key, bucket)]
 
     def run(self) -> None:  # pragma: no cover
         """Runs Crowdstrike Telemetry."""
@@ -182,13 +288,13 @@ class CrowdStrikeTelemetryConnector(AsyncConnector):
                             processing_start - previous_processing_end
                         )
 
-                    message_ids: list[str] = loop.run_until_complete(self.get_crowdstrike_events())
+                    pushed_events: int = loop.run_until_complete(self.get_crowdstrike_events())
                     processing_end = time.time()
-                    OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(message_ids))
+                    OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(pushed_events)
 
                     log_message = "No records to forward"
-                    if len(message_ids) > 0:
-                        log_message = "Pushed {0} records".format(len(message_ids))
+                    if pushed_events > 0:
+                        log_message = "Pushed {0} records".format(pushed_events)
 
                     logger.info(log_message)
                     self.log(message=log_message, level="info")
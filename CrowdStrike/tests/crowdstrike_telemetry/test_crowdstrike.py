@@ -7,7 +7,36 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from crowdstrike_telemetry import CrowdStrikeTelemetryModule, CrowdStrikeTelemetryModuleConfig
-from crowdstrike_telemetry.pull_telemetry_events import CrowdStrikeTelemetryConfig, CrowdStrikeTelemetryConnector
+from crowdstrike_telemetry.pull_telemetry_events import (
+    CrowdStrikeTelemetryConfig,
+    CrowdStrikeTelemetryConnector,
+    get_event_simple_name,
+)
+
+
+def mock_s3_object(mock_client: MagicMock, content: bytes, chunk_size: int = 16) -> MagicMock:
+    """
+    Mock the S3 client to serve the content by chunks.
+
+    Args:
+        mock_client: MagicMock
+        content: bytes
+        chunk_size: int
+
+    Returns:
+        MagicMock: the mocked S3 client
+    """
+    chunks = [content[i : i + chunk_size] for i in range(0, len(content), chunk_size)]
+
+    body = AsyncMock()
+    body.__aenter__.return_value = body
+    body.read = AsyncMock(side_effect=chunks + [b""])
+
+    mock_s3 = MagicMock()
+    mock_s3.get_object = AsyncMock(return_value={"Body": body})
+    mock_client.return_value.__aenter__.return_value = mock_s3
+
+    return mock_s3
 
 
 @pytest.fixture
@@ -84,13 +113,13 @@ async def test_process_s3_file(crowdstrike_connector, session_faker):
         '{"data": "aaaaa", "event_simpleName": "EndOfProcess"}',
     ]
 
-    with patch.object(crowdstrike_connector.s3_wrapper, "read_key") as mock_read_key:
-        mock_read_key.return_value.__aenter__.return_value = content
+    with patch("aws.s3.S3Wrapper.get_client") as mock_client:
+        mock_s3 = mock_s3_object(mock_client, content)
 
         result = await crowdstrike_connector.process_s3_file(key)
 
         assert result == expected
-        mock_read_key.assert_called_once_with(key, None)
+        mock_s3.get_object.assert_called_once_with(Bucket=None, Key=key)
 
 
 @pytest.mark.asyncio
@@ -109,15 +138,17 @@ async def test_process_gzipped_s3_file(crowdstrike_connector, session_faker):
     ]
     expected = [json.dumps(item) for item in data]
 
-    with patch.object(crowdstrike_connector.s3_wrapper, "read_key") as mock_read_key:
-        mock_read_key.return_value.__aenter__.return_value = compress(
-            b"\n".join([item.encode("utf-8") for item in expected])
+    with patch("aws.s3.S3Wrapper.get_client") as mock_client:
+        # two gzip members, as produced by concatenated gzip files
+        mock_s3 = mock_s3_object(
+            mock_client,
+            compress(expected[0].encode("utf-8") + b"\n") + compress(expected[1].encode("utf-8")),
         )
 
         result = await crowdstrike_connector.process_s3_file(key)
 
         assert result == expected
-        mock_read_key.assert_called_once_with(key, None)
+        mock_s3.get_object.assert_called_once_with(Bucket=None, Key=key)
 
 
 @pytest.mark.asyncio
@@ -133,13 +164,38 @@ async def test_process_s3_file_one_line(crowdstrike_connector, session_faker):
     data = {"data": session_faker.sentence(), "event_simpleName": "EndOfProcess"}
     expected = [json.dumps(data)]
 
-    with patch.object(crowdstrike_connector.s3_wrapper, "read_key") as mock_read_key:
-        mock_read_key.return_value.__aenter__.return_value = b"\n".join([item.encode("utf-8") for item in expected])
+    with patch("aws.s3.S3Wrapper.get_client") as mock_client:
+        mock_s3 = mock_s3_object(mock_client, b"\n".join([item.encode("utf-8") for item in expected]))
 
         result = await crowdstrike_connector.process_s3_file(key)
 
         assert result == expected
-        mock_read_key.assert_called_once_with(key, None)
+        mock_s3.get_object.assert_called_once_with(Bucket=None, Key=key)
+
+
+@pytest.mark.asyncio
+async def test_process_s3_file_skips_malformed_lines(crowdstrike_connector, session_faker):
+    """
+    Test that the lines which are not valid JSON are not forwarded.
+
+    Args:
+        crowdstrike_connector: CrowdStrikeTelemetryConnector
+        session_faker: Faker
+    """
+    key = session_faker.file_path(depth=2, extension="json")
+    content = b"""
+{"data": "aaaaa", "event_simpleName": "EndOfProcess"
+{"data": "bb\xd8bb", "event_simpleName": "EndOfProcess"}
+{"data": "ccccc", "event_simpleName": "EndOfProcess"}
+"""
+
+    with patch("aws.s3.S3Wrapper.get_client") as mock_client:
+        mock_s3_object(mock_client, content)
+
+        result = await crowdstrike_connector.process_s3_file(key)
+
+    assert result == ['{"data": "ccccc", "event_simpleName": "EndOfProcess"}']
+    assert crowdstrike_connector.log_exception.call_count == 2
 
 
 @pytest.mark.asyncio
@@ -168,13 +224,13 @@ async def test_get_crowdstrike_events(crowdstrike_connector, session_faker, push
     }
 
     expected = [
-        {"data": session_faker.sentence()},
-        {"data": session_faker.sentence()},
+        {"data": session_faker.sentence(), "event_simpleName": "EndOfProcess"},
+        {"data": session_faker.sentence(), "event_simpleName": "SensorHeartbeat"},
     ]
 
     with (
         patch("aws.sqs.SqsWrapper.get_client") as mock_client,
-        patch.object(crowdstrike_connector.s3_wrapper, "read_key") as mock_read_key,
+        patch("aws.s3.S3Wrapper.get_client") as mock_s3_client,
     ):
         mock_sqs = MagicMock()
 
@@ -189,13 +245,82 @@ async def test_get_crowdstrike_events(crowdstrike_connector, session_faker, push
 
         mock_client.return_value.__aenter__.return_value = mock_sqs
 
-        mock_read_key.return_value.__aenter__.return_value = b"\n".join(
-            [json.dumps(item).encode("utf-8") for item in expected]
+        mock_s3 = MagicMock()
+        mock_s3.get_object = AsyncMock(
+            side_effect=lambda Bucket, Key: {
+                "Body": AsyncMock(
+                    __aenter__=AsyncMock(
+                        return_value=MagicMock(
+                            read=AsyncMock(
+                                side_effect=[b"\n".join([json.dumps(item).encode("utf-8") for item in expected]), b""]
+                            )
+                        )
+                    )
+                )
+            }
+        )
+        mock_s3_client.return_value.__aenter__.return_value = mock_s3
+
+        result = await crowdstrike_connector.get_crowdstrike_events()
+
+        assert result == len(pushed_ids)
+        assert mock_s3.get_object.call_count == 3
+        pushed_events = [
+            event for call in crowdstrike_connector.push_data_to_intakes.call_args_list for event in call.args[0]
+        ]
+        assert pushed_events == [json.dumps(expected[0])] * 3
+
+
+@pytest.mark.asyncio
+async def test_get_crowdstrike_events_pushes_by_batches(crowdstrike_connector, session_faker):
+    """
+    Test that events are pushed by batches of `chunk_size` events while the files are read.
+
+    Args:
+        crowdstrike_connector: CrowdStrikeTelemetryConnector
+        session_faker: Faker
+    """
+    crowdstrike_connector.configuration.chunk_size = 2
+    crowdstrike_connector.push_data_to_intakes = AsyncMock(side_effect=lambda events: events)
+    events = [json.dumps({"data": session_faker.sentence(), "event_simpleName": "EndOfProcess"}) for _ in range(5)]
+
+    with (
+        patch("aws.sqs.SqsWrapper.get_client") as mock_client,
+        patch("aws.s3.S3Wrapper.get_client") as mock_s3_client,
+    ):
+        mock_sqs = MagicMock()
+        mock_sqs.receive_message = AsyncMock(
+            return_value={
+                "Messages": [
+                    {"Body": '{"bucket": "MyBucket", "files": [{"path": "mypath1"}]}', "ReceiptHandle": "handle"}
+                ]
+            }
         )
+        mock_sqs.delete_message = AsyncMock(return_value={})
+        mock_sqs.get_queue_url = AsyncMock(return_value={"QueueUrl": session_faker.url()})
+        mock_client.return_value.__aenter__.return_value = mock_sqs
+
+        mock_s3_object(mock_s3_client, compress("\n".join(events).encode("utf-8")))
 
         result = await crowdstrike_connector.get_crowdstrike_events()
 
-        assert result == pushed_ids
+    assert result == 5
+    assert [len(call.args[0]) for call in crowdstrike_connector.push_data_to_intakes.call_args_list] == [2, 2, 1]
+
+
+@pytest.mark.parametrize(
+    "line,expected",
+    [
+        (b'{"data": "aaaaa", "event_simpleName": "EndOfProcess"}', b"EndOfProcess"),
+        (b'{"event_simpleName":"DnsRequest","data":1}', b"DnsRequest"),
+        (b'{"CommandLine": "echo \\"event_simpleName\\"", "event_simpleName" : "ProcessRollup2"}', b"ProcessRollup2"),
+        (b'{"data": "aaaaa"}', None),
+        (b'{"event_simpleName": null}', None),
+        (b'{"event_simpleName": "Unterminated', None),
+    ],
+)
+def test_get_event_simple_name(line: bytes, expected: bytes | None):
+    assert get_event_simple_name(line) == expected
 
 
 @pytest.mark.asyncio
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from threading import Lock
 from posixpath import join as urljoin
 
 import requests
@@ -25,6 +26,7 @@ class CybereasonApiAuthentication(AuthBase):
         self.__username = username
         self.__password = password
         self.__api_credentials: CybereasonApiCredentials | None = None
+        self.__lock = Lock()  # the credentials are shared by the threads enriching the malops
         self.__http_session = requests.Session()
         self.__http_session.mount(
             "https://",
@@ -40,6 +42,10 @@ class CybereasonApiAuthentication(AuthBase):
         """
         Return Cybereason Credentials for the API
         """
+        with self.__lock:
+            return self.__get_credentials()
+
+    def __get_credentials(self) -> CybereasonApiCredentials:
         current_dt = datetime.utcnow()
 
         if self.__api_credentials is None or current_dt + timedelta(seconds=300) >= self.__api_credentials.expires_at:
@@ -2,6 +2,7 @@ import signal
 import time
 from collections import defaultdict
 from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
 from threading import Event
 from typing import Any
@@ -21,7 +22,12 @@ from cybereason_modules.constants import (
     MALOP_INBOX_ENDPOINT,
 )
 from cybereason_modules.exceptions import InvalidJsonResponse, InvalidResponse, LoginFailureError, TimeoutError
-from cybereason_modules.helpers import extract_models_from_malop, merge_suspicions, validate_response_not_login_failure
+from cybereason_modules.helpers import (
+    MalopDetailsCache,
+    extract_models_from_malop,
+    merge_suspicions,
+    validate_response_not_login_failure,
+)
 from cybereason_modules.logging import get_logger
 from cybereason_modules.metrics import EVENTS_LAG, FORWARD_EVENTS_DURATION, INCOMING_MALOPS, OUTCOMING_EVENTS
 
@@ -32,6 +38,10 @@ class CybereasonEventConnectorConfiguration(DefaultConnectorConfiguration):
     frequency: int = 60
     group_ids: list[str] | None = None
     chunk_size: int = 1000
+    max_concurrent_malops: int = 8
+
+
+MALOP_DETAILS_CACHE_SIZE = 1000
 
 
 class CybereasonEventConnector(Connector):
@@ -47,6 +57,7 @@ class CybereasonEventConnector(Connector):
         super().__init__(*args, **kwargs)
         self.from_date: int = (int(time.time()) - 60) * 1000  # milliseconds
         self._stop_event = Event()  # Event to notify we must stop the thread
+        self.malop_details_cache = MalopDetailsCache(MALOP_DETAILS_CACHE_SIZE)
 
         # Register signal to terminate thread
         signal.signal(signal.SIGINT, self.exit)
@@ -241,8 +252,16 @@ class CybereasonEventConnector(Connector):
         """
         Get and yield details on the malop
         """
-        # get details on the malop
-        details = self.get_malop_detail(malop["guid"])
+        # get details on the malop, unless the malop was not updated since the last time
+        details = self.malop_details_cache.get(malop["guid"], malop["lastUpdateTime"])
+        if details is None:
+            details = self.get_malop_detail(malop["guid"])
+            if details is not None:
+                self.malop_details_cache.set(malop["guid"], malop["lastUpdateTime"], details)
+
+        # work on a copy, to keep the cached details intact
+        if details is not None:
+            details = dict(details)
 
         # if no details retrieved, use the malop as base
         if details is None:
@@ -260,6 +279,47 @@ class CybereasonEventConnector(Connector):
             yield from extract_models_from_malop(details, machines, ".MachineDetailsModel")
             yield from extract_models_from_malop(details, file_suspects, ".FileSuspectDetailsModel")
 
+    def enrich_edr_malop(self, malop: dict[str, Any]) -> Generator[dict[str, Any], None, None]:
+        """
+        Get the suspicions of the EDR malop and yield them with the malop
+        """
+        # get the suspicions of the malop, unless the malop was not updated since the last time
+        suspicions = self.malop_details_cache.get(malop["guid"], malop["lastUpdateTime"])
+        if suspicions is None:
+            suspicions = self.get_all_suspicions_for_edr_malop(malop["guid"])
+            if suspicions is not None:
+                self.malop_details_cache.set(malop["guid"], malop["lastUpdateTime"], suspicions)
+
+        users = malop.pop("users", [])
+        machines = malop.pop("machines", [])
+        yield malop
+        yield from extract_models_from_malop(malop, users, ".UserInboxModel")
+        yield from extract_models_from_malop(malop, machines, ".MachineInboxModel")
+        if suspicions:
+            for (suspicion_uuid, suspicion_name), suspicion in suspicions.items():
+                if suspicion is not None:
+                    yield {
+                        "metadata": {"malopGuid": malop["guid"], "timestamp": malop["lastUpdateTime"]},
+                        "@class": ".SuspicionModel",
+                        "name": suspicion_name,
+                        "guid": suspicion_uuid,
+                        "firstTimestamp": suspicion["firstTimestamp"],
+                        "evidences": suspicion["evidences"],
+                    }
+
+    def enrich_malop(self, malop: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Return the events of the malop, enriched with its details
+        """
+        # work on a copy, as the same malop can be listed several times
+        malop = dict(malop)
+
+        # check if the malop is an AI Hunt malop (EDR) or a generic one
+        if malop.get("edr", False):
+            return list(self.enrich_edr_malop(malop))
+
+        return list(self.enrich_generic_malop(malop))
+
     def fetch_last_events(self) -> Generator[dict[str, Any], None, None]:
         """
         Fetch the last malops from the Cybereason API
@@ -280,38 +340,18 @@ class CybereasonEventConnector(Connector):
         INCOMING_MALOPS.labels(intake_key=self.configuration.intake_key).inc(len(next_malops))
 
         most_recent_date_seen = from_date
-        for malop in next_malops:
-            # save the greater date ever seen
-            event_date = int(malop["lastUpdateTime"])
-            if event_date > most_recent_date_seen:
-                most_recent_date_seen = (
-                    event_date + 1
-                )  # add 1 milli-seconds to exclude the current malop from the next search
-
-            # check if the malop is an AI Hunt malop (EDR) or a generic one
-            is_edr = malop.get("edr", False)
-            if is_edr:
-                suspicions = self.get_all_suspicions_for_edr_malop(malop["guid"])
-
-                users = malop.pop("users", [])
-                machines = malop.pop("machines", [])
-                yield malop
-                yield from extract_models_from_malop(malop, users, ".UserInboxModel")
-                yield from extract_models_from_malop(malop, machines, ".MachineInboxModel")
-                if suspicions:
-                    for (suspicion_uuid, suspicion_name), suspicion in suspicions.items():
-                        if suspicion is not None:
-                            yield {
-                                "metadata": {"malopGuid": malop["guid"], "timestamp": malop["lastUpdateTime"]},
-                                "@class": ".SuspicionModel",
-                                "name": suspicion_name,
-                                "guid": suspicion_uuid,
-                                "firstTimestamp": suspicion["firstTimestamp"],
-                                "evidences": suspicion["evidences"],
-                            }
 
-            else:
-                yield from self.enrich_generic_malop(malop)
+        # enrich the malops concurrently. The events are yielded in the order of the malops
+        with ThreadPoolExecutor(max_workers=self.configuration.max_concurrent_malops) as executor:
+            for malop, events in zip(next_malops, executor.map(self.enrich_malop, next_malops)):
+                # save the greater date ever seen
+                event_date = int(malop["lastUpdateTime"])
+                if event_date > most_recent_date_seen:
+                    most_recent_date_seen = (
+                        event_date + 1
+                    )  # add 1 milli-seconds to exclude the current malop from the next search
+
+                yield from events
 
         # save the most recent date and compute the lag
         if most_recent_date_seen > self.from_date:
@@ -319,6 +359,14 @@ class CybereasonEventConnector(Connector):
             current_lag = int(time.time() - (most_recent_date_seen / 1000))
             EVENTS_LAG.labels(intake_key=self.configuration.intake_key).set(current_lag)
 
+    def forward_events(self, events: list[str]) -> int:
+        """
+        Forward the events to the intake
+        """
+        OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(events))
+        self.push_events_to_intakes(events=events)
+        return len(events)
+
     def next_batch(self):
         """
         Retrieve and forward the most recent malops
@@ -326,20 +374,27 @@ class CybereasonEventConnector(Connector):
         # save the starting time
         batch_start_time = time.time()
 
-        # Fetch next events
-        batch_of_events = [orjson.dumps(event).decode("utf-8") for event in self.fetch_last_events()]
+        # Fetch next events and forward them by chunks, while the next malops are enriched
+        nb_events = 0
+        batch_of_events: list[str] = []
+        for event in self.fetch_last_events():
+            batch_of_events.append(orjson.dumps(event).decode("utf-8"))
+
+            if len(batch_of_events) >= self.configuration.chunk_size:
+                nb_events += self.forward_events(batch_of_events)
+                batch_of_events = []
 
         if len(batch_of_events) > 0:
-            OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(batch_of_events))
-            self.push_events_to_intakes(events=batch_of_events)
-        else:
+            nb_events += self.forward_events(batch_of_events)
+
+        if nb_events == 0:
             EVENTS_LAG.labels(intake_key=self.configuration.intake_key).set(0)
 
         # get the ending time and compute the duration to fetch the events
         batch_end_time = time.time()
         batch_duration = int(batch_end_time - batch_start_time)
         self.log(
-            message=f"Fetch and forward {len(batch_of_events)} events in {batch_duration} seconds",
+            message=f"Fetch and forward {nb_events} events in {batch_duration} seconds",
             level="info",
         )
         FORWARD_EVENTS_DURATION.labels(intake_key=self.configuration.intake_key).observe(batch_duration)
@@ -1,4 +1,6 @@
+from collections import OrderedDict
 from collections.abc import Generator
+from threading import Lock
 from typing import Any
 
 import orjson
@@ -88,3 +90,47 @@ def validate_response_not_login_failure(response: requests.Response) -> bool:
         return True
     except Exception as error:
         raise InvalidResponse(response) from error
+
+
+class MalopDetailsCache:
+    """
+    A bounded and thread-safe cache of the details of the malops
+
+    The details of a malop are kept as long as the malop is not updated (the `lastUpdateTime` of the malop
+    is part of the key). The least recently used malops are evicted first.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: OrderedDict[str, tuple[int, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, malop_uuid: str, last_update_time: int) -> Any | None:
+        """
+        Return the cached details of the malop, if the malop was not updated since
+
+        :param str malop_uuid: The identifier of the malop
+        :param int last_update_time: The last update time of the malop
+        """
+        with self._lock:
+            item = self._items.get(malop_uuid)
+            if item is None or item[0] != last_update_time:
+                return None
+
+            self._items.move_to_end(malop_uuid)
+            return item[1]
+
+    def set(self, malop_uuid: str, last_update_time: int, details: Any) -> None:
+        """
+        Cache the details of the malop
+
+        :param str malop_uuid: The identifier of the malop
+        :param int last_update_time: The last update time of the malop
+        :param details: The details of the malop
+        """
+        with self._lock:
+            self._items[malop_uuid] = (last_update_time, details)
+            self._items.move_to_end(malop_uuid)
+
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
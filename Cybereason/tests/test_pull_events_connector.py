@@ -312,7 +312,11 @@ def test_next_batch_sleep_until_next_batch(trigger, mock_cybereason_api):
 
         trigger.next_batch()
 
-        assert trigger.push_events_to_intakes.call_count == 1
+        # the events are forwarded by chunks
+        pushed = [len(call.kwargs["events"]) for call in trigger.push_events_to_intakes.call_args_list]
+        assert len(pushed) > 1
+        assert all(size == trigger.configuration.chunk_size for size in pushed[:-1])
+        assert 0 < pushed[-1] <= trigger.configuration.chunk_size
         assert mock_time.sleep.call_count == 1
 
 
@@ -340,7 +344,11 @@ def test_long_next_batch_should_not_sleep(trigger, mock_cybereason_api):
 
         trigger.next_batch()
 
-        assert trigger.push_events_to_intakes.call_count == 1
+        # the events are forwarded by chunks
+        pushed = [len(call.kwargs["events"]) for call in trigger.push_events_to_intakes.call_args_list]
+        assert len(pushed) > 1
+        assert all(size == trigger.configuration.chunk_size for size in pushed[:-1])
+        assert 0 < pushed[-1] <= trigger.configuration.chunk_size
         assert mock_time.sleep.call_count == 0
 
 
@@ -417,3 +425,61 @@ def test_fetch_last_events_integration(symphony_storage):
 
     malops = list(trigger.fetch_last_events())
     assert len(malops) > 0
+
+
+def test_fetch_last_events_does_not_enrich_unchanged_malops_again(trigger, mock_cybereason_api):
+    mock_cybereason_api.post(
+        "https://fake.cybereason.net/rest/detection/inbox",
+        status_code=200,
+        json={"malops": [EPP_MALOP, EDR_MALOP]},
+    )
+    details = mock_cybereason_api.post(
+        "https://fake.cybereason.net/rest/detection/details",
+        status_code=200,
+        json=EPP_MALOP_DETAIL,
+    )
+    suspicions = mock_cybereason_api.post(
+        "https://fake.cybereason.net/rest/crimes/unified",
+        status_code=200,
+        json=EDR_MALOP_SUSPICIONS_RESULTS,
+    )
+
+    first_events = list(trigger.fetch_last_events())
+    second_events = list(trigger.fetch_last_events())
+
+    assert first_events == second_events
+    assert details.call_count == 1
+    assert suspicions.call_count == 2  # one request per AI-hunt type
+
+    # once updated, the malop is enriched again
+    mock_cybereason_api.post(
+        "https://fake.cybereason.net/rest/detection/inbox",
+        status_code=200,
+        json={"malops": [{**EPP_MALOP, "lastUpdateTime": EPP_MALOP["lastUpdateTime"] + 1}]},
+    )
+    list(trigger.fetch_last_events())
+
+    assert details.call_count == 2
+
+
+def test_fetch_last_events_keeps_malops_order(trigger, mock_cybereason_api):
+    trigger.configuration.max_concurrent_malops = 4
+    malops = [
+        {**EPP_MALOP, "guid": f"guid-{index}", "lastUpdateTime": EPP_MALOP["lastUpdateTime"] + index}
+        for index in range(10)
+    ]
+    mock_cybereason_api.post(
+        "https://fake.cybereason.net/rest/detection/inbox",
+        status_code=200,
+        json={"malops": malops},
+    )
+    mock_cybereason_api.post(
+        "https://fake.cybereason.net/rest/detection/details",
+        status_code=500,
+    )
+
+    events = list(trigger.fetch_last_events())
+
+    assert [event["guid"] for event in events if event.get("@class") == EPP_MALOP["@class"]] == [
+        malop["guid"] for malop in malops
+    ]
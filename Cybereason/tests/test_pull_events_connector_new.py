@@ -329,7 +329,11 @@ def test_next_batch_sleep_until_next_batch(trigger, mock_cybereason_api):
 
         trigger.next_batch()
 
-        assert trigger.push_events_to_intakes.call_count == 1
+        # the events are forwarded by chunks
+        pushed = [len(call.kwargs["events"]) for call in trigger.push_events_to_intakes.call_args_list]
+        assert len(pushed) > 1
+        assert all(size == trigger.configuration.chunk_size for size in pushed[:-1])
+        assert 0 < pushed[-1] <= trigger.configuration.chunk_size
         assert mock_time.sleep.call_count == 1
 
 
@@ -357,7 +361,11 @@ def test_long_next_batch_should_not_sleep(trigger, mock_cybereason_api):
 
         trigger.next_batch()
 
-        assert trigger.push_events_to_intakes.call_count == 1
+        # the events are forwarded by chunks
+        pushed = [len(call.kwargs["events"]) for call in trigger.push_events_to_intakes.call_args_list]
+        assert len(pushed) > 1
+        assert all(size == trigger.configuration.chunk_size for size in pushed[:-1])
+        assert 0 < pushed[-1] <= trigger.configuration.chunk_size
         assert mock_time.sleep.call_count == 0
 
 
@@ -3,12 +3,14 @@ from diskcache import Cache as InternalCache
 
 class Cache:
     def __init__(self, directory_path):
+        # Keep a single handle on the cache, opening one per operation is costly
         self._cache = InternalCache(directory_path)
 
-    def get(self, key) -> str | None:
-        with InternalCache(self._cache.directory) as reference:
-            return reference.get(key, None)
+    def get(self, key, default=None):
+        return self._cache.get(key, default)
 
     def set(self, key, value):
-        with InternalCache(self._cache.directory) as reference:
-            reference.set(key, value)
+        self._cache.set(key, value)
+
+    def close(self):
+        self._cache.close()
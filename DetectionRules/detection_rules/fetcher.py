@@ -1,6 +1,7 @@
 import hashlib
 import io
 import logging
+from concurrent.futures import ProcessPoolExecutor
 
 import idstools.rule
 from idstools.rule import Rule
@@ -10,11 +11,19 @@ from detection_rules.cache import Cache
 from detection_rules.serializer import RuleSerializer
 
 
+def parse_valid_rules(rule_file: bytes, serializer: RuleSerializer) -> list[Rule]:
+    """
+    Parse a rule file and keep the rules that can be converted
+    """
+    return [rule for rule in RulesFetcher.parse_rule_file(rule_file) if serializer.is_valid(rule)]
+
+
 class RulesFetcher:
-    def __init__(self, archives: list, cache: Cache):
+    def __init__(self, archives: list, cache: Cache, max_workers: int | None = None):
         self._logger = logging.getLogger(__name__)
         self._archives = archives
         self._cache = cache
+        self._max_workers = max_workers
 
     def fetch_rules(self):
         rules = []
@@ -48,12 +57,16 @@ class RulesFetcher:
         """
         Process the file from the rule archive.
 
-        It will read the files and parse the rules inside them.
+        It will read the changed files and parse the rules inside them.
+        Rules are indexed by gid and sid with their revision, so only the added,
+        modified and removed rules are returned.
         """
-        rules = []
         serializer = RuleSerializer(rule_type, rule_version)
+
+        changed_files: dict[str, bytes] = {}
+        files_md5: dict[str, str] = {}
         for filename, rule_file in files.items():
-            if not filename.endswith(".rules") or filename.endswith("deleted.rules"):
+            if not self.is_rule_file(filename):
                 continue
             file_md5 = self.compute_md5(rule_file)
             cache_key = f"{url}|{filename}"
@@ -62,12 +75,74 @@ class RulesFetcher:
                 self._logger.debug(f"File {filename} is unchanged...")
                 continue
 
+            changed_files[filename] = rule_file
+            files_md5[filename] = file_md5
+
+        # The rules of the files that are no longer in the archive are removed
+        known_files: list[str] = self._cache.get(f"{url}|files") or []
+        removed_files = [filename for filename in known_files if filename not in files]
+
+        parsed_files = self.parse_rule_files(changed_files, serializer)
+        parsed_files.update({filename: [] for filename in removed_files})
+
+        current_keys = {self.rule_key(rule) for file_rules in parsed_files.values() for rule in file_rules}
+
+        changed_rules: list[Rule] = []
+        removed_rules: list[Rule] = []
+        for filename, file_rules in parsed_files.items():
             self._logger.debug(f"Processing file {filename}...")
-            parsed_rules = self.parse_rule_file(rule_file)
-            rules += serializer.to_stix(parsed_rules)
+            index_key = f"{url}|{filename}|rules"
+            index: dict[str, tuple[int, str]] = self._cache.get(index_key) or {}
+
+            new_index: dict[str, tuple[int, str]] = {}
+            for rule in file_rules:
+                key = self.rule_key(rule)
+                if key is None:
+                    # rules without sid cannot be tracked
+                    changed_rules.append(rule)
+                    continue
+
+                entry = (rule.rev, rule.raw)
+                new_index[key] = entry
+                if index.get(key) != entry:
+                    changed_rules.append(rule)
+
+            for key, (_, raw) in index.items():
+                # a rule that moved to another changed file is not removed
+                if key not in current_keys:
+                    removed_rules.append(idstools.rule.parse(raw))
+
+            self._cache.set(index_key, new_index)
+            if filename in files_md5:
+                self._cache.set(f"{url}|{filename}", files_md5[filename])
             self._logger.debug("Processed.")
-            self._cache.set(cache_key, file_md5)
-        return rules
+
+        self._cache.set(f"{url}|files", [filename for filename in files if self.is_rule_file(filename)])
+
+        self._logger.info(f"{len(changed_rules)} rules added or modified, {len(removed_rules)} rules removed")
+        return serializer.to_stix(changed_rules) + serializer.to_revoked_stix(removed_rules)
+
+    def parse_rule_files(self, files: dict[str, bytes], serializer: RuleSerializer) -> dict[str, list[Rule]]:
+        """
+        Parse the rule files, in a pool of processes when several files changed
+        """
+        if len(files) <= 1 or self._max_workers == 1:
+            return {filename: parse_valid_rules(rule_file, serializer) for filename, rule_file in files.items()}
+
+        with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+            results = executor.map(parse_valid_rules, files.values(), [serializer] * len(files))
+            return dict(zip(files.keys(), results))
+
+    @staticmethod
+    def is_rule_file(filename: str) -> bool:
+        return filename.endswith(".rules") and not filename.endswith("deleted.rules")
+
+    @staticmethod
+    def rule_key(rule: Rule) -> str | None:
+        if rule.sid is None:
+            return None
+
+        return f"{rule.gid}:{rule.sid}"
 
     @staticmethod
     def parse_rule_file(rule_file) -> list[Rule]:
@@ -6,6 +6,9 @@ from idstools.rule import Rule
 
 from detection_rules.utils import datetime_to_str
 
+# Namespace of the identifiers of the indicators, derived from the rules identifiers
+INDICATOR_NAMESPACE = uuid.UUID("0b5cd0a4-7f43-4e3e-9a0c-5c3ac0f1e6a9")
+
 
 class RuleSerializer:
     # Any of this rule options discard the rule
@@ -90,6 +93,24 @@ class RuleSerializer:
     def to_stix(self, rules: list[Rule]):
         return [self._to_stix(rule) for rule in rules if self.is_valid(rule)]
 
+    def to_revoked_stix(self, rules: list[Rule]):
+        """
+        Convert rules that were removed into revoked STIX objects
+        """
+        return [{**self._to_stix(rule), "revoked": True} for rule in rules]
+
+    def indicator_id(self, rule: Rule) -> str:
+        """
+        Get the identifier of the indicator of a rule
+
+        The identifier is derived from the gid and sid of the rule,
+        so that the updates of a rule are applied on the same indicator.
+        """
+        if rule.sid is None:
+            return f"indicator--{str(uuid.uuid4())}"
+
+        return f"indicator--{str(uuid.uuid5(INDICATOR_NAMESPACE, f'{self.rule_type}:{rule.gid}:{rule.sid}'))}"
+
     def is_valid(self, rule: Rule):
         # Rule is disabled in the file
         if not rule.enabled:
@@ -109,7 +130,7 @@ class RuleSerializer:
         Convert a rule into a STIX object
         """
         rule_dict: dict[str, Any] = {
-            "id": f"indicator--{str(uuid.uuid4())}",
+            "id": self.indicator_id(rule),
             "type": "indicator",
             "name": f"{rule.msg} (sid {rule.sid})",
             "pattern_type": self.rule_type,
@@ -30,7 +30,11 @@ class SnortRulesTrigger(Trigger):
 
     def _run(self, archives) -> None:
         cache = Cache(os.environ.get("CACHE_DIR", "/data"))
-        rules = RulesFetcher(archives, cache).fetch_rules()
+        try:
+            rules = RulesFetcher(archives, cache).fetch_rules()
+        finally:
+            cache.close()
+
         if not rules:
             return
         bundle = {
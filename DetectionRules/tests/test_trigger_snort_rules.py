@@ -8,6 +8,8 @@ from unittest.mock import patch
 import pytest
 import requests_mock
 
+from detection_rules.cache import Cache
+from detection_rules.fetcher import RulesFetcher
 from detection_rules.trigger_snort_rules import SnortRulesTrigger
 
 
@@ -56,3 +58,61 @@ def test_snort_rules_trigger(send_event_mock, symphony_storage):
                 assert item["pattern_type"] == "snort"
                 assert item["pattern_version"] == "3.0"
                 assert item["pattern"].startswith("alert")
+
+
+RULE_1 = 'alert tcp any any -> any any (msg:"Rule 1"; http_uri; content:"/one"; sid:1000001; rev:1;)\n'
+RULE_1_V2 = 'alert tcp any any -> any any (msg:"Rule 1"; http_uri; content:"/one/two"; sid:1000001; rev:2;)\n'
+RULE_2 = 'alert tcp any any -> any any (msg:"Rule 2"; http_uri; content:"/two"; sid:1000002; rev:1;)\n'
+RULE_3 = 'alert tcp any any -> any any (msg:"Rule 3"; http_uri; content:"/three"; sid:1000003; rev:1;)\n'
+
+
+def test_fetcher_emits_only_changed_rules(symphony_storage):
+    cache = Cache(symphony_storage.as_posix())
+    fetcher = RulesFetcher([], cache)
+    url = "https://example.com/rules.tar.gz"
+
+    rules = fetcher._process_files(
+        url, {"a.rules": (RULE_1 + RULE_2).encode(), "b.rules": RULE_3.encode()}, "snort", "3.0"
+    )
+    assert sorted(rule["name"] for rule in rules) == [
+        "Rule 1 (sid 1000001)",
+        "Rule 2 (sid 1000002)",
+        "Rule 3 (sid 1000003)",
+    ]
+    first_ids = {rule["name"]: rule["id"] for rule in rules}
+
+    # rule 1 is modified, rule 2 is removed and b.rules is unchanged
+    rules = fetcher._process_files(url, {"a.rules": RULE_1_V2.encode(), "b.rules": RULE_3.encode()}, "snort", "3.0")
+    assert len(rules) == 2
+    modified, removed = rules
+    assert modified["name"] == "Rule 1 (sid 1000001)"
+    assert modified["id"] == first_ids["Rule 1 (sid 1000001)"]
+    assert "/one/two" in modified["pattern"]
+    assert "revoked" not in modified
+    assert removed["name"] == "Rule 2 (sid 1000002)"
+    assert removed["id"] == first_ids["Rule 2 (sid 1000002)"]
+    assert removed["revoked"] is True
+
+    # the rules of a file removed from the archive are revoked
+    rules = fetcher._process_files(url, {"a.rules": RULE_1_V2.encode()}, "snort", "3.0")
+    assert [(rule["name"], rule["revoked"]) for rule in rules] == [("Rule 3 (sid 1000003)", True)]
+
+    cache.close()
+
+
+def test_fetcher_parses_files_in_processes(symphony_storage):
+    cache = Cache(symphony_storage.as_posix())
+    fetcher = RulesFetcher([], cache, max_workers=2)
+
+    rules = fetcher._process_files(
+        "https://example.com/rules.tar.gz",
+        {"a.rules": RULE_1.encode(), "b.rules": (RULE_2 + RULE_3).encode(), "README": b"not rules"},
+        "suricata",
+    )
+
+    assert sorted(rule["name"] for rule in rules) == [
+        "Rule 1 (sid 1000001)",
+        "Rule 2 (sid 1000002)",
+        "Rule 3 (sid 1000003)",
+    ]
+    cache.close()
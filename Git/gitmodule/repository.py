@@ -3,7 +3,7 @@ from pathlib import Path
 import git
 
 from gitmodule.settings import get_settings
-from gitmodule.utils import copytree
+from gitmodule.utils import synctree
 
 
 class GitRepository:
@@ -36,19 +36,19 @@ class GitRepository:
             return False
 
         if self._data_path and (self._data_path / get_settings().repository_directory / ".git").is_dir():
-            copytree(self._data_path / get_settings().repository_directory, self.path)
+            synctree(self._data_path / get_settings().repository_directory, self.path)
             self._repo = git.Repo(self.path.as_posix())
             return False
         else:
             self._repo = git.Repo.clone_from(self._url, self.path.as_posix())
             if self._data_path:
-                copytree(self.path, self._data_path / get_settings().repository_directory)
+                synctree(self.path, self._data_path / get_settings().repository_directory)
             return True
 
     def pull(self):
         self._repo.remotes.origin.pull()
         if self._data_path:
-            copytree(self.path, self._data_path / get_settings().repository_directory)
+            synctree(self.path, self._data_path / get_settings().repository_directory)
 
     def last_commit(self):
         return self._repo.active_branch.commit
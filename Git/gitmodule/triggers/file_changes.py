@@ -6,7 +6,7 @@ from fnmatch import fnmatch
 from gitmodule.repository import GitRepository
 from gitmodule.settings import get_settings
 from gitmodule.triggers.base import GitTrigger
-from gitmodule.utils import copytree
+from gitmodule.utils import synctree
 
 
 def filechanges_directory():
@@ -101,6 +101,12 @@ class FileChangesTrigger(GitTrigger):
         changes = self.filter_changes(changes)
 
         if changes:
+            # The snapshot of the repository is updated once and shared by every chunk of the commit
+            if self.include_repository:
+                workdir = self._data_path / get_settings().repository_directory
+                written = synctree(self._repository.path, workdir)
+                self.log(f"Updated {written} files of the repository snapshot", level="debug")
+
             for chunk in self.file_changes_chunks(changes):
                 event = {
                     "changes": chunk,
@@ -109,8 +115,6 @@ class FileChangesTrigger(GitTrigger):
                 }
 
                 if self.include_repository:
-                    workdir = self._data_path / get_settings().repository_directory
-                    copytree(self._repository.path, workdir)
                     remove_directory = False
                     event["repository_path"] = self._repository.name
                 else:
@@ -31,3 +31,104 @@ def copytree(srcpath: Path, dstpath: Path):
             # copy the content of the source file into the destination file
             with src.open("rb") as srcf, dst.open("wb") as dstf:
                 copyfileobj(srcf, dstf)
+
+
+def _is_up_to_date(src_stat, dst: Path) -> bool:
+    """
+    Tell if the destination holds the same content as the source, judging by their size and modification time
+
+    :param src_stat: The stat result of the source
+    :param Path dst: The Path of the destination
+    """
+    try:
+        dst_stat = dst.stat()
+    except FileNotFoundError:
+        return False
+
+    return dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime >= src_stat.st_mtime
+
+
+def _remove(path: Path):
+    """
+    Remove a file or a directory with its content
+
+    :param Path path: The Path to remove
+    """
+    if not path.is_dir():
+        path.unlink()
+        return
+
+    for child in path.iterdir():
+        _remove(child)
+
+    # prefixes of remote storages disappear with their last file
+    if path.is_dir():
+        path.rmdir()
+
+
+def _link_or_copy(src: Path, dst: Path):
+    """
+    Hard-link the source to the destination, or copy it when the paths are not on the same filesystem
+
+    :param Path src: The Path of the source
+    :param Path dst: The Path of the destination
+    """
+    if dst.is_file():
+        dst.unlink()
+
+    try:
+        dst.hardlink_to(src)
+        return
+    except (OSError, NotImplementedError):
+        pass
+
+    with src.open("rb") as srcf, dst.open("wb") as dstf:
+        copyfileobj(srcf, dstf)
+
+
+def synctree(srcpath: Path, dstpath: Path) -> int:
+    """
+    Synchronize the destination with the source
+
+    Only the files that changed since the last synchronization are written, and they are hard-linked
+    when possible. The files missing from the source are removed from the destination.
+
+    :param Path srcpath: The Path of the source
+    :param Path dstpath: The Path of the destination
+    :return: The number of files written
+    """
+    written = 0
+    sources: set[str] = set()
+
+    # iter over children of the directory to synchronize
+    for src in srcpath.iterdir():
+        # get the destination path of the copy
+        dst = dstpath / src.name
+        sources.add(src.name)
+
+        # if the source is a directory, synchronize its content
+        if src.is_dir():
+            # the path was a file in the previous synchronization
+            if dst.exists() and not dst.is_dir():
+                _remove(dst)
+
+            dst.mkdir(parents=True, exist_ok=True)
+            written += synctree(src, dst)
+        # if the source is a file, only write it when it changed
+        elif src.is_file():
+            # the path was a directory in the previous synchronization
+            if dst.is_dir():
+                _remove(dst)
+
+            if not _is_up_to_date(src.stat(), dst):
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                _link_or_copy(src, dst)
+                written += 1
+
+    # remove the files that no longer exist in the source, sparing the source itself when nested in the destination
+    if dstpath.is_dir():
+        for dst in dstpath.iterdir():
+            if dst.name not in sources and not srcpath.is_relative_to(dst):
+                _remove(dst)
+
+    return written
@@ -95,11 +95,11 @@ def test_pull_with_backup_to_storage(symphony_storage, gitrepository):
     repository.clone()
 
     # act
-    with patch("gitmodule.utils.copytree") as copytree_mock:
+    with patch("gitmodule.repository.synctree") as synctree_mock:
         repository.pull()
 
         # assert
-        copytree_mock.assert_called()
+        synctree_mock.assert_called()
 
 
 def test_pull_with_no_storage(gitrepository):
@@ -108,8 +108,8 @@ def test_pull_with_no_storage(gitrepository):
     repository.clone()
 
     # act
-    with patch("gitmodule.utils.copytree") as copytree_mock:
+    with patch("gitmodule.repository.synctree") as synctree_mock:
         repository.pull()
 
         # assert
-        copytree_mock.assert_not_called()
+        synctree_mock.assert_not_called()
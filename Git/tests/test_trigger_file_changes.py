@@ -122,6 +122,20 @@ def test_trigger_run_chunks(send_event, pull, dummy_repo, trigger, settings):
     send_event.assert_has_calls([call1, call2])
 
 
+@patch.object(GitRepository, "pull")
+@patch.object(FileChangesTrigger, "send_event")
+def test_trigger_run_chunks_share_the_snapshot(send_event, pull, dummy_repo, trigger, symphony_storage, settings):
+    trigger.configuration = {"chunk_size": 1}
+    trigger._init_repository()
+    trigger._last_commit = "b26fd50e937871c068e9560f78abd6b9dc6ceae7"
+
+    with patch("gitmodule.triggers.file_changes.synctree", return_value=0) as mock_synctree:
+        trigger._run()
+
+    assert send_event.call_count == 2
+    mock_synctree.assert_called_once_with(dummy_repo, symphony_storage / settings.repository_directory)
+
+
 @patch.object(FileChangesTrigger, "send_event")
 def test_trigger_send_initial_state_not_cloned(send_event, dummy_repo, trigger):
     trigger.configuration = {"send_initial_state": True}
@@ -4,7 +4,7 @@
 import pytest
 
 # internal
-from gitmodule.utils import copytree
+from gitmodule.utils import copytree, synctree
 
 
 def test_copytree(dummy_repo, symphony_storage):
@@ -17,6 +17,57 @@ def test_copytree(dummy_repo, symphony_storage):
     assert (symphony_storage / ".git").is_dir()
 
 
+def test_synctree(dummy_repo, symphony_storage):
+    snapshot = symphony_storage / "snapshot"
+    snapshot.mkdir()
+    (snapshot / "stale_directory").mkdir()
+    (snapshot / "stale_directory" / "stale_file.txt").write_text("stale")
+
+    written = synctree(dummy_repo, snapshot)
+
+    assert written > 0
+    assert (snapshot / "README.md").read_text() == (dummy_repo / "README.md").read_text()
+    assert (snapshot / "directory" / "some_file.txt").is_file()
+    assert (snapshot / ".git").is_dir()
+    assert not (snapshot / "stale_directory").exists()
+
+    # nothing is written when the source did not change
+    assert synctree(dummy_repo, snapshot) == 0
+
+    # only the changed files are written
+    (dummy_repo / "README.md").unlink()
+    (dummy_repo / "README.md").write_text("new content")
+    (dummy_repo / "root_file.txt").unlink()
+
+    assert synctree(dummy_repo, snapshot) == 1
+    assert (snapshot / "README.md").read_text() == "new content"
+    assert not (snapshot / "root_file.txt").exists()
+
+
+def test_synctree_with_file_replaced_by_directory(dummy_repo, symphony_storage):
+    synctree(dummy_repo, symphony_storage)
+
+    # a file replaced by a directory
+    (dummy_repo / "root_file.txt").unlink()
+    (dummy_repo / "root_file.txt").mkdir()
+    (dummy_repo / "root_file.txt" / "nested_file.txt").write_text("nested")
+
+    # a directory replaced by a file
+    (dummy_repo / "directory" / "some_file.txt").unlink()
+    (dummy_repo / "directory").rmdir()
+    (dummy_repo / "directory").write_text("now a file")
+
+    assert synctree(dummy_repo, symphony_storage) == 2
+    assert (symphony_storage / "root_file.txt" / "nested_file.txt").read_text() == "nested"
+    assert (symphony_storage / "directory").read_text() == "now a file"
+
+
+def test_synctree_hardlinks(dummy_repo, symphony_storage):
+    synctree(dummy_repo, symphony_storage)
+
+    assert (symphony_storage / "README.md").samefile(dummy_repo / "README.md")
+
+
 @pytest.mark.skipif(
     "{'AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_BUCKET_NAME', 'AWS_DEFAULT_REGION'} \
     .issubset(os.environ.keys()) == False"
@@ -157,6 +157,30 @@ class AsyncGithubClient(object):
 
                 return result, next_link
 
+    async def iter_audit_logs(
+        self, start_from: int, url: str | None = None
+    ) -> AsyncGenerator[tuple[list[dict[str, Any]], str | None], None]:
+        """
+        Iterate over the pages of audit logs.
+
+        Pages are followed through the cursor of the `next` link, so each page is read only once.
+        If an url is provided, the iteration resumes from it instead of searching by timestamp.
+
+        Args:
+            start_from: int
+            url: str | None: the cursor url of the page to resume from
+
+        Yields:
+            tuple[list[dict[str, Any]], str | None]: the page and the url of the next page
+        """
+        next_url: str | None = url
+        while True:
+            result, next_url = await self._get_audit_logs(start_from, next_url)
+            yield result, next_url
+
+            if not next_url:
+                break
+
     async def get_audit_logs(self, start_from: int) -> list[dict[str, Any]]:
         """
         Get audit logs.
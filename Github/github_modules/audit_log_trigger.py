@@ -3,6 +3,7 @@
 import asyncio
 import time
 import traceback
+from time import perf_counter
 from typing import Any, Optional
 
 import orjson
@@ -15,7 +16,14 @@ from sekoia_automation.storage import PersistentJSON
 from github_modules import GithubModule
 from github_modules.async_client.http_client import AsyncGithubClient
 from github_modules.logging import get_logger
-from github_modules.metrics import EVENTS_LAG, FORWARD_EVENTS_DURATION, INCOMING_MESSAGES, OUTCOMING_EVENTS
+from github_modules.metrics import (
+    EVENTS_LAG,
+    FETCH_PAGE_DURATION,
+    FORWARD_EVENTS_DURATION,
+    INCOMING_MESSAGES,
+    OUTCOMING_EVENTS,
+    PUSH_PAGE_DURATION,
+)
 
 logger = get_logger()
 
@@ -28,6 +36,7 @@ class AuditLogConnectorConfiguration(DefaultConnectorConfiguration):
     ratelimit_per_minute: int = 83
     filter: str | None = None
     q: str | None = None
+    prefetch_pages: int = 0
 
 
 class AuditLogConnector(AsyncConnector):
@@ -105,6 +114,30 @@ class AuditLogConnector(AsyncConnector):
         with self.context as cache:
             cache["last_ts"] = str(last_ts)
 
+    @property
+    def next_page_url(self) -> str | None:
+        """
+        Get the cursor url of the next page of audit logs to read, if any.
+
+        Returns:
+            str | None:
+        """
+        with self.context as cache:
+            next_page_url = cache.get("next_page_url")
+
+        return next_page_url if isinstance(next_page_url, str) else None
+
+    @next_page_url.setter
+    def next_page_url(self, next_page_url: str | None) -> None:
+        """
+        Set the cursor url of the next page of audit logs to read.
+
+        Args:
+            next_page_url: str | None
+        """
+        with self.context as cache:
+            cache["next_page_url"] = next_page_url
+
     async def get_audit_events(self, last_ts: int) -> list[dict[str, Any]]:
         """
         Get audit events from Github API.
@@ -133,11 +166,126 @@ class AuditLogConnector(AsyncConnector):
 
         return batch
 
+    async def fetch_pages(
+        self,
+        queue: asyncio.Queue[tuple[list[dict[str, Any]], str | None] | Exception | None],
+        last_ts: int,
+        next_page_url: str | None,
+    ) -> None:
+        """
+        Fetch the pages of audit logs and put them in the queue.
+
+        The queue is bounded, so at most `prefetch_pages` pages are fetched ahead of the forwarding.
+        The end of the pages is notified with `None`, a failure with the raised exception.
+
+        Args:
+            queue: asyncio.Queue
+            last_ts: int
+            next_page_url: str | None
+        """
+        try:
+            start = perf_counter()
+            async for page, next_url in self.github_client.iter_audit_logs(last_ts, next_page_url):
+                FETCH_PAGE_DURATION.labels(intake_key=self.configuration.intake_key).observe(perf_counter() - start)
+                await queue.put((page, next_url))
+                start = perf_counter()
+
+        except Exception as error:
+            await queue.put(error)
+            return
+
+        await queue.put(None)
+
+    async def forward_pages(self, batch_start_time: float) -> int:
+        """
+        Forward the audit logs page by page, while the next pages are fetched.
+
+        After each page, the timestamp of the last forwarded event and the cursor of the next page are saved,
+        so an interrupted collect resumes from the cursor instead of searching again by timestamp.
+        The collect stops at the first event in the time buffer.
+
+        Args:
+            batch_start_time: float
+
+        Returns:
+            int: the number of forwarded events
+        """
+        queue: asyncio.Queue[tuple[list[dict[str, Any]], str | None] | Exception | None] = asyncio.Queue(
+            maxsize=self.configuration.prefetch_pages
+        )
+        producer = asyncio.create_task(self.fetch_pages(queue, self.last_ts, self.next_page_url))
+
+        total_forwarded = 0
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+
+                if isinstance(item, Exception):
+                    raise item
+
+                page, next_url = item
+                if type(page) is not list:
+                    self.log(message=str(page), level="warn")
+                    # the cursor may have expired, start again from the last timestamp
+                    self.next_page_url = None
+                    break
+
+                INCOMING_MESSAGES.labels(intake_key=self.configuration.intake_key).inc(len(page))
+                filtered_data = self._refine_batch(page, batch_start_time)
+
+                if filtered_data:
+                    batch_of_events = [orjson.dumps(event).decode("utf-8") for event in filtered_data]
+                    OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(batch_of_events))
+
+                    start = perf_counter()
+                    await self.push_data_to_intakes(events=batch_of_events)
+                    PUSH_PAGE_DURATION.labels(intake_key=self.configuration.intake_key).observe(perf_counter() - start)
+
+                    self.last_ts = filtered_data[-1]["@timestamp"]
+                    total_forwarded += len(batch_of_events)
+
+                # the remaining events are in the time buffer
+                if len(filtered_data) < len(page):
+                    self.next_page_url = None
+                    break
+
+                self.next_page_url = next_url
+
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+        return total_forwarded
+
     async def next_batch(self) -> None:
         """Fetches the next batch of events and pushes them to the intake."""
 
         current_lag: int = 0
         batch_start_time = time.time()
+
+        if self.configuration.prefetch_pages > 0:
+            total_forwarded = await self.forward_pages(batch_start_time)
+
+            if total_forwarded > 0:
+                self.log(
+                    message=f"Forwarded {total_forwarded} events to the intake",
+                    level="info",
+                )
+
+                # compute the lag
+                current_lag = int(time.time() - self.last_ts / 1000)
+            else:
+                self.log(
+                    message="No events to forward ",
+                    level="info",
+                )
+
+            EVENTS_LAG.labels(intake_key=self.configuration.intake_key).set(current_lag)
+            await self.wait_next_batch(batch_start_time)
+            return
+
         audit_events = await self.get_audit_events(self.last_ts)
         INCOMING_MESSAGES.labels(intake_key=self.configuration.intake_key).inc(len(audit_events))
 
@@ -172,7 +320,15 @@ class AuditLogConnector(AsyncConnector):
             )
 
         EVENTS_LAG.labels(intake_key=self.configuration.intake_key).set(current_lag)
+        await self.wait_next_batch(batch_start_time)
+
+    async def wait_next_batch(self, batch_start_time: float) -> None:
+        """
+        Observe the duration of the batch and wait for the next one.
 
+        Args:
+            batch_start_time: float
+        """
         # get the ending time and compute the duration to fetch the events
         batch_end_time = time.time()
         batch_duration = int(batch_end_time - batch_start_time)
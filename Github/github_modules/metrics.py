@@ -33,3 +33,17 @@ FORWARD_EVENTS_DURATION = Histogram(
     namespace=prom_namespace,
     labelnames=["intake_key"],
 )
+
+FETCH_PAGE_DURATION = Histogram(
+    name="page_fetch_duration",
+    documentation="Duration to fetch a page of audit logs from Github",
+    namespace=prom_namespace_github,
+    labelnames=["intake_key"],
+)
+
+PUSH_PAGE_DURATION = Histogram(
+    name="page_push_duration",
+    documentation="Duration to forward a page of audit logs to SEKOIA.IO",
+    namespace=prom_namespace_github,
+    labelnames=["intake_key"],
+)
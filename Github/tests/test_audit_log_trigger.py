@@ -1,8 +1,9 @@
 """Contains tests for AuditLogConnector."""
 
+import time
 from posixpath import join as urljoin
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from aioresponses import aioresponses
@@ -170,3 +171,111 @@ async def test_next_batch_with_pem_file(connector_with_pem_file, github_response
         )
 
         await connector_with_pem_file.next_batch()
+
+
+@pytest.mark.asyncio
+async def test_next_batch_pipelined(connector_with_api_key, github_response, session_faker):
+    """
+    Test AuditLogConnector next_batch with prefetched pages.
+
+    Args:
+        connector_with_api_key: AuditLogConnector
+        github_response: list[dict[str, Any]]
+        session_faker: Faker
+    """
+    connector_with_api_key.configuration = {
+        "intake_server": "https://intake.sekoia.io",
+        "intake_key": session_faker.word(),
+        "frequency": 0,
+        "prefetch_pages": 2,
+    }
+    connector_with_api_key.push_data_to_intakes = AsyncMock()
+    next_page_link = session_faker.uri()
+    second_page = [{**github_response[0], "@timestamp": github_response[-1]["@timestamp"] + 1000}]
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.get(
+            connector_with_api_key.github_client.audit_logs_url
+            + "?order=asc&per_page=100&phrase=created%253A%253E{0}".format(connector_with_api_key.last_ts),
+            status=200,
+            payload=github_response,
+            headers={"Link": '<{0}>; rel="next"'.format(next_page_link)},
+        )
+        mocked_responses.get(next_page_link, status=200, payload=second_page)
+
+        await connector_with_api_key.next_batch()
+
+    assert [len(call.kwargs["events"]) for call in connector_with_api_key.push_data_to_intakes.call_args_list] == [
+        len(github_response),
+        1,
+    ]
+    assert connector_with_api_key.last_ts == second_page[0]["@timestamp"]
+    assert connector_with_api_key.next_page_url is None
+
+
+@pytest.mark.asyncio
+async def test_next_batch_pipelined_resumes_from_cursor(connector_with_api_key, github_response, session_faker):
+    """
+    Test AuditLogConnector next_batch resumes from the saved cursor instead of searching by timestamp.
+
+    Args:
+        connector_with_api_key: AuditLogConnector
+        github_response: list[dict[str, Any]]
+        session_faker: Faker
+    """
+    connector_with_api_key.configuration = {
+        "intake_server": "https://intake.sekoia.io",
+        "intake_key": session_faker.word(),
+        "frequency": 0,
+        "prefetch_pages": 1,
+    }
+    connector_with_api_key.push_data_to_intakes = AsyncMock()
+    next_page_link = session_faker.uri()
+    connector_with_api_key.next_page_url = next_page_link
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.get(next_page_link, status=200, payload=github_response)
+
+        await connector_with_api_key.next_batch()
+
+    connector_with_api_key.push_data_to_intakes.assert_awaited_once()
+    assert connector_with_api_key.last_ts == github_response[-1]["@timestamp"]
+    assert connector_with_api_key.next_page_url is None
+
+
+@pytest.mark.asyncio
+async def test_next_batch_pipelined_stops_at_time_buffer(connector_with_api_key, github_response, session_faker):
+    """
+    Test AuditLogConnector next_batch stops at the first event in the time buffer and forgets the cursor.
+
+    Args:
+        connector_with_api_key: AuditLogConnector
+        github_response: list[dict[str, Any]]
+        session_faker: Faker
+    """
+    connector_with_api_key.configuration = {
+        "intake_server": "https://intake.sekoia.io",
+        "intake_key": session_faker.word(),
+        "frequency": 0,
+        "prefetch_pages": 1,
+    }
+    connector_with_api_key.push_data_to_intakes = AsyncMock()
+    next_page_link = session_faker.uri()
+    recent_event = {**github_response[0], "@timestamp": round(time.time() * 1000)}
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.get(
+            connector_with_api_key.github_client.audit_logs_url
+            + "?order=asc&per_page=100&phrase=created%253A%253E{0}".format(connector_with_api_key.last_ts),
+            status=200,
+            payload=github_response + [recent_event],
+            headers={"Link": '<{0}>; rel="next"'.format(next_page_link)},
+        )
+        mocked_responses.get(next_page_link, status=200, payload=[recent_event])
+
+        await connector_with_api_key.next_batch()
+
+    connector_with_api_key.push_data_to_intakes.assert_awaited_once()
+    assert len(connector_with_api_key.push_data_to_intakes.call_args.kwargs["events"]) == len(github_response)
+    assert connector_with_api_key.last_ts == github_response[-1]["@timestamp"]
+    assert connector_with_api_key.next_page_url is None
@@ -1,3 +1,5 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import cached_property
 from collections.abc import Generator
 from typing import Any, Union
@@ -7,6 +9,7 @@ from dateutil.parser import isoparse
 from datetime import timedelta, datetime
 
 from sekoia_automation.asset_connector import AssetConnector
+from sekoia_automation.asset_connector.models.connector import DefaultAssetConnectorConfiguration
 from sekoia_automation.asset_connector.models.ocsf.base import (
     Metadata,
     Product,
@@ -26,7 +29,12 @@ from harfanglab.helpers import handle_uri
 from harfanglab.client import ApiClient
 
 
+class HarfanglabAssetConnectorConfiguration(DefaultAssetConnectorConfiguration):
+    fetch_workers: int = 1
+
+
 class HarfanglabAssetConnector(AssetConnector):
+    configuration: HarfanglabAssetConnectorConfiguration
 
     AGENT_ENDPOINT: str = "/api/data/endpoint/Agent"
     DEVICE_ORDERING_FIELD: str = "firstseen"
@@ -134,6 +142,38 @@ class HarfanglabAssetConnector(AssetConnector):
             device=device,
         )
 
+    def __fetch_page(self, url: str, params: dict[str, Union[str, int]] | None = None) -> dict[str, Any]:
+        response = self.client.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def __fetch_pages_concurrently(
+        self, url: str, params: dict[str, Union[str, int]], count: int
+    ) -> Generator[list[dict[str, Any]], None, None]:
+        """
+        Fetch the pages following the first one, by offset, with a bounded pool of workers.
+
+        The pages are yielded in order, while the next ones are being fetched.
+        """
+        offsets = deque(range(self.limit, count, self.limit))
+        pending: deque[Future] = deque()
+
+        with ThreadPoolExecutor(max_workers=self.configuration.fetch_workers) as executor:
+            try:
+                while self.running and (offsets or pending):
+                    while offsets and len(pending) < self.configuration.fetch_workers:
+                        pending.append(
+                            executor.submit(self.__fetch_page, url, {**params, "offset": offsets.popleft()})
+                        )
+
+                    devices = pending.popleft().result()
+                    self.log(f"Fetched {len(devices.get('results', []))} devices from Harfanglab API", level="debug")
+                    yield devices.get("results", [])
+
+            finally:
+                for future in pending:
+                    future.cancel()
+
     def __fetch_devices(self, from_date: str | None) -> Generator[list[dict[str, Any]], None, None]:
         self.log(f"Start fetching devices from Harfanglab API from date {from_date}", level="info")
 
@@ -147,12 +187,22 @@ class HarfanglabAssetConnector(AssetConnector):
         if from_date:
             params["firstseen"] = from_date
 
-        device_response = self.client.get(devices_url, params=params)
-        device_response.raise_for_status()
+        devices = self.__fetch_page(devices_url, params=params)
 
-        while self.running:
-            devices = device_response.json()
+        # Once the first page gives the total count, fetch the following pages concurrently
+        if self.configuration.fetch_workers > 1:
+            self.log(f"Fetched {devices.get('count', 0)} device assets from Harfanglab API", level="info")
+            if not devices or devices.get("count") == 0:
+                return
+
+            yield devices.get("results", [])
+
+            if devices.get("next"):
+                yield from self.__fetch_pages_concurrently(devices_url, params, devices["count"])
+
+            return
 
+        while self.running:
             self.log(f"Fetched {devices.get('count', 0)} device assets from Harfanglab API", level="info")
             # Check if there are no devices or if the count is zero
             # This is to handle the case where there are no devices returned
@@ -167,8 +217,7 @@ class HarfanglabAssetConnector(AssetConnector):
             else:
                 return
 
-            device_response = self.client.get(next_page_url)
-            device_response.raise_for_status()
+            devices = self.__fetch_page(next_page_url)
 
     def next_list_devices(self) -> Generator[list[dict[str, Any]], None, None]:
         orig_date: datetime | None = isoparse(self.most_recent_date_seen) if self.most_recent_date_seen else None
@@ -197,6 +246,10 @@ class HarfanglabAssetConnector(AssetConnector):
             self._latest_time = max_date.isoformat()
 
     def update_checkpoint(self) -> None:
+        # The most recent date is only known once all the devices were fetched
+        if self._latest_time is None:
+            return
+
         with self.context as cache:
             cache["most_recent_date_seen"] = self._latest_time
 
@@ -444,3 +444,44 @@ def test_fetch_devices_no_results(test_harfanglab_asset_connector):
         devices = list(test_harfanglab_asset_connector._HarfanglabAssetConnector__fetch_devices(from_date))
 
         assert len(devices) == 0
+
+
+def test_fetch_devices_concurrently(test_harfanglab_asset_connector, asset_first_object):
+    test_harfanglab_asset_connector.configuration = {
+        "sekoia_base_url": "https://sekoia.io",
+        "sekoia_api_key": "fake_api_key",
+        "frequency": 60,
+        "fetch_workers": 4,
+    }
+    test_harfanglab_asset_connector.limit = 2
+    devices_url = f"{test_harfanglab_asset_connector.base_url}/api/data/endpoint/Agent"
+    all_devices = [{**asset_first_object, "id": str(index)} for index in range(5)]
+
+    def agent_response(request, context):
+        offset = int(request.qs.get("offset", [0])[0])
+        next_page = f"/api/data/endpoint/Agent?limit=2&offset={offset + 2}" if offset + 2 < 5 else None
+        return {"count": 5, "next": next_page, "previous": None, "results": all_devices[offset : offset + 2]}
+
+    with requests_mock.Mocker() as agent_request:
+        agent_request.get(devices_url, json=agent_response)
+
+        pages = list(test_harfanglab_asset_connector._HarfanglabAssetConnector__fetch_devices(None))
+
+        assert [[device["id"] for device in page] for page in pages] == [["0", "1"], ["2", "3"], ["4"]]
+        assert sorted(request.qs.get("offset", ["0"])[0] for request in agent_request.request_history) == [
+            "0",
+            "2",
+            "4",
+        ]
+
+
+def test_update_checkpoint_before_the_end_of_the_fetch(test_harfanglab_asset_connector):
+    with test_harfanglab_asset_connector.context as cache:
+        cache["most_recent_date_seen"] = "2025-06-11T00:15:06.454735+00:00"
+
+    test_harfanglab_asset_connector.update_checkpoint()
+    assert test_harfanglab_asset_connector.most_recent_date_seen == "2025-06-11T00:15:06.454735+00:00"
+
+    test_harfanglab_asset_connector._latest_time = "2025-06-12T00:00:00+00:00"
+    test_harfanglab_asset_connector.update_checkpoint()
+    assert test_harfanglab_asset_connector.most_recent_date_seen == "2025-06-12T00:00:00+00:00"
@@ -0,0 +1,83 @@
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+
+
+def _hash(*parts: str | int) -> int:
+    """
+    Compute a signed 64-bit hash, suitable for sqlite integers
+    """
+    data = "|".join(str(part) for part in parts).encode("utf-8")
+    return int.from_bytes(
+        hashlib.blake2b(data, digest_size=8).digest(), "little", signed=True
+    )
+
+
+class DatabaseDigest:
+    """
+    Persisted digest of the ranges of the previous database
+
+    For each IP range, the digest keeps a hash of its country and ASN mapping
+    and the time it was last sent. The changes of a run are only committed
+    once the run is completed.
+    """
+
+    def __init__(self, path: Path, refresh_after: int):
+        """
+        :param path: Path of the sqlite database holding the digest
+        :param refresh_after: Duration, in seconds, after which an unchanged range
+                              is sent again
+        """
+        self.refresh_after = refresh_after
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS ranges "
+            "(key INTEGER PRIMARY KEY, digest INTEGER NOT NULL, "
+            "sent_at INTEGER NOT NULL, run_at INTEGER NOT NULL)"
+        )
+        self.connection.commit()
+        self.run_at = int(time.time())
+
+    def changed(
+        self, start_ip: str, end_ip: str, country: str, asn: int | str, as_name: str
+    ) -> bool:
+        """
+        Record the mapping of the range and tell if it must be sent
+        """
+        key = _hash(start_ip, end_ip)
+        digest = _hash(country, asn, as_name)
+
+        row = self.connection.execute(
+            "SELECT digest, sent_at FROM ranges WHERE key = ?", (key,)
+        ).fetchone()
+        if (
+            row is not None
+            and row[0] == digest
+            and self.run_at - row[1] < self.refresh_after
+        ):
+            self.connection.execute(
+                "UPDATE ranges SET run_at = ? WHERE key = ?", (self.run_at, key)
+            )
+            return False
+
+        self.connection.execute(
+            "INSERT OR REPLACE INTO ranges (key, digest, sent_at, run_at) "
+            "VALUES (?, ?, ?, ?)",
+            (key, digest, self.run_at, self.run_at),
+        )
+        return True
+
+    def commit(self) -> None:
+        """
+        Commit the changes of the run and forget the ranges
+        that are no longer in the database
+        """
+        self.connection.execute("DELETE FROM ranges WHERE run_at != ?", (self.run_at,))
+        self.connection.commit()
+
+    def rollback(self) -> None:
+        self.connection.rollback()
+
+    def close(self) -> None:
+        self.connection.close()
@@ -6,19 +6,35 @@ import logging
 import uuid
 from datetime import datetime, timedelta
 from functools import cached_property
-from io import BytesIO
 from ipaddress import IPv6Network, IPv4Network
 from typing import Iterator
 from iso3166 import countries
 
+import orjson
 import requests
 from sekoia_automation.storage import write
 from sekoia_automation.trigger import Trigger
 
+from ipinfo.digest import DatabaseDigest
+
+# Namespace used by STIX 2.1 for deterministic identifiers of cyber observables
+STIX_NAMESPACE = uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7")
+
+
+def deterministic_id(object_type: str, contributing_properties: dict) -> str:
+    """
+    Build an identifier derived from the properties of the object,
+    so that the same object gets the same identifier across runs
+    """
+    name = json.dumps(contributing_properties, sort_keys=True, separators=(",", ":"))
+    return f"{object_type}--{uuid.uuid5(STIX_NAMESPACE, name)}"
+
 
 class TriggerFetchIPInfoDatabase(Trigger):
     MAX_HOUR_TAG_VALID_FOR: int = 3 * 24  # Tags are valid for 3 days
 
+    digest: DatabaseDigest | None = None
+
     @cached_property
     def api_token(self):
         return self.module.configuration["api_token"]
@@ -39,6 +55,10 @@ class TriggerFetchIPInfoDatabase(Trigger):
     def interval(self):
         return self.configuration.get("interval", 24) * 3600
 
+    @property
+    def only_changes(self) -> bool:
+        return self.configuration.get("only_changes", False)
+
     @property
     def identity(self):
         return {
@@ -70,14 +90,35 @@ class TriggerFetchIPInfoDatabase(Trigger):
         This method downloads the 'Free IP to Country + IP to ASN' database
         and create events in chunks to forward its content
         """
-        chunks = 0
-        for location_chunk_info in self.build_chunks(
-            generator=self.get_ipinfo_database(),
-            chunk_size=self.configuration.get("chunk_size", 10000),
-        ):
-            self.create_event_for_chunk(location_chunk_info)
-            chunks += 1
-        self.log(f"Sent {chunks} chunk events to the API")
+        if self.only_changes:
+            # Unchanged ranges are sent again before their tags expire
+            self.digest = DatabaseDigest(
+                self.data_path.joinpath("ipinfo_digest.sqlite"),
+                refresh_after=self.tags_valid_for * 3600 // 2,
+            )
+
+        try:
+            chunks = 0
+            for location_chunk_info in self.build_chunks(
+                generator=self.get_ipinfo_database(),
+                chunk_size=self.configuration.get("chunk_size", 10000),
+            ):
+                self.create_event_for_chunk(location_chunk_info)
+                chunks += 1
+            self.log(f"Sent {chunks} chunk events to the API")
+
+            if self.digest is not None:
+                self.digest.commit()
+
+        except Exception:
+            if self.digest is not None:
+                self.digest.rollback()
+            raise
+
+        finally:
+            if self.digest is not None:
+                self.digest.close()
+                self.digest = None
 
     def get_ipinfo_database(self) -> Iterator[list]:
         """
@@ -97,8 +138,10 @@ class TriggerFetchIPInfoDatabase(Trigger):
         )
         asn_cache: dict[int, dict] = dict()
 
-        with gzip.open(BytesIO(response.content), mode="r") as gz:
-            for row in gz.readlines():
+        # Decompress the database while downloading it
+        response.raw.decode_content = True
+        with gzip.GzipFile(fileobj=response.raw, mode="rb") as gz:
+            for row in gz:
                 yield from self._parse_db_row(
                     row, tag_valid_from, tag_valid_until, asn_cache
                 )
@@ -126,7 +169,7 @@ class TriggerFetchIPInfoDatabase(Trigger):
     ) -> dict:
         asn_cache[asn_number] = {
             "type": "autonomous-system",
-            "id": f"autonomous-system--{str(uuid.uuid4())}",
+            "id": deterministic_id("autonomous-system", {"number": asn_number}),
             "number": asn_number,
             "name": asn_name,
             "x_inthreat_sources_refs": [self.identity["id"]],
@@ -161,7 +204,7 @@ class TriggerFetchIPInfoDatabase(Trigger):
         Parses a database row and yields the extracted observables.
         """
         try:
-            data = json.loads(row.decode("utf-8"))
+            data = orjson.loads(row)
 
             asn_number = data["asn"]
             asn_name = data["as_name"]
@@ -184,6 +227,12 @@ class TriggerFetchIPInfoDatabase(Trigger):
             # Don't consider not routed IP segment
             return
 
+        if self.digest is not None and not self.digest.changed(
+            data["start_ip"], data["end_ip"], country_code, asn_number, asn_name
+        ):
+            # The mapping of the segment didn't change since the previous run
+            return
+
         tags = self._get_tags(country_code, tag_valid_from, tag_valid_until, row)
         if asn_number in asn_cache:
             autonomous_system = asn_cache[asn_number]
@@ -234,7 +283,7 @@ class TriggerFetchIPInfoDatabase(Trigger):
     ) -> dict:
         return {
             "type": observable_type,
-            "id": f"{observable_type}--{str(uuid.uuid4())}",
+            "id": deterministic_id(observable_type, {"value": str(ip_range)}),
             "value": str(ip_range),
             "x_inthreat_tags": tags,
             "x_inthreat_sources_refs": [self.identity["id"]],
@@ -244,7 +293,14 @@ class TriggerFetchIPInfoDatabase(Trigger):
         self, observable: dict, autonomous_system: dict
     ) -> dict:
         return {
-            "id": f"observable-relationship--{uuid.uuid4()}",
+            "id": deterministic_id(
+                "observable-relationship",
+                {
+                    "relationship_type": "belongs-to",
+                    "source_ref": observable["id"],
+                    "target_ref": autonomous_system["id"],
+                },
+            ),
             "type": "observable-relationship",
             "source_ref": observable["id"],
             "target_ref": autonomous_system["id"],
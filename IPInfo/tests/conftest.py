@@ -1,4 +1,3 @@
-import uuid
 from shutil import rmtree
 from tempfile import mkdtemp
 from pathlib import Path
@@ -26,10 +25,3 @@ def config_storage():
 
     rmtree(config.VOLUME_PATH)
     config.VOLUME_PATH = old_config_storage
-
-
-@pytest.fixture
-def mocked_uuid(mocker):
-    mock_uuid = mocker.patch.object(uuid, "uuid4", autospec=True)
-    mock_uuid.return_value = uuid.UUID(hex="00000000000000000000000000000000")
-    return mock_uuid
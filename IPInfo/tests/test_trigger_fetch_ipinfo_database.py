@@ -7,6 +7,7 @@ from unittest.mock import MagicMock
 import pytest
 import requests_mock
 
+from ipinfo.digest import DatabaseDigest
 from ipinfo.trigger_fetch_ipinfo_database import TriggerFetchIPInfoDatabase
 
 
@@ -52,7 +53,62 @@ def test_get_ipinfo_database(trigger, symphony_storage, request_mock):
         assert "directory" in caller_params
 
 
-def test_parse_db_rows_ipv4(trigger, mocked_uuid):
+def test_get_ipinfo_database_only_changes(trigger, symphony_storage, request_mock):
+    trigger.configuration = {
+        "interval": 0,
+        "chunk_size": 10000,
+        "tags_valid_for": 24,
+        "only_changes": True,
+    }
+    symphony_storage.joinpath("ipinfo_digest.sqlite").unlink(missing_ok=True)
+
+    with open("tests/data/country_asn.json.gz", "rb") as mock_fp:
+        request_mock.get(trigger.database_url, content=mock_fp.read())
+
+    # first run: every range is sent
+    trigger._fetch_database()
+    events = [
+        request.json()
+        for request in request_mock.request_history
+        if request.url == trigger.callback_url
+    ]
+    assert [event["name"] for event in events] == ["IPINFO.IO List Chunk 0-161"]
+
+    # second run: nothing changed
+    request_mock.reset_mock()
+    trigger._fetch_database()
+    assert not any(
+        request.url == trigger.callback_url for request in request_mock.request_history
+    )
+    assert trigger.digest is None
+
+
+def test_database_digest(symphony_storage):
+    path = symphony_storage.joinpath("digest.sqlite")
+    path.unlink(missing_ok=True)
+
+    digest = DatabaseDigest(path, refresh_after=3600)
+    assert digest.changed("1.1.1.0", "1.1.1.255", "FR", 174, "Cogent") is True
+    assert digest.changed("1.1.2.0", "1.1.2.255", "FR", 174, "Cogent") is True
+    digest.commit()
+    digest.close()
+
+    digest = DatabaseDigest(path, refresh_after=3600)
+    digest.run_at += 1
+    assert digest.changed("1.1.1.0", "1.1.1.255", "FR", 174, "Cogent") is False
+    assert digest.changed("1.1.2.0", "1.1.2.255", "DE", 174, "Cogent") is True
+    digest.commit()
+
+    # ranges missing from the latest database are forgotten
+    assert digest.connection.execute("SELECT COUNT(*) FROM ranges").fetchone()[0] == 2
+
+    # unchanged ranges are sent again after a while
+    digest.run_at += 3600
+    assert digest.changed("1.1.1.0", "1.1.1.255", "FR", 174, "Cogent") is True
+    digest.close()
+
+
+def test_parse_db_rows_ipv4(trigger):
     # ipv6 segment
     assert list(
         trigger._parse_db_row(
@@ -64,7 +120,7 @@ def test_parse_db_rows_ipv4(trigger, mocked_uuid):
     ) == [
         [
             {
-                "id": "autonomous-system--00000000-0000-0000-0000-000000000000",
+                "id": "autonomous-system--55d86c46-4ca5-59db-b240-d082106bbcf5",
                 "name": "Cogent Communications",
                 "number": 174,
                 "type": "autonomous-system",
@@ -73,17 +129,17 @@ def test_parse_db_rows_ipv4(trigger, mocked_uuid):
                 ],
             },
             {
-                "id": "observable-relationship--00000000-0000-0000-0000-000000000000",
+                "id": "observable-relationship--93674668-4a83-5c9e-b1ad-9e86d2bd7df6",
                 "relationship_type": "belongs-to",
-                "source_ref": "ipv6-addr--00000000-0000-0000-0000-000000000000",
-                "target_ref": "autonomous-system--00000000-0000-0000-0000-000000000000",
+                "source_ref": "ipv6-addr--cb4eda17-247f-5436-b15f-4836c8e25ca6",
+                "target_ref": "autonomous-system--55d86c46-4ca5-59db-b240-d082106bbcf5",
                 "type": "observable-relationship",
                 "x_inthreat_sources_refs": [
                     "identity--1e9f6197-b3a0-4665-88e7-767929d013a4"
                 ],
             },
             {
-                "id": "ipv6-addr--00000000-0000-0000-0000-000000000000",
+                "id": "ipv6-addr--cb4eda17-247f-5436-b15f-4836c8e25ca6",
                 "type": "ipv6-addr",
                 "value": "2001:550:2:8::2b:1/128",
                 "x_inthreat_sources_refs": [
@@ -116,7 +172,7 @@ def test_parse_db_rows_ipv4(trigger, mocked_uuid):
     ) == [
         [
             {
-                "id": "autonomous-system--00000000-0000-0000-0000-000000000000",
+                "id": "autonomous-system--55d86c46-4ca5-59db-b240-d082106bbcf5",
                 "name": "Cogent Communications",
                 "number": 174,
                 "type": "autonomous-system",
@@ -125,17 +181,17 @@ def test_parse_db_rows_ipv4(trigger, mocked_uuid):
                 ],
             },
             {
-                "id": "observable-relationship--00000000-0000-0000-0000-000000000000",
+                "id": "observable-relationship--4502755b-defd-51f0-86df-db16d9764ed4",
                 "relationship_type": "belongs-to",
-                "source_ref": "ipv4-addr--00000000-0000-0000-0000-000000000000",
-                "target_ref": "autonomous-system--00000000-0000-0000-0000-000000000000",
+                "source_ref": "ipv4-addr--2a76b7a5-6cdf-5e53-90da-cfeecfaee7c7",
+                "target_ref": "autonomous-system--55d86c46-4ca5-59db-b240-d082106bbcf5",
                 "type": "observable-relationship",
                 "x_inthreat_sources_refs": [
                     "identity--1e9f6197-b3a0-4665-88e7-767929d013a4"
                 ],
             },
             {
-                "id": "ipv4-addr--00000000-0000-0000-0000-000000000000",
+                "id": "ipv4-addr--2a76b7a5-6cdf-5e53-90da-cfeecfaee7c7",
                 "type": "ipv4-addr",
                 "value": "38.28.1.68/32",
                 "x_inthreat_sources_refs": [
@@ -158,7 +214,7 @@ def test_parse_db_rows_ipv4(trigger, mocked_uuid):
     ]
 
 
-def test_parse_db_invalid_rows(trigger, mocked_uuid):
+def test_parse_db_invalid_rows(trigger):
     assert (
         list(
             trigger._parse_db_row(
@@ -213,7 +269,7 @@ def test_tags_valid_for(symphony_storage):
     assert trigger.tags_valid_for == 1
 
 
-def test_parse_db_rows_ipv4_empty_as_name(trigger, mocked_uuid):
+def test_parse_db_rows_ipv4_empty_as_name(trigger):
     # ipv6 segment
     assert list(
         trigger._parse_db_row(
@@ -225,7 +281,7 @@ def test_parse_db_rows_ipv4_empty_as_name(trigger, mocked_uuid):
     ) == [
         [
             {
-                "id": "autonomous-system--00000000-0000-0000-0000-000000000000",
+                "id": "autonomous-system--55d86c46-4ca5-59db-b240-d082106bbcf5",
                 "name": "AS174",
                 "number": 174,
                 "type": "autonomous-system",
@@ -234,17 +290,17 @@ def test_parse_db_rows_ipv4_empty_as_name(trigger, mocked_uuid):
                 ],
             },
             {
-                "id": "observable-relationship--00000000-0000-0000-0000-000000000000",
+                "id": "observable-relationship--93674668-4a83-5c9e-b1ad-9e86d2bd7df6",
                 "relationship_type": "belongs-to",
-                "source_ref": "ipv6-addr--00000000-0000-0000-0000-000000000000",
-                "target_ref": "autonomous-system--00000000-0000-0000-0000-000000000000",
+                "source_ref": "ipv6-addr--cb4eda17-247f-5436-b15f-4836c8e25ca6",
+                "target_ref": "autonomous-system--55d86c46-4ca5-59db-b240-d082106bbcf5",
                 "type": "observable-relationship",
                 "x_inthreat_sources_refs": [
                     "identity--1e9f6197-b3a0-4665-88e7-767929d013a4"
                 ],
             },
             {
-                "id": "ipv6-addr--00000000-0000-0000-0000-000000000000",
+                "id": "ipv6-addr--cb4eda17-247f-5436-b15f-4836c8e25ca6",
                 "type": "ipv6-addr",
                 "value": "2001:550:2:8::2b:1/128",
                 "x_inthreat_sources_refs": [
@@ -1,4 +1,7 @@
 import logging
+from collections import deque
+from collections.abc import Generator
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from pymisp import PyMISP, PyMISPError
 
@@ -12,9 +15,9 @@ class MISPQuery:
         self._logger = logging.getLogger(__name__)
         self._api = PyMISP(url=url, key=key, ssl=verify_ssl)
 
-    def get_events_starting_from(self, timestamp: float):
+    def get_events_starting_from(self, timestamp: float, page: int | None = None, limit: int | None = None):
         try:
-            res = self._api.search(publish_timestamp=timestamp)
+            res = self._api.search(publish_timestamp=timestamp, page=page, limit=limit)
         except PyMISPError as ex:
             self._logger.error(f"The MISP server returned the following error: {ex.message}")
             raise MISPError(ex.message)
@@ -24,3 +27,39 @@ class MISPQuery:
             raise MISPError(res["errors"])
 
         return [item for item in res if "Event" in item]
+
+    def iter_events_starting_from(
+        self, timestamp: float, page_size: int = 100, concurrency: int = 4
+    ) -> Generator[list, None, None]:
+        """
+        Yield the events published since the timestamp, page by page and in order
+
+        Up to `concurrency` pages are requested ahead while the caller processes the current one.
+        The iteration stops at the first incomplete page.
+        """
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending: deque[Future] = deque()
+            next_page = 1
+
+            def request_next_page():
+                nonlocal next_page
+                pending.append(executor.submit(self.get_events_starting_from, timestamp, next_page, page_size))
+                next_page += 1
+
+            for _ in range(concurrency):
+                request_next_page()
+
+            try:
+                while pending:
+                    events = pending.popleft().result()
+                    if len(events) < page_size:
+                        if events:
+                            yield events
+                        break
+
+                    request_next_page()
+                    yield events
+            finally:
+                # do not wait for the pages requested ahead that are no longer needed
+                for future in pending:
+                    future.cancel()
@@ -1,9 +1,14 @@
-from misp.misp_to_stix_converter import STIXConverter
+from misp.misp_to_stix_converter import STIXConverter, convert_events
 from sekoia_automation.action import Action
 
 
 class MISPToSTIXAction(Action):
     def run(self, arguments):
-        converter = STIXConverter()
+        validate = arguments.get("validate", True)
+
+        if "events" in arguments:
+            return {"bundles": convert_events(arguments["events"], validate=validate)}
+
+        converter = STIXConverter(validate=validate)
 
         return {"bundle": converter.convert(arguments["event"])}
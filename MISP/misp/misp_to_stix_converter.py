@@ -22,7 +22,10 @@ import os
 import re
 import uuid
 from collections import defaultdict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
+from itertools import repeat
 
 import pymisp
 from misp.misp2stix2_mapping import (
@@ -46,10 +49,10 @@ from misp.misp2stix2_mapping import (
     x509mapping,
 )
 from stix2 import exceptions
-from stix2.base import STIXJSONEncoder
+from stix2.base import _STIXBase
+from stix2.utils import STIXdatetime, format_datetime, get_timestamp, parse_into_datetime
 from stix2.v21 import (
     AttackPattern,
-    Bundle,
     CourseOfAction,
     Identity,
     Indicator,
@@ -117,21 +120,110 @@ tool_galaxies_list = (
     "mitre-mobile-attack-tool",
 )
 _MISP_event_tags = ["Threat-Report", 'misp:tool="misp2stix2"']
+_timestamp_properties = (
+    "created",
+    "modified",
+    "valid_from",
+    "valid_until",
+    "first_observed",
+    "last_observed",
+)
+
+
+def initialize_misp_types():
+    describe_types_filename = os.path.join(pymisp.__path__[0], "data/describeTypes.json")
+    with open(describe_types_filename) as describe_types:
+        categories_mapping = json.load(describe_types)["result"]["category_type_mappings"]
+    for category in categories_mapping:
+        mispTypesMapping[category] = {"to_call": "handle_person"}
+
+
+# The MISP types only have to be loaded once
+initialize_misp_types()
+
+
+def to_primitive(value):
+    """
+    Convert STIX objects to primitive types, as the `STIXJSONEncoder` would
+    """
+    if isinstance(value, _STIXBase):
+        return {
+            key: to_primitive(item) for key, item in value.items() if key not in value._defaulted_optional_properties
+        }
+    if isinstance(value, Mapping):
+        return {key: to_primitive(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [to_primitive(item) for item in value]
+    if isinstance(value, datetime.date | datetime.datetime):
+        return format_datetime(value)
+    return value
+
+
+def _convert_event(event, validate):
+    return STIXConverter(validate=validate).convert(event)
+
+
+def convert_events(events, validate=True, max_workers=None):
+    """
+    Convert several MISP events to STIX bundles, in a pool of processes
+
+    :param events: The MISP events to convert
+    :param validate: Whether to build validated `stix2` objects or plain dictionaries
+    :param max_workers: Maximum number of processes, defaults to the number of CPUs
+    """
+    if len(events) < 2 or max_workers == 1:
+        return [_convert_event(event, validate) for event in events]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_convert_event, events, repeat(validate)))
 
 
 class STIXConverter:
-    def __init__(self):
+    def __init__(self, validate=True):
+        """
+        :param validate: When False, the STIX objects are emitted as plain dictionaries,
+                         without going through the validation of the `stix2` library
+        """
+        self.validate = validate
         self.orgs = []
         self.galaxies = []
         self.to_return = {}
         self._logger = logging.getLogger(__name__)
+        self.load_objects_mapping()
+        self.loaded_galaxies_mapping = self.galaxies_mapping
 
     def convert(self, event):
-        self.initialize_misp_types()
         objects = self.handler(event["Event"])
-        bundle = Bundle(objects=objects)
-        # Will convert all the required fields to a primitive type
-        return json.loads(json.dumps(bundle, cls=STIXJSONEncoder))
+        return {
+            "type": "bundle",
+            "id": f"bundle--{uuid.uuid4()}",
+            "objects": [to_primitive(stix_object) for stix_object in objects],
+        }
+
+    def create_stix_object(self, stix_class, **kwargs):
+        """
+        Create a STIX object, validated or not according to the configuration of the converter
+        """
+        if self.validate:
+            return stix_class(**kwargs)
+
+        kwargs.pop("allow_custom", None)
+        properties = stix_class._properties
+        if "id" in properties and "id" not in kwargs:
+            kwargs["id"] = f"{stix_class._type}--{uuid.uuid4()}"
+        if "spec_version" in properties:
+            kwargs.setdefault("spec_version", "2.1")
+        if "created" in properties:
+            now = STIXdatetime(get_timestamp(), precision="millisecond")
+            kwargs.setdefault("created", now)
+            if "modified" in properties:
+                kwargs.setdefault("modified", kwargs["created"])
+        if kwargs.get("pattern_type") == "stix":
+            kwargs.setdefault("pattern_version", "2.1")
+        for name in _timestamp_properties:
+            if name in kwargs and isinstance(kwargs[name], str):
+                kwargs[name] = parse_into_datetime(kwargs[name])
+        return kwargs
 
     @staticmethod
     def __parse_link(link):
@@ -144,7 +236,7 @@ class STIXConverter:
     def add_all_markings(self):
         for marking_args in self.markings.values():
             marking_id = marking_args["id"]
-            marking = MarkingDefinition(**marking_args)
+            marking = self.create_stix_object(MarkingDefinition, **marking_args)
             self.append_object(marking, marking_id)
 
     def add_all_relationships(self):
@@ -159,8 +251,10 @@ class STIXConverter:
                 except KeyError:
                     # custom relationship (suggested by iglocska)
                     relation = "has"
-                relationship = Relationship(source_ref=source, target_ref=target, relationship_type=relation)
-                self.append_object(relationship, relationship.id)
+                relationship = self.create_stix_object(
+                    Relationship, source_ref=source, target_ref=target, relationship_type=relation
+                )
+                self.append_object(relationship, relationship["id"])
 
     def __set_identity(self):
         org = self.misp_event["Orgc"]
@@ -168,7 +262,8 @@ class STIXConverter:
         identity_id = f"identity--{org_uuid}"
         self.identity_id = identity_id
         if org_uuid not in self.orgs:
-            identity = Identity(
+            identity = self.create_stix_object(
+                Identity,
                 type="identity",
                 id=identity_id,
                 name=org["name"],
@@ -179,13 +274,6 @@ class STIXConverter:
             return 1
         return 0
 
-    def initialize_misp_types(self):
-        describe_types_filename = os.path.join(pymisp.__path__[0], "data/describeTypes.json")
-        describe_types = open(describe_types_filename)
-        categories_mapping = json.loads(describe_types.read())["result"]["category_type_mappings"]
-        for category in categories_mapping:
-            mispTypesMapping[category] = {"to_call": "handle_person"}
-
     def handler(self, event):
         self.misp_event = event
         self.SDOs = []
@@ -193,6 +281,12 @@ class STIXConverter:
         self.links = []
         self.markings = {}
         self.relationships = defaultdict(list)
+        self.objects_by_uuid = {}
+        for misp_object in self.misp_event.get("Object") or []:
+            if misp_object.get("uuid"):
+                self.objects_by_uuid.setdefault(misp_object["uuid"], misp_object)
+        # The galaxies have always been converted only for events with objects
+        self.galaxies_mapping = self.loaded_galaxies_mapping if self.misp_event.get("Object") else {}
         self.__set_identity()
         if self.misp_event.get("Attribute"):
             for attribute in self.misp_event["Attribute"]:
@@ -200,10 +294,9 @@ class STIXConverter:
                     getattr(self, mispTypesMapping[attribute["type"]]["to_call"])(attribute)
                 except KeyError:
                     self._logger.error("Impossible to convert item")
-                    self._logger.error(event)
+                    self._logger.error(attribute)
                     pass
         if self.misp_event.get("Object"):
-            self.load_objects_mapping()
             self.objects_to_parse = defaultdict(dict)
             misp_objects = self.misp_event["Object"]
             for misp_object in misp_objects:
@@ -296,10 +389,10 @@ class STIXConverter:
         self.galaxies_mapping.update(dict.fromkeys(tool_galaxies_list, ["tool", self.add_tool]))
 
     def get_object_by_uuid(self, uuid):
-        for _object in self.misp_event["Object"]:
-            if _object.get("uuid") and _object["uuid"] == uuid:
-                return _object
-        raise Exception(f"Object with uuid {uuid} does not exist in this event.")
+        try:
+            return self.objects_by_uuid[uuid]
+        except KeyError:
+            raise Exception(f"Object with uuid {uuid} does not exist in this event.")
 
     def handle_person(self, attribute):
         if attribute["category"] == "Person":
@@ -417,7 +510,7 @@ class STIXConverter:
                         continue
             if "name" not in d_section:
                 d_section["name"] = f"Section {sections.index(section)}"
-            extension["sections"].append(WindowsPESection(**d_section))
+            extension["sections"].append(self.create_stix_object(WindowsPESection, **d_section))
         if len(sections) != int(extension["number_of_sections"]):
             extension["number_of_sections"] = str(len(sections))
         return {"windows-pebinary-ext": extension}
@@ -503,7 +596,7 @@ class STIXConverter:
     def add_attack_pattern(self, galaxy):
         a_p_args, a_p_id = self.generate_galaxy_args(galaxy, True, False, "attack-pattern")
         a_p_args["created_by_ref"] = self.identity_id
-        attack_pattern = AttackPattern(**a_p_args)
+        attack_pattern = self.create_stix_object(AttackPattern, **a_p_args)
         self.append_object(attack_pattern, a_p_id)
 
     def add_course_of_action(self, misp_object):
@@ -526,7 +619,7 @@ class STIXConverter:
 
     def add_coa_stix_object(self, coa_args, coa_id):
         coa_args["created_by_ref"] = self.identity_id
-        course_of_action = CourseOfAction(**coa_args)
+        course_of_action = self.create_stix_object(CourseOfAction, **coa_args)
         self.append_object(course_of_action, coa_id)
 
     def add_identity(self, attribute):
@@ -545,7 +638,7 @@ class STIXConverter:
             identity_args["description"] = attribute["comment"]
         if markings:
             identity_args["object_marking_refs"] = self.handle_tags(markings)
-        identity = Identity(**identity_args)
+        identity = self.create_stix_object(Identity, **identity_args)
         self.append_object(identity, identity_id)
 
     def add_indicator(self, attribute):
@@ -585,19 +678,19 @@ class STIXConverter:
             indicator_args["description"] = attribute["comment"]
         if markings:
             indicator_args["object_marking_refs"] = self.handle_tags(markings)
-        indicator = Indicator(**indicator_args)
+        indicator = self.create_stix_object(Indicator, **indicator_args)
         self.append_object(indicator, indicator_id)
 
     def add_intrusion_set(self, galaxy):
         i_s_args, i_s_id = self.generate_galaxy_args(galaxy, False, True, "intrusion-set")
         i_s_args["created_by_ref"] = self.identity_id
-        intrusion_set = IntrusionSet(**i_s_args)
+        intrusion_set = self.create_stix_object(IntrusionSet, **i_s_args)
         self.append_object(intrusion_set, i_s_id)
 
     def add_malware(self, galaxy):
         malware_args, malware_id = self.generate_galaxy_args(galaxy, True, False, "malware")
         malware_args["created_by_ref"] = self.identity_id
-        malware = Malware(**malware_args)
+        malware = self.create_stix_object(Malware, **malware_args)
         self.append_object(malware, malware_id)
 
     def add_observed_data(self, attribute):
@@ -628,19 +721,19 @@ class STIXConverter:
         }
         if markings:
             observed_data_args["object_marking_refs"] = self.handle_tags(markings)
-        observed_data = ObservedData(**observed_data_args)
+        observed_data = self.create_stix_object(ObservedData, **observed_data_args)
         self.append_object(observed_data, observed_data_id)
 
     def add_threat_actor(self, galaxy):
         t_a_args, t_a_id = self.generate_galaxy_args(galaxy, False, True, "threat-actor")
         t_a_args["created_by_ref"] = self.identity_id
-        threat_actor = ThreatActor(**t_a_args)
+        threat_actor = self.create_stix_object(ThreatActor, **t_a_args)
         self.append_object(threat_actor, t_a_id)
 
     def add_tool(self, galaxy):
         tool_args, tool_id = self.generate_galaxy_args(galaxy, True, False, "tool")
         tool_args["created_by_ref"] = self.identity_id
-        tool = Tool(**tool_args)
+        tool = self.create_stix_object(Tool, **tool_args)
         self.append_object(tool, tool_id)
 
     def add_vulnerability(self, attribute):
@@ -658,7 +751,7 @@ class STIXConverter:
         }
         if markings:
             vulnerability_args["object_marking_refs"] = self.handle_tags(markings)
-        vulnerability = Vulnerability(**vulnerability_args)
+        vulnerability = self.create_stix_object(Vulnerability, **vulnerability_args)
         self.append_object(vulnerability, vulnerability_id)
 
     def add_vulnerability_from_galaxy(self, attribute):
@@ -684,7 +777,7 @@ class STIXConverter:
             "labels": labels,
             "description": description,
         }
-        vulnerability = Vulnerability(**vulnerability_args)
+        vulnerability = self.create_stix_object(Vulnerability, **vulnerability_args)
         self.append_object(vulnerability, vulnerability_id)
 
     def add_object_indicator(self, misp_object, pattern_arg=None):
@@ -709,8 +802,9 @@ class STIXConverter:
             "kill_chain_phases": killchain,
             "created_by_ref": self.identity_id,
             "indicator_types": ["malicious-activity"],
+            "pattern_type": "stix",
         }
-        indicator = Indicator(**indicator_args)
+        indicator = self.create_stix_object(Indicator, **indicator_args)
         self.append_object(indicator, indicator_id)
 
     def add_object_observable(self, misp_object, observable_arg=None):
@@ -736,7 +830,7 @@ class STIXConverter:
             "created_by_ref": self.identity_id,
         }
         try:
-            observed_data = ObservedData(**observed_data_args)
+            observed_data = self.create_stix_object(ObservedData, **observed_data_args)
         except exceptions.InvalidValueError:
             observed_data = self.fix_enumeration_issues(name, observed_data_args)
         self.append_object(observed_data, observed_data_id)
@@ -774,7 +868,7 @@ class STIXConverter:
             "created_by_ref": self.identity_id,
             "labels": labels,
         }
-        vulnerability = Vulnerability(**vulnerability_args)
+        vulnerability = self.create_stix_object(Vulnerability, **vulnerability_args)
         self.append_object(vulnerability, vulnerability_id)
 
     def append_object(self, stix_object, stix_object_id):
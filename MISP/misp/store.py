@@ -0,0 +1,55 @@
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+
+class TriggerStore:
+    """
+    Persistent state of the MISP trigger
+
+    The store keeps the last known timestamp of the attributes and objects already sent,
+    as well as a few named values (e.g. the timestamp of the last run), in a sqlite database.
+    Changes are only visible after a restart once committed.
+    """
+
+    def __init__(self, path: Path):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS attributes (uuid TEXT PRIMARY KEY, timestamp INTEGER NOT NULL) WITHOUT ROWID"
+        )
+        self.connection.execute("CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value BLOB NOT NULL)")
+        self.connection.commit()
+
+    def get_attribute_timestamp(self, uuid: str) -> int | None:
+        row = self.connection.execute("SELECT timestamp FROM attributes WHERE uuid = ?", (uuid,)).fetchone()
+        return row[0] if row else None
+
+    def set_attribute_timestamp(self, uuid: str, timestamp: int) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO attributes (uuid, timestamp) VALUES (?, ?)",
+            (uuid, timestamp),
+        )
+
+    def purge_attributes(self, before: int) -> None:
+        """
+        Forget the attributes last updated before the timestamp
+        """
+        self.connection.execute("DELETE FROM attributes WHERE timestamp <= ?", (before,))
+
+    def get_value(self, name: str, default: Any = None) -> Any:
+        row = self.connection.execute("SELECT value FROM state WHERE name = ?", (name,)).fetchone()
+        return orjson.loads(row[0]) if row else default
+
+    def set_value(self, name: str, value: Any) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO state (name, value) VALUES (?, ?)",
+            (name, orjson.dumps(value)),
+        )
+
+    def commit(self) -> None:
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
@@ -3,8 +3,8 @@ import os
 import time
 from traceback import format_exc
 
-from cachetools import TTLCache
 from misp.misp_query import MISPError, MISPQuery
+from misp.store import TriggerStore
 from sekoia_automation.exceptions import SendEventError
 from sekoia_automation.trigger import Trigger
 
@@ -24,9 +24,9 @@ class MISPTrigger(Trigger):
         )
         self._logger = logging.getLogger(__name__)
         self._query = None
-        self._old_ids = []
+        self._old_ids = set()
 
-        self._attributes_cache = None
+        self._store = None
 
     @property
     def sleep_time(self):
@@ -37,11 +37,19 @@ class MISPTrigger(Trigger):
         return int(self.configuration.get("attributes_filter", 0))
 
     @property
-    def attributes_cache(self):
-        if self._attributes_cache is None:
-            self._attributes_cache = TTLCache(maxsize=100000, ttl=self.attributes_filter)
+    def page_size(self):
+        return int(self.configuration.get("page_size", 100))
 
-        return self._attributes_cache
+    @property
+    def concurrency(self):
+        return max(1, int(self.configuration.get("concurrency", 4)))
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = TriggerStore(self.data_path / "misp_trigger.sqlite")
+
+        return self._store
 
     @property
     def query(self):
@@ -56,7 +64,8 @@ class MISPTrigger(Trigger):
     def run(self):
         self._logger.info("Started MISP Event Trigger")
 
-        timestamp = time.time()
+        timestamp = self.store.get_value("timestamp", time.time())
+        self._old_ids = set(self.store.get_value("old_ids", []))
         while True:
             timestamp = self._run(timestamp)
             time.sleep(self.sleep_time)
@@ -66,13 +75,17 @@ class MISPTrigger(Trigger):
         # to be sure to not miss any event.
         next_timestamp = time.time()
         try:
-            events = self.query.get_events_starting_from(timestamp)
-
-            if events:
+            ids = set()
+            for events in self.query.iter_events_starting_from(timestamp, self.page_size, self.concurrency):
                 self._logger.info(f"Processing {len(events)} events from MISP")
-                self.process_new_events(events)
+                ids.update(self.process_new_events(events))
 
+                # Remember the attributes already sent, even if a later page fails
+                self.store.commit()
+
+            self._old_ids = ids
             timestamp = next_timestamp
+            self.save_state(timestamp)
         except (MISPError, SendEventError):
             # We were not able to retrieve the events
             # Next time we will retry starting from the same point
@@ -83,6 +96,15 @@ class MISPTrigger(Trigger):
 
         return timestamp
 
+    def save_state(self, timestamp):
+        """Persist the state of the trigger, so a restart resumes where it stopped"""
+        if self.attributes_filter:
+            self.store.purge_attributes(int(time.time()) - self.attributes_filter)
+
+        self.store.set_value("timestamp", timestamp)
+        self.store.set_value("old_ids", sorted(self._old_ids))
+        self.store.commit()
+
     def attribute_was_updated(self, attribute):
         """Check if an attribute is new / was updated"""
         after_timestamp = int(time.time()) - self.attributes_filter
@@ -91,16 +113,13 @@ class MISPTrigger(Trigger):
         was_updated = False
 
         if timestamp > after_timestamp:
-            if attribute["uuid"] in self.attributes_cache:
-                last_update = self.attributes_cache[attribute["uuid"]]
+            last_update = self.store.get_attribute_timestamp(attribute["uuid"])
 
-                if timestamp > last_update:
-                    was_updated = True
-            else:
+            if last_update is None or timestamp > last_update:
                 was_updated = True
 
         if was_updated:
-            self.attributes_cache[attribute["uuid"]] = timestamp
+            self.store.set_attribute_timestamp(attribute["uuid"], timestamp)
 
         return was_updated
 
@@ -132,6 +151,7 @@ class MISPTrigger(Trigger):
         return event
 
     def process_new_events(self, events):
+        """Send the new events and return their identifiers"""
         ids = []
         for event in events:
             event_id = event["Event"]["id"]
@@ -152,4 +172,4 @@ class MISPTrigger(Trigger):
             self._logger.info(f"Processing event '{event_id}'")
             self.send_event(event["Event"]["info"], {"event": event})
 
-        self._old_ids = ids
+        return ids
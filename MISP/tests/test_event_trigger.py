@@ -1,3 +1,4 @@
+import copy
 from datetime import datetime
 from unittest.mock import patch
 
@@ -13,8 +14,8 @@ def misp_api(misp_event, requests_mock, misp_base_server, misp_base_url: str):
 
 
 @pytest.fixture
-def misp_trigger(misp_api, misp_base_url):
-    trigger = MISPTrigger()
+def misp_trigger(misp_api, misp_base_url, tmp_path):
+    trigger = MISPTrigger(data_path=tmp_path)
 
     trigger.module.configuration = {
         "misp_url": misp_base_url,
@@ -84,3 +85,46 @@ def test_misp_trigger_attribute_filter_cache(send_event_mock, misp_trigger, misp
     misp_trigger._old_ids = []
     misp_trigger._run(datetime.now().timestamp())
     assert send_event_mock.call_count == 1
+
+
+@freeze_time("2019-06-19 23:00:00")
+@patch.object(MISPTrigger, "send_event")
+def test_misp_trigger_state_survives_restart(send_event_mock, misp_trigger, misp_base_url, tmp_path):
+    misp_trigger.configuration = {"attributes_filter": "86400"}
+    timestamp = misp_trigger._run(datetime.now().timestamp())
+    assert send_event_mock.call_count == 1
+    misp_trigger.store.close()
+
+    # A new trigger restores the state of the previous one
+    trigger = MISPTrigger(data_path=tmp_path)
+    trigger.module.configuration = {"misp_url": misp_base_url, "misp_api_key": "fake_api_key"}
+    trigger.configuration = {"attributes_filter": "86400"}
+    assert trigger.store.get_value("timestamp") == timestamp
+    assert trigger.store.get_value("old_ids") == ["47433"]
+
+    trigger._run(datetime.now().timestamp())
+    assert send_event_mock.call_count == 1
+
+
+@patch.object(MISPTrigger, "send_event")
+def test_misp_trigger_pagination(send_event_mock, misp_trigger, misp_api, misp_base_url, misp_event):
+    def events_page(request, context):
+        page = request.json()["page"]
+        if page > 3:
+            return []
+
+        events = []
+        for index in range(2 if page < 3 else 1):
+            event = copy.deepcopy(misp_event)
+            event["Event"]["id"] = f"{page}-{index}"
+            events.append(event)
+        return events
+
+    misp_api.post(misp_base_url + "events/restSearch", json=events_page)
+    misp_trigger.configuration = {"page_size": 2, "concurrency": 2}
+
+    misp_trigger._run(datetime.now().timestamp())
+
+    sent_ids = [call.args[1]["event"]["Event"]["id"] for call in send_event_mock.call_args_list]
+    assert sent_ids == ["1-0", "1-1", "2-0", "2-1", "3-0"]
+    assert misp_trigger._old_ids == set(sent_ids)
@@ -1,3 +1,5 @@
+from copy import deepcopy
+
 from misp.misp_to_stix import MISPToSTIXAction
 
 
@@ -26,3 +28,29 @@ def test_misp_to_stix(misp_event):
         "[file:hashes.'sha256' = '7cf5151c21e271989e6702405537e51ec6c7e097de943cfe1428f6f0cfed3cd9']",
         "[file:hashes.'sha256' = '1bdaa4b98aee67b7e3e46802b871671b38e632a87e316c22ac272a6bd5b8e282']",
     }
+
+
+def test_misp_to_stix_without_validation(misp_event):
+    action = MISPToSTIXAction()
+
+    validated = action.run({"event": misp_event})["bundle"]
+    results = action.run({"event": misp_event, "validate": False})["bundle"]
+
+    assert results["type"] == "bundle"
+    assert len(results["objects"]) == len(validated["objects"])
+
+    expected = {sdo["id"]: sdo for sdo in validated["objects"]}
+    for sdo in results["objects"]:
+        assert sdo.keys() == expected[sdo["id"]].keys()
+        for key in ("pattern", "valid_from", "labels", "kill_chain_phases", "spec_version", "pattern_version"):
+            assert sdo.get(key) == expected[sdo["id"]].get(key)
+
+
+def test_misp_to_stix_batch(misp_event):
+    other_event = deepcopy(misp_event)
+    other_event["Event"]["Attribute"] = other_event["Event"]["Attribute"][:2]
+
+    action = MISPToSTIXAction()
+    results = action.run({"events": [misp_event, other_event], "validate": False})
+
+    assert [len(bundle["objects"]) for bundle in results["bundles"]] == [11, 3]
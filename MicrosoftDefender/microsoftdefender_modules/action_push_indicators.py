@@ -1,4 +1,6 @@
 from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any
 from urllib.parse import urljoin
@@ -27,6 +29,14 @@ class PushIndicatorsAction(MicrosoftDefenderBaseAction):
     Mapping with "ipv4-addr": {"value": "ipv4"} for IOC "[ipv4-addr:value = 'X.X.X.X']"
     """
 
+    # Maximum number of indicators returned by a page of the listing
+    INDICATORS_PAGE_SIZE: int = 10000
+    # Maximum number of indicators per import and of identifiers per batch deletion
+    IMPORT_BATCH_SIZE: int = 500
+    DELETE_BATCH_SIZE: int = 500
+    # Number of requests sent concurrently, the client enforces the rate limit of the API
+    MAX_CONCURRENT_REQUESTS: int = 4
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.sekoia_base_url = self.DEFAULT_SEKOIA_BASE_URL
@@ -38,6 +48,94 @@ class PushIndicatorsAction(MicrosoftDefenderBaseAction):
 
         return self.client.get(url)
 
+    def list_indicators_page(self, skip: int, top: int) -> list[dict[str, Any]]:
+        url = urljoin(self.client.base_url, f"api/indicators?$top={top}&$skip={skip}")
+        response = self.client.get(url)
+        self.process_response(response)
+
+        return response.json().get("value", [])
+
+    def fetch_indicators_index(self) -> dict[str, list[dict[str, Any]]]:
+        """
+        Pull the current indicators, by pages fetched concurrently, into an index of the indicators by value
+        """
+        index: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        page_size = self.INDICATORS_PAGE_SIZE
+
+        with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_REQUESTS) as executor:
+            skip = 0
+            while True:
+                offsets = [skip + page_size * position for position in range(self.MAX_CONCURRENT_REQUESTS)]
+                pages = list(executor.map(lambda offset: self.list_indicators_page(offset, page_size), offsets))
+
+                for page in pages:
+                    for indicator in page:
+                        index[indicator["indicatorValue"]].append(indicator)
+
+                # a short page means the end of the listing was reached
+                if any(len(page) < page_size for page in pages):
+                    return index
+
+                skip += page_size * self.MAX_CONCURRENT_REQUESTS
+
+    def submit_in_batches(self, submit: Callable[[list[Any]], Response], items: list[Any], batch_size: int) -> None:
+        """
+        Submit the items in batches of the given size, in parallel
+        """
+        batches = [items[index : index + batch_size] for index in range(0, len(items), batch_size)]
+
+        with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_REQUESTS) as executor:
+            for response in executor.map(submit, batches):
+                self.process_response(response)
+
+    @staticmethod
+    def is_same_indicator(existing: dict[str, Any], indicator: dict[str, Any]) -> bool:
+        """
+        Tell if an existing indicator already matches the indicator to push
+        """
+        if any(
+            existing.get(field) != indicator[field]
+            for field in ("indicatorType", "action", "severity", "generateAlert")
+        ):
+            return False
+
+        existing_expiration = existing.get("expirationTime")
+        expiration = indicator.get("expirationTime")
+        if existing_expiration is None or expiration is None:
+            return existing_expiration == expiration
+
+        return isoparse(existing_expiration) == isoparse(expiration)
+
+    def reconcile_indicators(self, indicators: dict[str, Any]) -> None:
+        """
+        Compute locally the indicators to remove and to create against the current ones,
+        then submit them in batches
+        """
+        index = self.fetch_indicators_index()
+
+        ids_to_remove = list(
+            dict.fromkeys(
+                existing["id"]
+                for indicator in indicators["revoked"] + indicators["expired"]
+                for existing in index.get(indicator["indicatorValue"], [])
+            )
+        )
+        indicators_to_create = [
+            indicator
+            for indicator in indicators["valid"]
+            if not any(
+                self.is_same_indicator(existing, indicator) for existing in index.get(indicator["indicatorValue"], [])
+            )
+        ]
+
+        self.log(
+            f"{len(indicators_to_create)} indicators to create and {len(ids_to_remove)} indicators to remove "
+            f"out of {sum(len(existing) for existing in index.values())} existing indicators"
+        )
+
+        self.submit_in_batches(self.delete_indicators_by_ids, ids_to_remove, self.DELETE_BATCH_SIZE)
+        self.submit_in_batches(self.import_indicators, indicators_to_create, self.IMPORT_BATCH_SIZE)
+
     def import_indicators(self, indicators: list[dict[str, Any]]) -> Response:
         url = urljoin(self.client.base_url, "api/indicators/import")
         return self.client.post(url, json={"Indicators": indicators})
@@ -173,6 +271,10 @@ class PushIndicatorsAction(MicrosoftDefenderBaseAction):
             self.log("Received indicators were not valid and/or not supported")
             return
 
+        if arguments.get("reconciliation", False):
+            self.reconcile_indicators(indicators)
+            return
+
         # Remove revoked indicators before proceeding with adding new ones
         self.remove_indicators(indicators["revoked"])
         self.create_indicators(indicators["valid"])
@@ -402,3 +402,67 @@ def test_expired_indicators():
     indicators = action.get_valid_indicators([STIX_OBJECT_IPv4_2, STIX_OBJECT_FILE_HASH_2], arguments)
     assert len(indicators["expired"]) == 0
     assert len(indicators["valid"]) == 2
+
+
+def test_push_indicators_reconciliation():
+    action = configured_action(PushIndicatorsAction)
+    action.INDICATORS_PAGE_SIZE = 2
+    action.IMPORT_BATCH_SIZE = 1
+
+    existing_indicators = [
+        # the revoked indicator, to remove
+        {"id": "10", "indicatorValue": "77.91.78.118", "indicatorType": "IpAddress"},
+        # an indicator already up to date
+        {
+            "id": "11",
+            "indicatorValue": "220e7d15b011d7fac48f2bd61114db1022197f7f",
+            "indicatorType": "FileSha1",
+            "action": "Warn",
+            "severity": "Medium",
+            "generateAlert": False,
+            "expirationTime": None,
+        },
+        {"id": "12", "indicatorValue": "1.2.3.4", "indicatorType": "IpAddress"},
+    ]
+
+    def list_indicators(request, context):
+        skip, top = int(request.qs["$skip"][0]), int(request.qs["$top"][0])
+        return {"value": existing_indicators[skip : skip + top]}
+
+    revoked_object = {**deepcopy(STIX_OBJECT_IPv4), "revoked": True}
+    file_hash_object = deepcopy(STIX_OBJECT_FILE_HASH)
+    file_hash_object.pop("valid_until", None)
+
+    with requests_mock.Mocker() as mock:
+        mock.register_uri(
+            "GET",
+            "https://login.microsoftonline.com/test_tenant_id/oauth2/token",
+            json={"access_token": "foo-token", "token_type": "bearer", "expires_in": 1799},
+        )
+        mock.register_uri("GET", "https://api.securitycenter.microsoft.com/api/indicators", json=list_indicators)
+        batch_delete = mock.register_uri(
+            "POST", "https://api.securitycenter.microsoft.com/api/indicators/BatchDelete", json={}
+        )
+        import_indicators = mock.register_uri(
+            "POST", "https://api.securitycenter.microsoft.com/api/indicators/import", json={"value": []}
+        )
+
+        action.run(
+            {
+                "stix_objects": [revoked_object, file_hash_object],
+                "severity": "Medium",
+                "action": "Warn",
+                "generate_alert": False,
+                "reconciliation": True,
+            }
+        )
+
+        assert batch_delete.call_count == 1
+        assert batch_delete.last_request.json() == {"IndicatorIds": ["10"]}
+
+        # only the indicators that are not up to date are imported
+        imported = [request.json()["Indicators"] for request in import_indicators.request_history]
+        assert all(len(batch) == 1 for batch in imported)
+        imported_values = {batch[0]["indicatorValue"] for batch in imported}
+        assert "220e7d15b011d7fac48f2bd61114db1022197f7f" not in imported_values
+        assert len(imported_values) > 0
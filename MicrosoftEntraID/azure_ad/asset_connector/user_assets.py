@@ -1,13 +1,16 @@
 import asyncio
+import json
 from datetime import datetime, timezone
 from functools import cached_property
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from typing import TypeVar, cast
 
 from azure.identity.aio import ClientSecretCredential  # async credentials only
 from kiota_authentication_azure.azure_identity_authentication_provider import AzureIdentityAuthenticationProvider
 from msgraph import GraphRequestAdapter, GraphServiceClient
 
 from sekoia_automation.asset_connector import AssetConnector
+from sekoia_automation.asset_connector.models.connector import DefaultAssetConnectorConfiguration
 from sekoia_automation.asset_connector.models.ocsf.user import (
     UserOCSFModel,
     User as UserOCSF,
@@ -23,6 +26,10 @@ from sekoia_automation.asset_connector.models.ocsf.base import (
 from sekoia_automation.storage import PersistentJSON
 
 from kiota_abstractions.base_request_configuration import RequestConfiguration
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+from kiota_abstractions.serialization import Parsable, ParsableFactory
+from kiota_serialization_json.json_parse_node import JsonParseNode
 from msgraph.generated.users.users_request_builder import UsersRequestBuilder
 from msgraph.generated.models.software_oath_authentication_method import SoftwareOathAuthenticationMethod
 from msgraph.generated.models.microsoft_authenticator_authentication_method import (
@@ -31,15 +38,28 @@ from msgraph.generated.models.microsoft_authenticator_authentication_method impo
 from msgraph.generated.models.phone_authentication_method import PhoneAuthenticationMethod
 from msgraph.generated.models.group import Group
 from msgraph.generated.models.user import User
+from msgraph.generated.models.authentication_method_collection_response import AuthenticationMethodCollectionResponse
+from msgraph.generated.models.directory_object_collection_response import DirectoryObjectCollectionResponse
 
 from azure_ad.base import AzureADModule
 
+ParsableType = TypeVar("ParsableType", bound=Parsable)
+
+
+class EntraIDAssetConnectorConfiguration(DefaultAssetConnectorConfiguration):
+    bulk_enrichment: bool = False
+    max_concurrent_batches: int = 4
+
 
 class EntraIDAssetConnector(AssetConnector):
     module: AzureADModule
+    configuration: EntraIDAssetConnectorConfiguration
 
     PRODUCT_NAME = "Microsoft Entra ID"
     PRODUCT_VERSION = "1.0"
+    # Microsoft Graph accepts up to 20 requests per JSON batch, and each user costs two of them
+    BATCH_MAX_REQUESTS = 20
+    USERS_PER_BATCH = BATCH_MAX_REQUESTS // 2
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -121,50 +141,62 @@ class EntraIDAssetConnector(AssetConnector):
         )
         return user_ocsf_model
 
-    async def fetch_user_groups(self, user_id: str) -> list[UserOCSFGroup]:
+    async def collect_user_groups(
+        self, user_id: str, user_groups: DirectoryObjectCollectionResponse | None
+    ) -> list[UserOCSFGroup]:
         """
-        Fetch user groups from Microsoft Entra ID.
+        Collect the groups from a page of user groups and the following ones.
         """
         groups: list[UserOCSFGroup] = []
-        try:
-            user_groups = await self.client.users.by_user_id(user_id).member_of.get()
+        if user_groups and user_groups.value:
+            for group in user_groups.value:
+                if isinstance(group, Group):
+                    groups.append(UserOCSFGroup(name=group.display_name, uid=group.id))
 
+        ## Implement if there is more than one page of results
+        while user_groups is not None and user_groups.odata_next_link is not None:
+            user_groups = (
+                await self.client.users.by_user_id(user_id).member_of.with_url(user_groups.odata_next_link).get()
+            )
             if user_groups and user_groups.value:
                 for group in user_groups.value:
                     if isinstance(group, Group):
                         groups.append(UserOCSFGroup(name=group.display_name, uid=group.id))
 
-            ## Implement if there is more than one page of results
-            while user_groups is not None and user_groups.odata_next_link is not None:
-                user_groups = (
-                    await self.client.users.by_user_id(user_id).member_of.with_url(user_groups.odata_next_link).get()
-                )
-                if user_groups and user_groups.value:
-                    for group in user_groups.value:
-                        if isinstance(group, Group):
-                            groups.append(UserOCSFGroup(name=group.display_name, uid=group.id))
+        return groups
 
-            return groups
+    async def fetch_user_groups(self, user_id: str) -> list[UserOCSFGroup]:
+        """
+        Fetch user groups from Microsoft Entra ID.
+        """
+        try:
+            user_groups = await self.client.users.by_user_id(user_id).member_of.get()
+            return await self.collect_user_groups(user_id, user_groups)
         except Exception as e:
             raise ValueError(f"Error fetching user groups: {e}")
 
+    @staticmethod
+    def has_mfa_method(user_mfa: AuthenticationMethodCollectionResponse | None) -> bool:
+        """
+        Tell if one of the authentication methods of the user is a MFA method.
+        """
+        if user_mfa and user_mfa.value:
+            for method in user_mfa.value:
+                if (
+                    isinstance(method, MicrosoftAuthenticatorAuthenticationMethod)
+                    or isinstance(method, SoftwareOathAuthenticationMethod)
+                    or isinstance(method, PhoneAuthenticationMethod)
+                ):
+                    return True
+        return False
+
     async def fetch_user_mfa(self, user_id: str) -> bool:
         """
         Fetch MFA status of the user.
         """
         try:
             user_mfa = await self.client.users.by_user_id(user_id).authentication.methods.get()
-            has_mfa = False
-            if user_mfa and user_mfa.value:
-                for method in user_mfa.value:
-                    if (
-                        isinstance(method, MicrosoftAuthenticatorAuthenticationMethod)
-                        or isinstance(method, SoftwareOathAuthenticationMethod)
-                        or isinstance(method, PhoneAuthenticationMethod)
-                    ):
-                        has_mfa = True
-                        break
-            return has_mfa
+            return self.has_mfa_method(user_mfa)
         except Exception as e:
             raise ValueError(f"Error fetching user MFA: {e}")
 
@@ -177,12 +209,104 @@ class EntraIDAssetConnector(AssetConnector):
             user_groups = await self.fetch_user_groups(user.id)
         return self.map_fields(user, user_mfa, user_groups)
 
-    async def fetch_new_users(self, last_run_date: str | None = None) -> list[UserOCSFModel]:
+    async def post_batch(self, requests: list[dict]) -> dict[str, dict]:
         """
-        Fetch new users from Microsoft Entra ID.
+        Send a JSON batch request to Microsoft Graph and return the responses by request id.
+        """
+        request_info = RequestInformation(Method.POST, "{+baseurl}/$batch", {})
+        request_info.set_stream_content(json.dumps({"requests": requests}).encode(), "application/json")
+        content = cast(
+            bytes | None, await self.client.request_adapter.send_primitive_async(request_info, "bytes", None)
+        )
+        if not content:
+            # no response at all, every request will be sent individually
+            return {}
+
+        return {response["id"]: response for response in json.loads(content).get("responses", [])}
+
+    @staticmethod
+    def get_batch_response(
+        responses: dict[str, dict], request_id: str, response_type: ParsableFactory[ParsableType]
+    ) -> ParsableType | None:
+        """
+        Get the deserialized body of a successful response of a batch, None otherwise.
+        """
+        response = responses.get(request_id)
+        if response is None or response.get("status") != 200 or not isinstance(response.get("body"), dict):
+            return None
+
+        return JsonParseNode(response["body"]).get_object_value(response_type)
+
+    async def fetch_users_batch(self, users: list[User]) -> list[UserOCSFModel]:
+        """
+        Fetch the MFA status and the groups of up to `USERS_PER_BATCH` users in a single JSON batch request.
+        Users whose responses failed in the batch (e.g. throttled) are fetched individually.
+        """
+        requests: list[dict] = []
+        for index, user in enumerate(users):
+            if not user.id:
+                continue
+
+            requests.append({"id": f"{index}-mfa", "method": "GET", "url": f"/users/{user.id}/authentication/methods"})
+            requests.append({"id": f"{index}-groups", "method": "GET", "url": f"/users/{user.id}/memberOf"})
+
+        try:
+            responses = await self.post_batch(requests)
+        except Exception as e:
+            raise ValueError(f"Error fetching users in batch: {e}")
+
+        mapped_users: list[UserOCSFModel] = []
+        for index, user in enumerate(users):
+            if not user.id:
+                # users without identifier can't be enriched
+                mapped_users.append(self.map_fields(user, False, []))
+                continue
+
+            user_mfa = self.get_batch_response(responses, f"{index}-mfa", AuthenticationMethodCollectionResponse)
+            if user_mfa is not None:
+                has_mfa = self.has_mfa_method(user_mfa)
+            else:
+                has_mfa = await self.fetch_user_mfa(user.id)
+
+            user_groups = self.get_batch_response(responses, f"{index}-groups", DirectoryObjectCollectionResponse)
+            if user_groups is not None:
+                groups = await self.collect_user_groups(user.id, user_groups)
+            else:
+                groups = await self.fetch_user_groups(user.id)
+
+            mapped_users.append(self.map_fields(user, has_mfa, groups))
+
+        return mapped_users
+
+    async def fetch_users_in_batches(self, users: list[User]) -> list[UserOCSFModel]:
+        """
+        Fetch the details of the users through JSON batch requests, with a bounded number of concurrent batches.
+        The order of the users is preserved.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.configuration.max_concurrent_batches))
+
+        async def fetch_batch(batch: list[User]) -> list[UserOCSFModel]:
+            async with semaphore:
+                return await self.fetch_users_batch(batch)
+
+        batches = [users[index : index + self.USERS_PER_BATCH] for index in range(0, len(users), self.USERS_PER_BATCH)]
+        results = await asyncio.gather(*(fetch_batch(batch) for batch in batches))
+        return [user for result in results for user in result]
+
+    async def fetch_users(self, users: list[User]) -> list[UserOCSFModel]:
+        """
+        Fetch the details of a page of users.
+        """
+        if self.configuration.bulk_enrichment:
+            return await self.fetch_users_in_batches(users)
+
+        return [await self.fetch_user(user) for user in users]
+
+    async def iter_new_users(self, last_run_date: str | None = None) -> AsyncGenerator[list[UserOCSFModel], None]:
+        """
+        Fetch new users from Microsoft Entra ID, page by page.
         If last_run_date is provided, only fetch users created after that date.
         """
-        new_users: list[UserOCSFModel] = []
         query_params = UsersRequestBuilder.UsersRequestBuilderGetQueryParameters(
             select=["id", "displayName", "mail", "identities", "createdDateTime", "userPrincipalName", "mailNickname"],
             filter=f"createdDateTime ge {last_run_date}" if last_run_date else None,
@@ -193,36 +317,67 @@ class EntraIDAssetConnector(AssetConnector):
         )
         request_configuration.headers.add("ConsistencyLevel", "eventual")
 
+        # The users are not sorted by creation date,
+        # so the most recent date seen is only saved once every user was fetched
+        latest_time: float | None = None
         try:
             users = await self.client.users.get(request_configuration=request_configuration)
 
-            if users and users.value:
-                for user in users.value:
-                    ## Fetch MFA status of the user
-                    new_user = await self.fetch_user(user)
-                    new_users.append(new_user)
+            while users is not None:
+                if users.value:
+                    new_users = await self.fetch_users(users.value)
+
+                    if new_users:
+                        page_latest_time = max(user.time for user in new_users)
+                        latest_time = max(latest_time or page_latest_time, page_latest_time)
+                        yield new_users
+
+                ## Implement if there is more than one page of results
+                if users.odata_next_link is None:
+                    break
 
-            ## Implement if there is more than one page of results
-            while users is not None and users.odata_next_link is not None:
                 users = await self.client.users.with_url(users.odata_next_link).get(
                     request_configuration=request_configuration
                 )
-                if users and users.value:
-                    for user in users.value:
-                        new_user = await self.fetch_user(user)
-                        new_users.append(new_user)
         except Exception as e:
             raise ValueError(f"Error fetching users: {e}")
 
         ## Save the most recent date seen
-        if len(new_users) > 0:
-            self._latest_time = max(user.time for user in new_users)
+        if latest_time is not None:
+            self._latest_time = latest_time
+
+    async def fetch_new_users(self, last_run_date: str | None = None) -> list[UserOCSFModel]:
+        """
+        Fetch new users from Microsoft Entra ID.
+        If last_run_date is provided, only fetch users created after that date.
+        """
+        new_users: list[UserOCSFModel] = []
+        async for users in self.iter_new_users(last_run_date=last_run_date):
+            new_users.extend(users)
         return new_users
 
     def get_assets(self) -> Generator[UserOCSFModel, None, None]:
-        ### Fetch users from Microsoft Graph API
+        ### Fetch users from Microsoft Graph API and stream them page by page
         last_run_date: str | None = self.most_recent_date_seen if self.most_recent_date_seen else None
         loop = asyncio.get_event_loop()
-        new_users = loop.run_until_complete(self.fetch_new_users(last_run_date=last_run_date))
-        for user in new_users:
-            yield user
+        pages = self.iter_new_users(last_run_date=last_run_date)
+        last_user: UserOCSFModel | None = None
+        try:
+            while True:
+                try:
+                    new_users = loop.run_until_complete(anext(pages))
+                except StopAsyncIteration:
+                    break
+
+                if last_user is not None:
+                    yield last_user
+
+                yield from new_users[:-1]
+                last_user = new_users[-1]
+        finally:
+            loop.run_until_complete(pages.aclose())
+
+        ## The last user is held back until every user was fetched,
+        ## so the most recent date seen is saved along with the last push
+        if last_user is not None:
+            yield last_user
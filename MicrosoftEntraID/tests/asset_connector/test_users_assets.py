@@ -75,6 +75,11 @@ def mock_graph_service_client_for_groups(mock_client, mock_group_list):
     return mock_client
 
 
+async def async_pages(pages):
+    for page in pages:
+        yield page
+
+
 def test_configuration(test_entra_id_asset_connector):
     assert test_entra_id_asset_connector.module.configuration["tenant_id"] == "fake_tenant_id"
     assert test_entra_id_asset_connector.module.configuration["client_id"] == "fake_client_id"
@@ -406,7 +411,7 @@ def test_get_assets(test_entra_id_asset_connector):
     # Arrange
     mock_user_ocsf_model = MagicMock()
     mock_user_ocsf_model.time = datetime.datetime.now().timestamp()
-    test_entra_id_asset_connector.fetch_new_users = AsyncMock(return_value=[mock_user_ocsf_model])
+    test_entra_id_asset_connector.iter_new_users = Mock(return_value=async_pages([[mock_user_ocsf_model]]))
 
     # Act
     assets = list(test_entra_id_asset_connector.get_assets())
@@ -424,16 +429,16 @@ def test_get_assets_with_last_run_date(test_entra_id_asset_connector):
 
     mock_user_ocsf_model = MagicMock()
     mock_user_ocsf_model.time = datetime.datetime.now().timestamp()
-    test_entra_id_asset_connector.fetch_new_users = AsyncMock(return_value=[mock_user_ocsf_model])
+    test_entra_id_asset_connector.iter_new_users = Mock(return_value=async_pages([[mock_user_ocsf_model]]))
 
     # Act
     assets = list(test_entra_id_asset_connector.get_assets())
 
     # Assert
     assert len(assets) == 1
-    test_entra_id_asset_connector.fetch_new_users.assert_called_once()
+    test_entra_id_asset_connector.iter_new_users.assert_called_once()
     # Verify that the last_run_date was passed
-    call_args = test_entra_id_asset_connector.fetch_new_users.call_args
+    call_args = test_entra_id_asset_connector.iter_new_users.call_args
     assert call_args[1]["last_run_date"] is not None
 
 
@@ -495,3 +500,117 @@ def test_map_fields_with_groups(test_entra_id_asset_connector):
     assert result.user.groups[0].uid == "group1"
     assert result.user.groups[1].name == "Group 2"
     assert result.user.groups[1].uid == "group2"
+
+
+def test_get_assets_streams_pages(test_entra_id_asset_connector):
+    """Test that get_assets yields the users page by page and updates the checkpoint once every user was fetched."""
+    from msgraph.generated.models.user import User
+
+    created = datetime.datetime(2025, 7, 18, 14, 26, 43, tzinfo=datetime.timezone.utc)
+    users_response_1 = MagicMock(
+        value=[
+            User(
+                id="user1",
+                user_principal_name="user1@example.com",
+                created_date_time=created + datetime.timedelta(days=2),
+            ),
+            User(id="user2", user_principal_name="user2@example.com", created_date_time=created),
+        ],
+        odata_next_link="next-page-link",
+    )
+    users_response_2 = MagicMock(
+        value=[
+            User(
+                id="user3",
+                user_principal_name="user3@example.com",
+                created_date_time=created + datetime.timedelta(days=1),
+            )
+        ],
+        odata_next_link=None,
+    )
+    test_entra_id_asset_connector.client = mock_graph_service_client()
+    test_entra_id_asset_connector.client.users.get = AsyncMock(return_value=users_response_1)
+    test_entra_id_asset_connector.client.users.with_url.return_value.get = AsyncMock(return_value=users_response_2)
+    test_entra_id_asset_connector.fetch_user_mfa = AsyncMock(return_value=False)
+    test_entra_id_asset_connector.fetch_user_groups = AsyncMock(return_value=[])
+
+    assets = test_entra_id_asset_connector.get_assets()
+
+    # The first page is yielded before the second one is requested
+    assert next(assets).user.uid == "user1"
+    test_entra_id_asset_connector.client.users.with_url.return_value.get.assert_not_awaited()
+
+    # The users are not sorted, so the checkpoint doesn't move until every user was fetched
+    assert test_entra_id_asset_connector._latest_time is None
+    assert next(assets).user.uid == "user2"
+    assert test_entra_id_asset_connector._latest_time is None
+
+    # The last user is yielded once the most recent date seen is known
+    assert next(assets).user.uid == "user3"
+    assert test_entra_id_asset_connector._latest_time == (created + datetime.timedelta(days=2)).timestamp()
+    assert list(assets) == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_new_users_with_bulk_enrichment(test_entra_id_asset_connector):
+    """Test that the users are enriched through JSON batch requests of up to 20 requests."""
+    from msgraph.generated.models.user import User
+
+    test_entra_id_asset_connector.configuration = {
+        "sekoia_base_url": "https://sekoia.io",
+        "sekoia_api_key": "fake_api_key",
+        "bulk_enrichment": True,
+        "max_concurrent_batches": 2,
+    }
+    users = [User(id=f"user{index}", user_principal_name=f"user{index}@example.com") for index in range(12)]
+    test_entra_id_asset_connector.client = mock_graph_service_client()
+    test_entra_id_asset_connector.client.users.get = AsyncMock(
+        return_value=MagicMock(value=users, odata_next_link=None)
+    )
+
+    batches = []
+
+    async def post_batch(requests):
+        batches.append(requests)
+        responses = {}
+        for request in requests:
+            if request["url"] == "/users/user1/authentication/methods":
+                # throttled in the batch, fetched individually
+                responses[request["id"]] = {"id": request["id"], "status": 429, "body": {}}
+            elif request["url"].endswith("/authentication/methods"):
+                body = {"value": [{"@odata.type": "#microsoft.graph.phoneAuthenticationMethod", "id": "phone"}]}
+                responses[request["id"]] = {"id": request["id"], "status": 200, "body": body}
+            else:
+                body = {"value": [{"@odata.type": "#microsoft.graph.group", "id": "group-id", "displayName": "Group"}]}
+                responses[request["id"]] = {"id": request["id"], "status": 200, "body": body}
+        return responses
+
+    test_entra_id_asset_connector.post_batch = post_batch
+    test_entra_id_asset_connector.fetch_user_mfa = AsyncMock(return_value=False)
+
+    result = await test_entra_id_asset_connector.fetch_new_users()
+
+    assert [len(batch) for batch in batches] == [20, 4]
+    assert [user.user.uid for user in result] == [f"user{index}" for index in range(12)]
+    assert [user.user.has_mfa for user in result] == [True, False] + [True] * 10
+    assert all(user.user.groups[0].name == "Group" for user in result)
+    test_entra_id_asset_connector.fetch_user_mfa.assert_awaited_once_with("user1")
+
+
+@pytest.mark.asyncio
+async def test_post_batch(test_entra_id_asset_connector):
+    """Test that post_batch sends the requests in a single call and indexes the responses by id."""
+    import json
+
+    test_entra_id_asset_connector.client = mock_graph_service_client()
+    send = AsyncMock(return_value=json.dumps({"responses": [{"id": "0-mfa", "status": 200, "body": {}}]}).encode())
+    test_entra_id_asset_connector.client.request_adapter.send_primitive_async = send
+
+    responses = await test_entra_id_asset_connector.post_batch(
+        [{"id": "0-mfa", "method": "GET", "url": "/users/user0/authentication/methods"}]
+    )
+
+    assert responses == {"0-mfa": {"id": "0-mfa", "status": 200, "body": {}}}
+    request_info = send.await_args.args[0]
+    assert request_info.url_template == "{+baseurl}/$batch"
+    assert json.loads(request_info.content)["requests"][0]["url"] == "/users/user0/authentication/methods"
@@ -9,7 +9,6 @@ from typing import Generator
 
 import orjson
 import requests
-from cachetools import Cache, LRUCache
 from dateutil.parser import isoparse
 from pyrate_limiter import Duration, Limiter, RequestRate
 from sekoia_automation.checkpoint import CheckpointCursor
@@ -18,9 +17,17 @@ from sekoia_automation.storage import PersistentJSON
 
 from . import MimecastModule
 from .client import ApiClient, ApiKeyAuthentication
+from .dedup import DedupCache
 from .helpers import download_batches, batched, filter_processed_events
 from .logging import get_logger
-from .metrics import EVENTS_LAG, FORWARD_EVENTS_DURATION, INCOMING_MESSAGES, OUTCOMING_EVENTS
+from .metrics import (
+    DEDUP_CACHE_HITS,
+    DEDUP_CACHE_MISSES,
+    EVENTS_LAG,
+    FORWARD_EVENTS_DURATION,
+    INCOMING_MESSAGES,
+    OUTCOMING_EVENTS,
+)
 
 logger = get_logger()
 
@@ -57,8 +64,9 @@ class MimecastSIEMWorker(Thread):
             asyncio.set_event_loop(self._loop)
 
         self.cache_context = PersistentJSON("cache.json", self.connector.data_path)
-        self.cache_size = 1000
-        self.events_cache: Cache = self.load_events_cache()
+        self.cache_path = Path(self.connector.data_path) / f"events_cache_{self.log_type.replace(' ', '_')}.bin"
+        self.cache_size = 10_000
+        self.events_cache: DedupCache = self.load_events_cache()
 
     def log(self, *args, **kwargs):
         self.connector.log(*args, **kwargs)
@@ -73,36 +81,31 @@ class MimecastSIEMWorker(Thread):
     def running(self):
         return not self._stop_event.is_set()
 
-    def load_events_cache(self) -> Cache:
+    def load_events_cache(self) -> DedupCache:
         """
         Load the events cache.
         """
-        cache: Cache = LRUCache(maxsize=self.cache_size)
+        cache = DedupCache(maxsize=self.cache_size)
 
+        if self.cache_path.exists():
+            cache.load(self.cache_path)
+            return cache
+
+        # migrate the cache previously persisted as a list of hashes in the context
         events_cache = []
         with self.connector.context_lock:
             with self.cache_context as context:
                 # load the cache from the context
                 events_cache = context.get(self.log_type, {}).get("events_cache", [])
 
-        for event_hash in events_cache:
-            cache[event_hash] = True
-
+        cache.update(events_cache)
         return cache
 
     def save_events_cache(self) -> None:
         """
         Save the events cache.
         """
-
-        with self.connector.context_lock:
-            with self.cache_context as context:
-                # check if the context exists or create it
-                if self.log_type not in context:
-                    context[self.log_type] = {}
-
-                # save the events cache to the context
-                context[self.log_type]["events_cache"] = list(self.events_cache.keys())
+        self.events_cache.save(self.cache_path)
 
     def get_old_cursor(self) -> datetime | None:
         """
@@ -311,10 +314,23 @@ class MimecastSIEMWorker(Thread):
                 level="info",
             )
 
+        else:
+            # persisting the binary cache is cheap, keep it in sync with the cursor
+            self.save_events_cache()
+
         # get the ending time and compute the duration to fetch the events
         batch_end_time = time.time()
         batch_duration = int(batch_end_time - batch_start_time)
-        logger.info("Fetched and forwarded events", log_type=self.log_type, duration=batch_duration)
+        cache_hits, cache_misses = self.events_cache.pop_stats()
+        logger.info(
+            "Fetched and forwarded events",
+            log_type=self.log_type,
+            duration=batch_duration,
+            cache_hits=cache_hits,
+            cache_misses=cache_misses,
+        )
+        DEDUP_CACHE_HITS.labels(intake_key=self.connector.configuration.intake_key).inc(cache_hits)
+        DEDUP_CACHE_MISSES.labels(intake_key=self.connector.configuration.intake_key).inc(cache_misses)
         FORWARD_EVENTS_DURATION.labels(intake_key=self.connector.configuration.intake_key).observe(batch_duration)
 
         # compute the remaining sleeping time. If greater than 0, sleep
@@ -11,6 +11,8 @@ import aiohttp
 import requests
 import xxhash
 
+from .dedup import DedupCache
+
 
 class AsyncGeneratorConverter:
     def __init__(self, async_generator: AsyncGenerator, loop: asyncio.AbstractEventLoop):
@@ -113,7 +115,7 @@ def compute_hash_event(event: dict) -> str:
     return xxhash.xxh64("-".join(parts)).hexdigest()
 
 
-def filter_processed_events(events: list[dict], cache: Cache) -> list[dict]:
+def filter_processed_events(events: list[dict], cache: Cache | DedupCache) -> list[dict]:
     """
     Filter out events that have already been processed
     """
@@ -10,6 +10,20 @@ INCOMING_MESSAGES = Counter(
     labelnames=["intake_key"],
 )
 
+DEDUP_CACHE_HITS = Counter(
+    name="dedup_cache_hits",
+    documentation="Number of events found in the deduplication cache",
+    namespace=prom_namespace_ubika,
+    labelnames=["intake_key"],
+)
+
+DEDUP_CACHE_MISSES = Counter(
+    name="dedup_cache_misses",
+    documentation="Number of events not found in the deduplication cache",
+    namespace=prom_namespace_ubika,
+    labelnames=["intake_key"],
+)
+
 # Declare common prometheus metrics
 prom_namespace = "symphony_module_common"
 
@@ -136,7 +136,11 @@ def test_events_deduplication(
 ):
     with requests_mock.Mocker() as mock_requests, patch(
         "mimecast_modules.connector_mimecast_siem.download_batches"
-    ) as mock_download_batches, patch("mimecast_modules.connector_mimecast_siem.time") as mock_time:
+    ) as mock_download_batches, patch("mimecast_modules.connector_mimecast_siem.time") as mock_time, patch(
+        "mimecast_modules.connector_mimecast_siem.DEDUP_CACHE_HITS"
+    ) as mock_hits, patch(
+        "mimecast_modules.connector_mimecast_siem.DEDUP_CACHE_MISSES"
+    ) as mock_misses:
         mock_download_batches.side_effect = [[batch_event_1], [batch_event_1], [batch_event_1], []]
 
         mock_requests.post(
@@ -168,6 +172,8 @@ def test_events_deduplication(
 
         assert trigger.push_events_to_intakes.call_count == 1
         assert consumer.cursor.offset == "tokenNextPageLast=="
+        mock_hits.labels.return_value.inc.assert_called_once_with(2)
+        mock_misses.labels.return_value.inc.assert_called_once_with(1)
 
         mock_time.sleep.assert_called_once_with(44)
 
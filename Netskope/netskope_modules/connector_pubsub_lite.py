@@ -28,6 +28,9 @@ class PubSubLiteConfig(DefaultConnectorConfiguration):
     credentials: Any
 
     chunk_size: int = 1000
+    batch_max_wait: int = 30
+    messages_outstanding: int = 1000
+    bytes_outstanding: int = 10 * 1024 * 1024
 
 
 class PubSubLite(AsyncConnector):
@@ -39,8 +42,6 @@ class PubSubLite(AsyncConnector):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.events_queue = asyncio.Queue(maxsize=1000)
-
         self.context = PersistentJSON("context.json", self._data_path)
         self.context_lock = asyncio.Lock()
 
@@ -84,6 +85,17 @@ class PubSubLite(AsyncConnector):
         self.log(message="Stopping Google Cloud PubSub connector", level="info")
         super().stop(*args, **kwargs)
 
+    @cached_property
+    def events_queue(self) -> asyncio.Queue[tuple[Any, list[str]]]:
+        """
+        The queue of the decoded messages waiting to be forwarded, with their events.
+
+        Each item holds all the decompressed events of a message, so the queue is bounded by a number of messages:
+        at most `messages_outstanding` decoded messages are kept in memory. Once full, the messages received
+        are no longer decoded until the forwarder catches up.
+        """
+        return asyncio.Queue(maxsize=max(self.configuration.messages_outstanding, 1))
+
     @cached_property
     def location(self) -> CloudZone | CloudRegion:
         if self.configuration.zone_id:
@@ -107,27 +119,49 @@ class PubSubLite(AsyncConnector):
         # check the magic number
         return content[0:2] == b"\x1f\x8b"
 
+    def decode_message(self, data: bytes) -> list[str] | None:
+        """
+        Decompress the content of a message, if needed, and split it into events
+        """
+        message_content = gzip.decompress(data) if self.is_gzip_compressed(data) else data
+        return self.process_messages(message_content)
+
     async def handle_queue(self):
-        batch_size = min(self.configuration.chunk_size, self.events_queue.maxsize)
-        batch_max_wait = 30  # seconds to wait for batch to reach `batch_size`, otherwise - push available events
+        batch_size = self.configuration.chunk_size
+        # seconds to wait for batch to reach `batch_size`, otherwise - push available events
+        batch_max_wait = self.configuration.batch_max_wait
 
         batch_start = None
-        batch = []
+        batch: list[str] = []
+        messages: list[Any] = []
 
         while self.running or self.events_queue.qsize() > 0:
-            event = await self.events_queue.get()
-            if not batch_start:
-                batch_start = time.time()  # for a correct cold start
+            timeout = max(0.0, batch_max_wait - (time.time() - batch_start)) if batch_start else None
+            try:
+                message, events = await asyncio.wait_for(self.events_queue.get(), timeout=timeout)
+                if not batch_start:
+                    batch_start = time.time()  # for a correct cold start
+
+                messages.append(message)
+                batch.extend(events)
 
-            batch.append(event)
+            except asyncio.TimeoutError:
+                pass
 
-            if len(batch) >= batch_size or (len(batch) > 0 and time.time() - batch_start > batch_max_wait):
+            if messages and (len(batch) >= batch_size or time.time() - batch_start > batch_max_wait):
                 self.log(
                     message=f"Forward {len(batch)} events to the intake",
                     level="info",
                 )
 
-                await self.push_data_to_intakes(events=batch)
+                if batch:
+                    await self.push_data_to_intakes(events=batch)
+
+                # Acknowledge the messages only once their events are forwarded
+                for message in messages:
+                    message.ack()
+
+                self.last_seen_timestamp = messages[-1].publish_time
                 await self.save_checkpoint()
 
                 OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key, type=self.metric_label_type).inc(
@@ -145,14 +179,16 @@ class PubSubLite(AsyncConnector):
                 )
 
                 batch = []
-                batch_start = time.time()
+                messages = []
+                batch_start = None
 
     async def fetch_messages(self):
         await self.load_checkpoint()
 
+        # Messages are acknowledged once forwarded, so the flow control also bounds the events waiting in the queue
         per_partition_flow_control_settings = FlowControlSettings(
-            messages_outstanding=1000,
-            bytes_outstanding=10 * 1024 * 1024,
+            messages_outstanding=self.configuration.messages_outstanding,
+            bytes_outstanding=self.configuration.bytes_outstanding,
         )
 
         async with AsyncSubscriberClient() as subscriber_client:
@@ -171,22 +207,21 @@ class PubSubLite(AsyncConnector):
                 per_partition_flow_control_settings=per_partition_flow_control_settings,
             )
 
+            loop = asyncio.get_running_loop()
             async for message in subscriber:
-                self.last_seen_timestamp = message.publish_time
-                self.latest_event_lag = time.time() - self.last_seen_timestamp.timestamp()
+                self.latest_event_lag = time.time() - message.publish_time.timestamp()
 
-                message_content = (
-                    gzip.decompress(message.data) if self.is_gzip_compressed(message.data) else message.data
-                )
-                events = self.process_messages(message_content)
+                # Decompress the message outside the event loop
+                events = await loop.run_in_executor(None, self.decode_message, message.data)
 
-                # Put events in the forwarding queue
-                if events is not None:
-                    INCOMING_MESSAGES.labels(intake_key=self.configuration.intake_key).inc(len(events))
-                    for event in events:
-                        await self.events_queue.put(event)
+                # Messages that can't be decoded have nothing to forward
+                if events is None:
+                    message.ack()
+                    continue
 
-                message.ack()
+                # Put the events of the message in the forwarding queue
+                INCOMING_MESSAGES.labels(intake_key=self.configuration.intake_key).inc(len(events))
+                await self.events_queue.put((message, events))
 
     def process_messages(self, content: bytes) -> list[str] | None:
         # Netskope is putting multiple transaction events in 1 PubSub Lite message
@@ -1,7 +1,9 @@
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import cached_property
 from json.decoder import JSONDecodeError
 from threading import Event, Thread
+from time import perf_counter
 
 import orjson
 from netskope_api.iterator.const import Const
@@ -14,13 +16,23 @@ from sekoia_automation.exceptions import ModuleConfigurationError
 from netskope_modules import NetskopeModule
 from netskope_modules.constants import MESSAGE_CANNOT_CONSUME_SERVICE
 from netskope_modules.helpers import get_index_name, get_iterator_name, get_tenant_hostname
-from netskope_modules.metrics import EVENTS_LAG, FORWARD_EVENTS_DURATION, OUTCOMING_EVENTS
+from netskope_modules.metrics import (
+    EVENTS_LAG,
+    FORWARD_EVENTS_DURATION,
+    OUTCOMING_EVENTS,
+    PAGE_FETCH_DURATION,
+    PAGE_PARSE_DURATION,
+    PAGE_PUSH_DURATION,
+)
 from netskope_modules.types import NetskopeAlertType, NetskopeEventType
 
 
 class NetskopeEventConnectorConfiguration(DefaultConnectorConfiguration):
     api_token: str = Field(..., description="The API token")
     consumer_group: str | None = Field(None, description="A unique name to track events consumption")
+    overlap_fetch_and_push: bool = Field(
+        False, description="Fetch the next page of events while the previous one is forwarded"
+    )
 
 
 class NetskopeEventConsumer(Thread):
@@ -31,6 +43,11 @@ class NetskopeEventConsumer(Thread):
         self.iterator = iterator
         self._stop_event = Event()
 
+        # In overlapped mode, pages are forwarded in the background, one at a time and in order,
+        # while the next page is fetched
+        self._push_executor: ThreadPoolExecutor | None = None
+        self._pending_push: Future | None = None
+
     def stop(self):
         self._stop_event.set()
 
@@ -38,11 +55,59 @@ class NetskopeEventConsumer(Thread):
     def running(self):
         return not self._stop_event.is_set()
 
+    @property
+    def metric_labels(self) -> dict[str, str]:
+        return {"intake_key": self.connector.configuration.intake_key, "type": self.name}
+
+    def parse_page(self, content: bytes) -> tuple[dict, list[str], int]:
+        """
+        Parse a page of events
+
+        :param bytes content: The raw content of the page
+        :return: The page, its serialized events and the most recent timestamp of the events
+        """
+        page = orjson.loads(content) if content else {}
+
+        batch_of_events = []
+        most_recent_timestamp = 0
+        for event in page.get("result", []):
+            batch_of_events.append(orjson.dumps(event).decode("utf-8"))
+            if event.get("timestamp", 0) > most_recent_timestamp:
+                most_recent_timestamp = event["timestamp"]
+
+        return page, batch_of_events, most_recent_timestamp
+
+    def push_page(self, batch_of_events: list[str]) -> None:
+        push_start = perf_counter()
+        self.connector.push_events_to_intakes(events=batch_of_events)
+        PAGE_PUSH_DURATION.labels(**self.metric_labels).observe(perf_counter() - push_start)
+
+    def wait_pending_push(self) -> None:
+        """
+        Wait for the page being forwarded in the background, if any
+        """
+        if self._pending_push is not None:
+            pending_push, self._pending_push = self._pending_push, None
+            pending_push.result()
+
+    def forward(self, batch_of_events: list[str]) -> None:
+        if not self.connector.configuration.overlap_fetch_and_push:
+            self.push_page(batch_of_events)
+            return
+
+        if self._push_executor is None:
+            self._push_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.name}-push")
+
+        # keep at most one page in flight so the pages are forwarded in order
+        self.wait_pending_push()
+        self._pending_push = self._push_executor.submit(self.push_page, batch_of_events)
+
     def next_batch(self):
         # save the starting time
         batch_start_time = time.time()
 
         # Fetch next events
+        fetch_start = perf_counter()
         try:
             response = self.iterator.next()
         except ConnectionError as error:
@@ -50,6 +115,7 @@ class NetskopeEventConsumer(Thread):
                 return
 
             raise error
+        PAGE_FETCH_DURATION.labels(**self.metric_labels).observe(perf_counter() - fetch_start)
 
         if response.status_code == 204:
             self.connector.log(message=f"No events to forward for {self.name}", level="info")
@@ -79,21 +145,17 @@ class NetskopeEventConsumer(Thread):
                 level="error",
             )
 
-        content = response.json() if response.status_code == 200 else {}
-
-        # Serialize events and extract the most recent timestamp
-        batch_of_events = []
-        most_recent_timestamp = 0
-        for event in content.get("result", []):
-            batch_of_events.append(orjson.dumps(event).decode("utf-8"))
-            if event.get("timestamp", 0) > most_recent_timestamp:
-                most_recent_timestamp = event["timestamp"]
-        OUTCOMING_EVENTS.labels(intake_key=self.connector.configuration.intake_key, type=self.name).inc(
-            len(batch_of_events)
+        # Parse the raw page, serialize events and extract the most recent timestamp
+        parse_start = perf_counter()
+        content, batch_of_events, most_recent_timestamp = self.parse_page(
+            response.content if response.status_code == 200 else b""
         )
+        PAGE_PARSE_DURATION.labels(**self.metric_labels).observe(perf_counter() - parse_start)
+
+        OUTCOMING_EVENTS.labels(**self.metric_labels).inc(len(batch_of_events))
 
         if len(batch_of_events) > 0:
-            self.connector.push_events_to_intakes(events=batch_of_events)
+            self.forward(batch_of_events)
 
         # get the ending time and compute the duration to fetch the events
         batch_end_time = time.time()
@@ -102,9 +164,7 @@ class NetskopeEventConsumer(Thread):
             message=f"Fetch and forward {len(batch_of_events)} events in {batch_duration} seconds",
             level="info",
         )
-        FORWARD_EVENTS_DURATION.labels(intake_key=self.connector.configuration.intake_key, type=self.name).observe(
-            batch_end_time
-        )
+        FORWARD_EVENTS_DURATION.labels(**self.metric_labels).observe(batch_end_time - batch_start_time)
 
         # compute the lag
         current_lag: int = 0
@@ -113,7 +173,7 @@ class NetskopeEventConsumer(Thread):
             current_lag = int(now - most_recent_timestamp)
 
         # report the lag
-        EVENTS_LAG.labels(intake_key=self.connector.configuration.intake_key, type=self.name).set(current_lag)
+        EVENTS_LAG.labels(**self.metric_labels).set(current_lag)
 
         # get the sleeping time from the response. Otherwise, compute the remaining sleeping time.
         delta_sleep = content.get("wait_time", 30 - batch_duration)
@@ -129,8 +189,13 @@ class NetskopeEventConsumer(Thread):
         try:
             while self.running:
                 self.next_batch()
+
+            self.wait_pending_push()
         except Exception as error:
             self.connector.log_exception(error, message=f"Failed to forward events for {self.name}")
+        finally:
+            if self._push_executor is not None:
+                self._push_executor.shutdown(wait=True)
 
 
 class NetskopeEventConnector(Connector):
@@ -30,3 +30,24 @@ FORWARD_EVENTS_DURATION = Histogram(
     namespace=prom_namespace,
     labelnames=["intake_key", "type"],
 )
+
+PAGE_FETCH_DURATION = Histogram(
+    name="page_fetch_duration",
+    documentation="Duration to fetch a page of events from Netskope",
+    namespace=prom_namespace,
+    labelnames=["intake_key", "type"],
+)
+
+PAGE_PARSE_DURATION = Histogram(
+    name="page_parse_duration",
+    documentation="Duration to parse a page of events fetched from Netskope",
+    namespace=prom_namespace,
+    labelnames=["intake_key", "type"],
+)
+
+PAGE_PUSH_DURATION = Histogram(
+    name="page_push_duration",
+    documentation="Duration to forward a page of events to Sekoia.io",
+    namespace=prom_namespace,
+    labelnames=["intake_key", "type"],
+)
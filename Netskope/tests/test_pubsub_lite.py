@@ -1,4 +1,5 @@
 import asyncio
+import gzip
 from datetime import datetime
 from unittest.mock import AsyncMock, Mock, PropertyMock, patch
 
@@ -108,3 +109,92 @@ def test_run(trigger, events_queue):
             pass
 
         assert trigger.push_data_to_intakes.await_count == 3
+
+
+def test_handle_queue_acks_after_forward(trigger):
+    trigger.configuration.chunk_size = 3
+    trigger.configuration.batch_max_wait = 1
+    trigger.save_checkpoint = AsyncMock()
+
+    first_message = create_async_message(b"", datetime(year=2023, month=3, day=11, hour=13, minute=21, second=23))
+    last_message = create_async_message(b"", datetime(year=2023, month=3, day=11, hour=13, minute=21, second=45))
+
+    def check_not_acked(events):
+        assert not first_message.ack.called
+        assert not last_message.ack.called
+
+    trigger.push_data_to_intakes.side_effect = check_not_acked
+
+    async def run():
+        await trigger.events_queue.put((first_message, ["data1", "data2"]))
+        await trigger.events_queue.put((last_message, ["data3", "data4"]))
+        await asyncio.wait_for(trigger.handle_queue(), timeout=2)
+
+    try:
+        asyncio.run(run())
+
+    except TimeoutError:
+        pass
+
+    trigger.push_data_to_intakes.assert_awaited_once_with(events=["data1", "data2", "data3", "data4"])
+    first_message.ack.assert_called_once()
+    last_message.ack.assert_called_once()
+    assert trigger.last_seen_timestamp == last_message.publish_time
+    trigger.save_checkpoint.assert_awaited_once()
+
+
+def test_handle_queue_flushes_after_max_wait(trigger):
+    trigger.configuration.chunk_size = 1000
+    trigger.configuration.batch_max_wait = 1
+    trigger.save_checkpoint = AsyncMock()
+
+    message = create_async_message(b"", datetime(year=2023, month=3, day=11, hour=13, minute=21, second=23))
+
+    async def run():
+        await trigger.events_queue.put((message, ["data1"]))
+        await asyncio.wait_for(trigger.handle_queue(), timeout=3)
+
+    try:
+        asyncio.run(run())
+
+    except TimeoutError:
+        pass
+
+    trigger.push_data_to_intakes.assert_awaited_once_with(events=["data1"])
+    message.ack.assert_called_once()
+
+
+def test_fetch_messages_decompresses_payloads(trigger):
+    with (
+        patch("netskope_modules.connector_pubsub_lite.AsyncSubscriberClient") as mock,
+        patch(
+            "netskope_modules.connector_pubsub_lite.PubSubLite.subscription_path", new_callable=PropertyMock
+        ) as mock_sub_path,
+        patch(
+            "netskope_modules.connector_pubsub_lite.PubSubLite.load_checkpoint", new_callable=AsyncMock
+        ) as mock_load,
+        patch("netskope_modules.connector_pubsub_lite.AdminClient") as mock_seek,
+    ):
+        mock_sub_path.return_value = "projects/13212241/subscriptions/6"
+        message = create_async_message(
+            gzip.compress(b"data1\ndata2"), datetime(year=2023, month=3, day=11, hour=13, minute=21, second=23)
+        )
+        invalid_message = create_async_message(
+            b"data\xd8", datetime(year=2023, month=3, day=11, hour=13, minute=21, second=24)
+        )
+        mock.return_value.__aenter__.return_value.subscribe = AsyncMock(
+            return_value=AsyncIterator(seq=[message, invalid_message])
+        )
+
+        asyncio.run(trigger.fetch_messages())
+
+        assert trigger.events_queue.qsize() == 1
+        assert trigger.events_queue.get_nowait() == (message, ["data1", "data2"])
+        assert not message.ack.called
+        invalid_message.ack.assert_called_once()
+
+
+def test_events_queue_is_bounded_by_messages_outstanding(trigger):
+    trigger.configuration.messages_outstanding = 20
+
+    assert trigger.events_queue.maxsize == 20
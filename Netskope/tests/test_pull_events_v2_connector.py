@@ -239,6 +239,55 @@ def test_next_batch_403_service(trigger):
         assert mock_time.sleep.called
 
 
+def test_next_batch_overlap_fetch_and_push(trigger):
+    trigger.configuration.overlap_fetch_and_push = True
+    pushed_pages = []
+    trigger.push_events_to_intakes.side_effect = lambda events: pushed_pages.append(events)
+
+    with patch("netskope_modules.connector_pull_events_v2.time") as mock_time, requests_mock.Mocker() as mock_requests:
+        mock_requests.get(
+            "https://my.fake.sekoia/api/v2/events/dataexport/alerts/dlp",
+            [
+                {
+                    "status_code": 200,
+                    "json": {"ok": 1, "result": [{"timestamp": 1651424472, "_id": "1"}], "wait_time": 0},
+                },
+                {
+                    "status_code": 200,
+                    "json": {"ok": 1, "result": [{"timestamp": 1651424473, "_id": "2"}], "wait_time": 0},
+                },
+            ],
+        )
+        iterator = trigger.create_iterator(NetskopeEventType.ALERT, NetskopeAlertType.DLP)
+        consumer = NetskopeEventConsumer(trigger, "alert-dlp", iterator)
+        mock_time.time.return_value = 1666711174.0
+
+        consumer.next_batch()
+        consumer.next_batch()
+        consumer.wait_pending_push()
+
+        assert pushed_pages == [
+            ['{"timestamp":1651424472,"_id":"1"}'],
+            ['{"timestamp":1651424473,"_id":"2"}'],
+        ]
+        assert not mock_time.sleep.called
+        consumer._push_executor.shutdown()
+
+
+def test_parse_page(trigger):
+    iterator = trigger.create_iterator(NetskopeEventType.ALERT, NetskopeAlertType.DLP)
+    consumer = NetskopeEventConsumer(trigger, "alert-dlp", iterator)
+
+    page, events, most_recent_timestamp = consumer.parse_page(
+        b'{"ok": 1, "result": [{"timestamp": 2, "_id": "1"}, {"timestamp": 3, "_id": "2"}], "wait_time": 5}'
+    )
+
+    assert page["wait_time"] == 5
+    assert events == ['{"timestamp":2,"_id":"1"}', '{"timestamp":3,"_id":"2"}']
+    assert most_recent_timestamp == 3
+    assert consumer.parse_page(b"") == ({}, [], 0)
+
+
 def test_create_iterators(trigger):
     iterators = trigger.create_iterators(trigger.dataexports)
 
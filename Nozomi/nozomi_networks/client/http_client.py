@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Any, AsyncGenerator, Awaitable, Callable
@@ -35,6 +36,8 @@ class NozomiClient(object):
         self.base_url = base_url
         self.page_size = page_size
         self._authorization: str | None = None
+        # the event types are collected concurrently, only one of them should sign in
+        self._authorization_lock = asyncio.Lock()
 
         self._rate_limiter = AsyncLimiter(max_rate=60, time_period=60)  # 60 requests per minute
 
@@ -110,7 +113,9 @@ class NozomiClient(object):
 
         async def _fetch(page: int) -> dict[str, Any]:
             if self._authorization is None:
-                await self.refresh_authorization()
+                async with self._authorization_lock:
+                    if self._authorization is None:
+                        await self.refresh_authorization()
 
             auth = self._authorization
             if not auth:
@@ -59,6 +59,10 @@ class NozomiVantageConfiguration(DefaultConnectorConfiguration):
     page_size: int = 25
 
 
+# Minimal interval, in seconds, between two persistences of the caches of events ids
+CACHE_PERSIST_INTERVAL = 60
+
+
 class NozomiVantageConnector(AsyncConnector):
     """NozomiVantageConnector class to work with epdr events."""
 
@@ -83,6 +87,10 @@ class NozomiVantageConnector(AsyncConnector):
                 for event_id in existed_items:
                     self._lru_caches[event_type][event_id] = 1
 
+        # event types whose cache changed since it was persisted
+        self._updated_caches: set[EventType] = set()
+        self._last_caches_persist = time.monotonic()
+
     def _get_cache(self, event_type: EventType) -> LRUCache[str, int]:
         """
         Get the cache for the specified event type.
@@ -111,6 +119,27 @@ class NozomiVantageConnector(AsyncConnector):
             event_id = event["id"]
             self._get_cache(event_type)[event_id] = 1
 
+        if events:
+            self._updated_caches.add(event_type)
+
+    def persist_caches(self) -> None:
+        """Persist the caches of the event types updated since the last persistence."""
+        if not self._updated_caches:
+            return
+
+        with self.context as cache:
+            caches = cache.setdefault("caches", {})
+            for event_type in self._updated_caches:
+                caches[event_type.name] = list(self._get_cache(event_type).keys())
+
+        self._updated_caches = set()
+        self._last_caches_persist = time.monotonic()
+
+    def persist_caches_periodically(self) -> None:
+        """Persist the updated caches, unless they were persisted less than `CACHE_PERSIST_INTERVAL` seconds ago."""
+        if time.monotonic() - self._last_caches_persist >= CACHE_PERSIST_INTERVAL:
+            self.persist_caches()
+
     def _is_new_event(self, event_type: EventType, event_id: str) -> bool:
         """
         Check if an event ID is new (not in the cache) for the specified event type.
@@ -164,60 +193,49 @@ class NozomiVantageConnector(AsyncConnector):
             # We don't retrieve messages older than 1 day
             return max(last_event_date, one_day_ago)
 
-    async def get_events(self) -> int:
-        total_records = 0
-        for event_type in EventType:
-            records = []
-            last_event_date = self.last_event_date(event_type)
-            logger.info(
-                "Fetching events for {event_type} since {last_event_date}",
-                event_type=event_type,
-                last_event_date=last_event_date,
-            )
+    async def get_events_for_type(self, event_type: EventType) -> int:
+        """
+        Collect and forward the events of one type.
+
+        The checkpoint, the cache and the lag of each type are independent of the other types.
 
-            new_last_event_date = last_event_date
-            async for event in self.nozomi_client.fetch_events(event_type, last_event_date):
-                formated_event = _format_event(event)
-                event_id = formated_event["id"]
-                if not self._is_new_event(event_type, event_id):
-                    continue
-
-                event_date = _get_event_date(formated_event)
-                if event_date <= last_event_date:
-                    continue
-
-                new_last_event_date = max(new_last_event_date, event_date)
-                records.append(formated_event)
-
-                if len(records) >= self.configuration.batch_size:
-                    # If we have enough records, push them to intakes
-                    total_pushed = len(
-                        await self.push_data_to_intakes([orjson.dumps(record).decode("utf-8") for record in records])
-                    )
-
-                    logger.info(
-                        "Total records pushed to intake: {total_pushed}. "
-                        "Persisting into memory cache and updating new last event date for "
-                        "{event_type} with {date_value}",
-                        total_pushed=total_pushed,
-                        event_type=event_type,
-                        date_value=new_last_event_date.isoformat(),
-                    )
-
-                    total_records += total_pushed
-
-                    self._add_events_to_cache(event_type, records)
-                    records = []
-                    with self.context as cache:
-                        cache[event_type.name] = new_last_event_date.isoformat()
-
-            if records:  # pragma: no cover
+        Args:
+            event_type: EventType
+
+        Returns:
+            int: the number of forwarded events
+        """
+        total_records = 0
+        records = []
+        last_event_date = self.last_event_date(event_type)
+        logger.info(
+            "Fetching events for {event_type} since {last_event_date}",
+            event_type=event_type,
+            last_event_date=last_event_date,
+        )
+
+        new_last_event_date = last_event_date
+        async for event in self.nozomi_client.fetch_events(event_type, last_event_date):
+            formated_event = _format_event(event)
+            event_id = formated_event["id"]
+            if not self._is_new_event(event_type, event_id):
+                continue
+
+            event_date = _get_event_date(formated_event)
+            if event_date <= last_event_date:
+                continue
+
+            new_last_event_date = max(new_last_event_date, event_date)
+            records.append(formated_event)
+
+            if len(records) >= self.configuration.batch_size:
+                # If we have enough records, push them to intakes
                 total_pushed = len(
                     await self.push_data_to_intakes([orjson.dumps(record).decode("utf-8") for record in records])
                 )
 
                 logger.info(
-                    "In IF: Total records pushed to intake: {total_pushed}. "
+                    "Total records pushed to intake: {total_pushed}. "
                     "Persisting into memory cache and updating new last event date for "
                     "{event_type} with {date_value}",
                     total_pushed=total_pushed,
@@ -226,29 +244,63 @@ class NozomiVantageConnector(AsyncConnector):
                 )
 
                 total_records += total_pushed
+
                 self._add_events_to_cache(event_type, records)
+                records = []
+                with self.context as cache:
+                    cache[event_type.name] = new_last_event_date.isoformat()
 
-            # Update the last event date in the context
-            with self.context as cache:
-                cache[event_type.name] = new_last_event_date.isoformat()
+                self.persist_caches_periodically()
+
+        if records:  # pragma: no cover
+            total_pushed = len(
+                await self.push_data_to_intakes([orjson.dumps(record).decode("utf-8") for record in records])
+            )
+
+            logger.info(
+                "In IF: Total records pushed to intake: {total_pushed}. "
+                "Persisting into memory cache and updating new last event date for "
+                "{event_type} with {date_value}",
+                total_pushed=total_pushed,
+                event_type=event_type,
+                date_value=new_last_event_date.isoformat(),
+            )
+
+            total_records += total_pushed
+            self._add_events_to_cache(event_type, records)
+
+        # Update the last event date in the context
+        with self.context as cache:
+            cache[event_type.name] = new_last_event_date.isoformat()
+
+        self.persist_caches_periodically()
+
+        if total_records > 0:
+            EVENTS_LAG.labels(intake_key=self.configuration.intake_key, type=event_type.value).set(
+                int(time.time() - new_last_event_date.timestamp())
+            )
 
         return total_records
 
+    async def get_events(self) -> int:
+        """
+        Collect and forward the events of all the types concurrently.
+
+        Returns:
+            int: the number of forwarded events
+        """
+        results = await asyncio.gather(*[self.get_events_for_type(event_type) for event_type in EventType])
+
+        return sum(results)
+
     def run(self) -> None:  # pragma: no cover
         """Runs Nozomi Vantage."""
         while self.running:
             loop = asyncio.get_event_loop()
 
             try:
-                previous_processing_end = None
-
                 while self.running:
                     processing_start = time.time()
-                    if previous_processing_end is not None:
-                        EVENTS_LAG.labels(intake_key=self.configuration.intake_key).set(
-                            processing_start - previous_processing_end
-                        )
-
                     events_count = loop.run_until_complete(self.get_events())
                     processing_end = time.time()
                     OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(events_count)
@@ -274,15 +326,10 @@ class NozomiVantageConnector(AsyncConnector):
                             )
                             time.sleep(delta_sleep)
 
-                    previous_processing_end = processing_end
-
             except Exception as error:
                 message = "An error occurred while running Nozomi Vantage Connector: {error}"
                 self.log_exception(error, message=message)
 
-            with self.context as cache:
-                cache["caches"] = {
-                    event_type.name: list(cache.get(event_type.name, {}).keys()) for event_type in EventType
-                }
+            self.persist_caches()
 
             loop.run_until_complete(self.nozomi_client.close())
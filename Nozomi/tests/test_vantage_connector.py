@@ -1,5 +1,7 @@
+import asyncio
 from datetime import datetime
-from unittest.mock import AsyncMock
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
 from urllib.parse import urlencode
 
 import pytest
@@ -17,20 +19,21 @@ from .helpers import aioresponses_callback
 
 @pytest.fixture
 def vantage_connector(
-    module: NozomiModule, mock_push_data_to_intakes: AsyncMock, session_faker: Faker
+    module: NozomiModule, symphony_storage: Path, mock_push_data_to_intakes: AsyncMock, session_faker: Faker
 ) -> NozomiVantageConnector:
     """
     Create an instance of the NozomiVantageConnector with the provided module.
 
     Args:
         module: The Nozomi module instance.
+        symphony_storage: The path of the connector storage.
         mock_push_data_to_intakes: AsyncMock for pushing data to intakes.
         session_faker: Faker instance for generating fake data.
 
     Returns:
         NozomiVantageConnector: An instance of the NozomiVantageConnector.
     """
-    connector = NozomiVantageConnector(module=module)
+    connector = NozomiVantageConnector(module=module, data_path=symphony_storage)
     connector.configuration = NozomiVantageConfiguration(
         intake_key=session_faker.word(),
         batch_size=3,
@@ -96,3 +99,50 @@ async def test_vantage_connector(vantage_connector: NozomiVantageConnector, sess
     assert result == sum([len(value) for _, value in response_data.items()])
 
     await vantage_connector.nozomi_client.close()
+
+
+@pytest.mark.asyncio
+async def test_vantage_connector_collects_event_types_concurrently(
+    vantage_connector: NozomiVantageConnector, session_faker: Faker
+) -> None:
+    started: list[EventType] = []
+    all_started = asyncio.Event()
+
+    async def fetch_events(event_type: EventType, start_date: datetime):
+        started.append(event_type)
+        if len(started) == len(EventType):
+            all_started.set()
+
+        # every type must be collecting before any event is yielded
+        await asyncio.wait_for(all_started.wait(), timeout=1)
+        yield {
+            "id": session_faker.uuid4(),
+            "type": event_type.value,
+            "attributes": {"time": datetime.now().timestamp() * 1000},
+        }
+
+    vantage_connector._nozomi_client = MagicMock()
+    vantage_connector._nozomi_client.fetch_events = fetch_events
+
+    result = await vantage_connector.get_events()
+
+    assert result == len(EventType)
+    assert set(started) == set(EventType)
+
+
+def test_vantage_connector_persists_updated_caches(vantage_connector: NozomiVantageConnector) -> None:
+    vantage_connector._add_events_to_cache(EventType.Alerts, [{"id": "alert-1"}, {"id": "alert-2"}])
+    vantage_connector.persist_caches()
+
+    with vantage_connector.context as cache:
+        assert cache["caches"] == {EventType.Alerts.name: ["alert-1", "alert-2"]}
+
+    # nothing changed since the last persistence
+    vantage_connector.context = MagicMock()
+    vantage_connector.persist_caches()
+    vantage_connector.context.__enter__.assert_not_called()
+
+    # the caches are restored when the connector starts
+    connector = NozomiVantageConnector(module=vantage_connector.module, data_path=vantage_connector._data_path)
+    assert not connector._is_new_event(EventType.Alerts, "alert-1")
+    assert connector._is_new_event(EventType.Assets, "alert-1")
@@ -1,6 +1,8 @@
 import signal
 import time
+from collections import deque
 from collections.abc import Generator
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from functools import cached_property
 from threading import Event
@@ -30,6 +32,8 @@ class SystemLogConnectorConfiguration(DefaultConnectorConfiguration):
     ratelimit_per_minute: int = 20
     filter: str | None = None
     q: str | None = None
+    backfill_slice_duration: int = 600
+    backfill_concurrency: int = 4
 
 
 class SystemLogConnector(Connector):
@@ -98,9 +102,11 @@ class SystemLogConnector(Connector):
 
             raise FetchEventsException(message)
 
-    def __fetch_next_events(self, from_date: datetime) -> Generator[list, None, None]:
+    def _get_query_params(self, since: datetime, until: datetime | None = None) -> dict:
         # set parameters
-        params = {"since": from_date.isoformat(), "limit": self.fetch_events_limit, "sortOrder": "ASCENDING"}
+        params = {"since": since.isoformat(), "limit": self.fetch_events_limit, "sortOrder": "ASCENDING"}
+        if until is not None:
+            params["until"] = until.isoformat()
 
         # add optional parameters
         for param_name in ("filter", "q"):
@@ -109,10 +115,20 @@ class SystemLogConnector(Connector):
             if value is not None:
                 params[param_name] = value
 
+        return params
+
+    def save_most_recent_date_seen(self, most_recent_date_seen: datetime) -> None:
+        self.from_date = most_recent_date_seen
+
+        # save in context the most recent date seen
+        with self.context as cache:
+            cache["most_recent_date_seen"] = most_recent_date_seen.isoformat()
+
+    def __fetch_next_events(self, from_date: datetime) -> Generator[list, None, None]:
         # get the first page of events
         headers = {"Accept": "application/json"}
         url = urljoin(self.module.configuration.base_url, "api/v1/logs")
-        response = self.client.get(url, params=params, headers=headers)
+        response = self.client.get(url, params=self._get_query_params(from_date), headers=headers)
 
         while not self._stop_event.is_set():
             # manage the last response
@@ -138,7 +154,99 @@ class SystemLogConnector(Connector):
 
             response = self.client.get(url, headers=headers)
 
+    def __fetch_slice(self, since: datetime, until: datetime) -> list[list]:
+        """
+        Fetch all the pages of events published in the time slice
+
+        :param datetime since: The start of the slice, inclusive
+        :param datetime until: The end of the slice, exclusive
+        :return: The pages of events of the slice
+        """
+        headers = {"Accept": "application/json"}
+        url = urljoin(self.module.configuration.base_url, "api/v1/logs")
+        response = self.client.get(url, params=self._get_query_params(since, until), headers=headers)
+
+        pages = []
+        while not self._stop_event.is_set():
+            self._handle_response_error(response)
+
+            # bounded queries end with an empty page or without next link
+            events = response.json()
+            if not events:
+                break
+
+            INCOMING_MESSAGES.labels(intake_key=self.configuration.intake_key).inc(len(events))
+            pages.append(events)
+
+            url = response.links.get("next", {}).get("url")
+            if url is None:
+                break
+
+            response = self.client.get(url, headers=headers)
+
+        return pages
+
+    def get_backfill_slices(self, since: datetime, until: datetime) -> list[tuple[datetime, datetime]]:
+        """
+        Split the interval into time slices of `backfill_slice_duration` seconds
+
+        :param datetime since: The start of the interval
+        :param datetime until: The end of the interval
+        :return: The consecutive time slices covering the interval
+        """
+        slice_duration = timedelta(seconds=self.configuration.backfill_slice_duration)
+
+        slices = []
+        slice_start = since
+        while slice_start < until:
+            slice_end = min(slice_start + slice_duration, until)
+            slices.append((slice_start, slice_end))
+            slice_start = slice_end
+
+        return slices
+
+    def backfill_events(self) -> Generator[list, None, None]:
+        """
+        Catch up a large interval of missing events by fetching its time slices concurrently
+
+        The slices share the rate limit of the API client. Their events are yielded in time order
+        and the checkpoint is saved once all the events of a slice have been consumed.
+        """
+        until = datetime.now(timezone.utc).replace(microsecond=0)
+        if self.configuration.backfill_concurrency <= 1 or until - self.from_date <= timedelta(
+            seconds=self.configuration.backfill_slice_duration
+        ):
+            return
+
+        slices = deque(self.get_backfill_slices(self.from_date, until))
+        logger.info(f"Catching up events from {self.from_date.isoformat()} with {len(slices)} time slices")
+
+        pending: deque[tuple[datetime, Future]] = deque()
+        with ThreadPoolExecutor(max_workers=self.configuration.backfill_concurrency) as executor:
+            try:
+                while slices or pending:
+                    # keep the workers busy while the events of the oldest slice are consumed
+                    while slices and len(pending) < self.configuration.backfill_concurrency:
+                        slice_start, slice_end = slices.popleft()
+                        pending.append((slice_end, executor.submit(self.__fetch_slice, slice_start, slice_end)))
+
+                    slice_end, future = pending.popleft()
+                    pages = future.result()
+                    if self._stop_event.is_set():
+                        return
+
+                    yield from pages
+
+                    # the slice is fully forwarded
+                    self.save_most_recent_date_seen(slice_end)
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
     def fetch_events(self) -> Generator[list, None, None]:
+        # catch up a large gap before resuming the cursor
+        yield from self.backfill_events()
+
         most_recent_date_seen = self.from_date
 
         try:
@@ -166,11 +274,7 @@ class SystemLogConnector(Connector):
         finally:
             # save the most recent date
             if most_recent_date_seen > self.from_date:
-                self.from_date = most_recent_date_seen
-
-                # save in context the most recent date seen
-                with self.context as cache:
-                    cache["most_recent_date_seen"] = most_recent_date_seen.isoformat()
+                self.save_most_recent_date_seen(most_recent_date_seen)
 
         now = datetime.now(timezone.utc)
         current_lag = now - most_recent_date_seen
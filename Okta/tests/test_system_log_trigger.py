@@ -323,3 +323,60 @@ def test_handle_response_error(data_storage):
         trigger._handle_response_error(response)
 
     assert str(m.value) == "Request on Okta API to fetch events failed with status 500 - Internal Error"
+
+
+def test_get_backfill_slices(trigger, fake_time):
+    trigger.configuration.backfill_slice_duration = 600
+
+    slices = trigger.get_backfill_slices(fake_time - timedelta(minutes=25), fake_time)
+
+    assert slices == [
+        (fake_time - timedelta(minutes=25), fake_time - timedelta(minutes=15)),
+        (fake_time - timedelta(minutes=15), fake_time - timedelta(minutes=5)),
+        (fake_time - timedelta(minutes=5), fake_time),
+    ]
+
+
+def test_fetch_events_with_backfill(trigger, fake_time, message1, message2):
+    trigger.configuration.backfill_slice_duration = 600
+    trigger.configuration.backfill_concurrency = 3
+    trigger.from_date = fake_time - timedelta(minutes=25)
+
+    until = fake_time.replace(microsecond=0)
+    slices = trigger.get_backfill_slices(trigger.from_date, until)
+    events_per_slice = {
+        slices[0][0].isoformat(): [message2],
+        slices[1][0].isoformat(): [],
+        slices[2][0].isoformat(): [message1],
+    }
+
+    def get_events(request, context):
+        since = request.qs["since"][0].upper()
+        if "until" not in request.qs:
+            return []
+
+        return [dict(event, uuid=since) for event in events_per_slice[since]]
+
+    with patch("okta_modules.system_log_trigger.time") as mock_time, requests_mock.Mocker() as mock_requests:
+        mock_requests.get("https://tenant_id.okta.com/api/v1/logs", status_code=200, json=get_events)
+
+        events = list(trigger.fetch_events())
+
+    # the pages are yielded in the order of the slices
+    assert [page[0]["uuid"] for page in events] == [slices[0][0].isoformat(), slices[2][0].isoformat()]
+    # the cursor resumes at the end of the backfill
+    assert trigger.from_date == until
+    assert mock_requests.request_history[-1].qs["since"][0].upper() == until.isoformat().upper()
+    with trigger.context as cache:
+        assert cache["most_recent_date_seen"] == until.isoformat()
+
+
+def test_fetch_events_without_backfill_for_small_gaps(trigger, fake_time, message1):
+    trigger.configuration.backfill_slice_duration = 600
+    trigger.from_date = fake_time - timedelta(minutes=5)
+
+    with requests_mock.Mocker() as mock_requests:
+        mock_requests.get("https://tenant_id.okta.com/api/v1/logs", status_code=200, json=[message1])
+
+        assert list(trigger.fetch_events()) == [[message1]]
+        assert "until" not in mock_requests.request_history[0].qs
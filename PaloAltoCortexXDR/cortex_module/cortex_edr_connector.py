@@ -1,4 +1,6 @@
+import copy
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from functools import cached_property
 from typing import Any, Dict, List, Optional, Tuple
@@ -15,6 +17,9 @@ from cortex_module.client import ApiClient
 from cortex_module.helper import handle_fqdn
 from cortex_module.metrics import EVENTS_LAG, FORWARD_EVENTS_DURATION, OUTCOMING_EVENTS
 
+# Minimal delay, in seconds, between two savings of the alerts cache
+CACHE_SAVE_INTERVAL = 30
+
 
 class CortexEDRConfiguration(DefaultConnectorConfiguration):
     chunk_size: int = 100
@@ -45,6 +50,8 @@ class CortexQueryEDRTrigger(CortexConnector):
         # This cache should be big enough to cover all events within 1 second.
         self.cache_size = 10_000
         self.alerts_cache: Cache[str, bool] = self.load_alerts_cache()
+        self._alerts_cache_updated = False
+        self._last_cache_save = time.monotonic()
 
     def load_alerts_cache(self) -> Cache[str, bool]:
         result: LRUCache[str, bool] = LRUCache(maxsize=self.cache_size)
@@ -61,6 +68,17 @@ class CortexQueryEDRTrigger(CortexConnector):
         with self.context as cache:
             cache["alerts"] = list(self.alerts_cache.keys())
 
+        self._alerts_cache_updated = False
+        self._last_cache_save = time.monotonic()
+
+    def save_alerts_cache_periodically(self) -> None:
+        """
+        Save the alerts cache if new alerts were seen since the last saving
+        and if the last saving is older than CACHE_SAVE_INTERVAL seconds
+        """
+        if self._alerts_cache_updated and time.monotonic() - self._last_cache_save >= CACHE_SAVE_INTERVAL:
+            self.save_alerts_cache()
+
     @property
     def timestamp_cursor(self) -> int:
         now = datetime.now(timezone.utc)
@@ -110,6 +128,7 @@ class CortexQueryEDRTrigger(CortexConnector):
                 continue
 
             self.alerts_cache[external_id] = True
+            self._alerts_cache_updated = True
 
             shared_id = alert["alert_id"]
             events = alert["events"]
@@ -127,54 +146,92 @@ class CortexQueryEDRTrigger(CortexConnector):
 
         return combined_data
 
-    def get_alerts_events_by_offset(
+    def fetch_alerts_by_offset(
         self, offset: int, server_creation_time: int, pagination: int
-    ) -> Tuple[int, List[Any]]:
-        """Requests the Cortex API using the offset"""
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Requests the Cortex API using the offset and returns the total count and the raw alerts"""
 
-        search_from, search_to = offset, offset + pagination
-        self.query["request_data"]["search_from"] = search_from
-        self.query["request_data"]["search_to"] = search_to
-        self.query["request_data"]["filters"][0]["value"] = server_creation_time
+        query = copy.deepcopy(self.query)
+        query["request_data"]["search_from"] = offset
+        query["request_data"]["search_to"] = offset + pagination
+        query["request_data"]["filters"][0]["value"] = server_creation_time
 
         # Get the alerts
-        response = self.client.post(url=self.alert_url, json=self.query)
+        response = self.client.post(url=self.alert_url, json=query)
         response.raise_for_status()
 
         # Extract the payload
         response_query = response.json().get("reply", {})
 
         # extract alerts
-        alerts = response_query.get("alerts") or []
+        return response_query["total_count"], response_query.get("alerts") or []
+
+    def get_alerts_events_by_offset(
+        self, offset: int, server_creation_time: int, pagination: int
+    ) -> Tuple[int, List[Any]]:
+        """Requests the Cortex API using the offset"""
+
+        total_count, alerts = self.fetch_alerts_by_offset(offset, server_creation_time, pagination)
         combined_data = self.split_alerts_events(alerts)
 
-        return response_query["total_count"], combined_data
+        return total_count, combined_data
+
+    def get_most_recent_timestamp(self, alerts: List[Dict[str, Any]]) -> Optional[int]:
+        """Returns the detection timestamp of the first alert not already processed"""
+
+        for alert in alerts:
+            if alert.get("external_id") not in self.alerts_cache:
+                return alert.get("detection_timestamp")
+
+        return None
 
     def get_all_alerts(self, pagination: int) -> None:
         """Get all Cortex alerts from the API"""
 
-        has_more_events = True
-        page_number = 0
-        events = []
+        server_creation_time = self.timestamp_cursor
+        most_recent_timestamp: Optional[int] = None
 
-        while has_more_events:
-            total_alerts, combined_data = self.get_alerts_events_by_offset(
-                page_number * pagination, self.timestamp_cursor, pagination
+        # Fetch the next page while the current one is forwarded
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page_number = 0
+            next_page: Optional[Future[Tuple[int, List[Dict[str, Any]]]]] = executor.submit(
+                self.fetch_alerts_by_offset, 0, server_creation_time, pagination
             )
-            self.log(message=f"Sending batch of {len(combined_data)} events", level="info")
-            has_more_events = total_alerts > (page_number + 1) * pagination
-            page_number += 1
-            events.extend(combined_data)
 
-            # Not push empty data
-            if len(combined_data) > 0:
-                OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(combined_data))
-                self.push_events_to_intakes(events=combined_data)
-                self.save_alerts_cache()
+            try:
+                while next_page is not None:
+                    total_alerts, alerts = next_page.result()
+                    page_number += 1
+
+                    next_page = None
+                    if total_alerts > page_number * pagination:
+                        next_page = executor.submit(
+                            self.fetch_alerts_by_offset, page_number * pagination, server_creation_time, pagination
+                        )
+
+                    # Alerts are sorted from the most recent to the oldest
+                    if most_recent_timestamp is None:
+                        most_recent_timestamp = self.get_most_recent_timestamp(alerts)
+
+                    combined_data = self.split_alerts_events(alerts)
+                    self.log(message=f"Sending batch of {len(combined_data)} events", level="info")
+
+                    # Not push empty data
+                    if len(combined_data) > 0:
+                        OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(combined_data))
+                        self.push_events_to_intakes(events=combined_data)
+                        self.save_alerts_cache_periodically()
+
+            finally:
+                if next_page is not None:
+                    next_page.cancel()
+
+        # Persist the alerts seen since the last saving
+        if self._alerts_cache_updated:
+            self.save_alerts_cache()
 
         current_lag: int = 0
-        if len(events) > 0:
-            most_recent_timestamp = orjson.loads(events[0]).get("detection_timestamp")
+        if most_recent_timestamp is not None:
             self.timestamp_cursor = most_recent_timestamp
 
             # compute the current_lag in seconds
@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, call, patch
 
@@ -9,7 +10,7 @@ from requests.exceptions import HTTPError
 from sekoia_automation.storage import PersistentJSON
 
 from cortex_module.base import CortexModule
-from cortex_module.cortex_edr_connector import CortexQueryEDRTrigger
+from cortex_module.cortex_edr_connector import CACHE_SAVE_INTERVAL, CortexQueryEDRTrigger
 from cortex_module.helper import handle_fqdn
 
 
@@ -391,3 +392,59 @@ def test_splitting_events_with_cache(trigger, alert_response_4):
         '"detection_timestamp":1705912200}',
         '{"agent_install_type":"STANDARD","agent_host_boot_time":null,"event_sub_type":"process","alert_id":"2"}',
     ]
+
+
+@freeze_time("2024-01-23 10:00:00")
+def test_getting_data_tracks_cursor(trigger, alert_response_3_2, alert_response_3_1, alert_query_2, alert_query_4):
+    fqdn = trigger.module.configuration.fqdn
+    alert_url = f"https://api-{fqdn}/public_api/v1/alerts/get_alerts_multi_events"
+
+    with requests_mock.Mocker() as mock:
+        mock.post(
+            alert_url,
+            status_code=200,
+            json=alert_response_3_2,
+            additional_matcher=lambda request: request.json() == alert_query_2,
+        )
+        mock.post(
+            alert_url,
+            status_code=200,
+            json=alert_response_3_1,
+            additional_matcher=lambda request: request.json() == alert_query_4,
+        )
+
+        trigger.get_all_alerts(2)
+
+    assert trigger.push_events_to_intakes.call_count == 2
+    assert mock.call_count == 2
+    assert trigger.query["request_data"]["search_from"] == 0
+
+    # the cursor is the most recent alert seen, plus one second
+    with trigger.context as cache:
+        assert cache["timestamp_cursor"] == 1705912900118 + 1000
+        assert cache["alerts"] == ["5e60680403934d", "7317728957437374548", "7317728957437371548"]
+
+
+@freeze_time("2024-01-23 10:00:00")
+def test_getting_data_saves_cache_periodically(trigger, alert_response_3_2, alert_response_3_1):
+    fqdn = trigger.module.configuration.fqdn
+    alert_url = f"https://api-{fqdn}/public_api/v1/alerts/get_alerts_multi_events"
+    trigger.save_alerts_cache = Mock(wraps=trigger.save_alerts_cache)
+    trigger._last_cache_save = time.monotonic()
+
+    with requests_mock.Mocker() as mock:
+        mock.post(alert_url, [{"json": alert_response_3_2}, {"json": alert_response_3_1}] * 3)
+
+        # the cache is saved once, at the end of the run
+        trigger.get_all_alerts(2)
+        assert trigger.save_alerts_cache.call_count == 1
+
+        # no new alerts, no saving
+        trigger.get_all_alerts(2)
+        assert trigger.save_alerts_cache.call_count == 1
+
+        # the cache is saved between two pages once the interval is elapsed
+        trigger.alerts_cache.clear()
+        trigger._last_cache_save = time.monotonic() - CACHE_SAVE_INTERVAL
+        trigger.get_all_alerts(2)
+        assert trigger.save_alerts_cache.call_count == 3
@@ -0,0 +1,167 @@
+import hashlib
+import os
+import sys
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+
+class DedupCache:
+    """
+    Bounded set of already collected keys
+
+    Keys are hashed to 64-bit integers and kept in a fixed-size ring buffer: once `maxsize` keys are
+    stored, the oldest ones are evicted first. The ring can be persisted as a raw binary file
+    (8 bytes per key, oldest first), which is much cheaper to write than a JSON list of identifiers.
+
+    The file can also be used as an append-only journal: `flush` only appends the keys added since the
+    last write, and the file is compacted back to the content of the ring once it holds twice its capacity.
+    """
+
+    ITEM_SIZE = 8
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least one")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+        self._ring: array = array("Q", bytes(self.ITEM_SIZE * maxsize))
+        self._position = 0
+        self._length = 0
+        self._hashes: set[int] = set()
+        self._unsaved: list[int] = []
+
+    @staticmethod
+    def hash_key(key: Any) -> int:
+        """
+        Compute the compact representation of a key
+        """
+        data = key if isinstance(key, bytes) else str(key).encode("utf-8")
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, key: Any) -> bool:
+        if self.hash_key(key) in self._hashes:
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        return False
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        # Compatibility with the mapping interface of `cachetools` caches
+        self._add_hash(self.hash_key(key))
+
+    def add(self, key: Any) -> bool:
+        """
+        Remember the key. Return True if the key was not already known
+        """
+        if key in self:
+            return False
+
+        self._add_hash(self.hash_key(key))
+        return True
+
+    def pop_stats(self) -> tuple[int, int]:
+        """
+        Return the numbers of hits and misses counted since the last call, and reset them
+        """
+        stats = (self.hits, self.misses)
+        self.hits = 0
+        self.misses = 0
+        return stats
+
+    def update(self, keys: Iterable[Any]) -> None:
+        for key in keys:
+            self[key] = True
+
+    def _add_hash(self, key_hash: int) -> None:
+        if key_hash in self._hashes:
+            return
+
+        if self._length == self.maxsize:
+            # the ring is full: evict the oldest hash
+            self._hashes.discard(self._ring[self._position])
+        else:
+            self._length += 1
+
+        self._ring[self._position] = key_hash
+        self._hashes.add(key_hash)
+        self._unsaved.append(key_hash)
+        self._position = (self._position + 1) % self.maxsize
+
+    def _ordered_hashes(self) -> array:
+        if self._length < self.maxsize:
+            return self._ring[: self._length]
+
+        return self._ring[self._position :] + self._ring[: self._position]
+
+    def dumps(self) -> bytes:
+        """
+        Serialize the known hashes, oldest first, as little-endian 64-bit integers
+        """
+        hashes = self._ordered_hashes()
+        if sys.byteorder != "little":
+            hashes.byteswap()
+
+        return hashes.tobytes()
+
+    def loads(self, data: bytes) -> None:
+        """
+        Restore hashes serialized with `dumps`. Only the most recent `maxsize` hashes are kept
+        """
+        hashes = array("Q")
+        hashes.frombytes(data[: len(data) - len(data) % self.ITEM_SIZE])
+        if sys.byteorder != "little":
+            hashes.byteswap()
+
+        for key_hash in hashes[-self.maxsize :]:
+            self._add_hash(key_hash)
+
+    def save(self, path: Path) -> None:
+        """
+        Atomically write the cache to the file
+        """
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_bytes(self.dumps())
+        os.replace(tmp_path, path)
+        self._unsaved.clear()
+
+    def flush(self, path: Path) -> None:
+        """
+        Append the keys added since the last write to the file, compacting the file when it grows too large
+        """
+        if not self._unsaved:
+            return
+
+        current_size = path.stat().st_size if path.exists() else 0
+        # rewrite the file when it is too large or when it ends with a partially written key
+        if (
+            current_size + self.ITEM_SIZE * len(self._unsaved) > 2 * self.ITEM_SIZE * self.maxsize
+            or current_size % self.ITEM_SIZE != 0
+        ):
+            self.save(path)
+            return
+
+        hashes = array("Q", self._unsaved)
+        if sys.byteorder != "little":
+            hashes.byteswap()
+
+        with path.open("ab") as journal:
+            journal.write(hashes.tobytes())
+
+        self._unsaved.clear()
+
+    def load(self, path: Path) -> None:
+        """
+        Restore the cache from the file, if it exists
+        """
+        if path.exists():
+            self.loads(path.read_bytes())
+            self._unsaved.clear()
@@ -8,6 +8,8 @@ import six
 from cachetools import Cache
 from stix2patterns.pattern import Pattern
 
+from sentinelone_module.dedup import DedupCache
+
 
 def camelize(string: str) -> str:
     return re.sub(r"_(.)", lambda m: m.group(1).upper(), string)
@@ -83,7 +85,7 @@ def stix_to_indicators(stix_object, supported_types_map):
     return results
 
 
-def filter_collected_events(events: Sequence, getter: Callable, cache: Cache) -> list:
+def filter_collected_events(events: Sequence, getter: Callable, cache: Cache | DedupCache) -> list:
     """
     Filter events that have already been filter_collected_events
 
@@ -5,3 +5,4 @@ class SentinelOneLogsConnectorConfiguration(DefaultConnectorConfiguration):
     frequency: int = 60
     activities_batch_size: int = 1000
     threats_batch_size: int = 1000
+    partitions: int = 1
@@ -1,11 +1,12 @@
-import json
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 from functools import cached_property
 from pathlib import Path
 from threading import Event, Lock, Thread
 from time import sleep, time
 
-from cachetools import Cache, LRUCache
+import orjson
+from management.common.query_filter import QueryFilter
 from management.mgmtsdk_v2.client import ManagementResponse
 from management.mgmtsdk_v2.entities.activity import Activity
 from management.mgmtsdk_v2.entities.threat import Threat
@@ -17,12 +18,20 @@ from sekoia_automation.checkpoint import CheckpointDatetime
 from sekoia_automation.connector import Connector
 
 from sentinelone_module.base import SentinelOneModule
+from sentinelone_module.dedup import DedupCache
 from sentinelone_module.exceptions import SENTINEL_ONE_EMPTY_RESPONSE, SentinelOneManagementResponseError
 from sentinelone_module.helpers import clean_hostname, filter_collected_events
 from sentinelone_module.logging import get_logger
 from sentinelone_module.logs.configuration import SentinelOneLogsConnectorConfiguration
-from sentinelone_module.logs.helpers import get_latest_event_timestamp
-from sentinelone_module.logs.metrics import EVENTS_LAG, FORWARD_EVENTS_DURATION, INCOMING_MESSAGES, OUTCOMING_EVENTS
+from sentinelone_module.logs.helpers import get_latest_event_timestamp, split_time_window
+from sentinelone_module.logs.metrics import (
+    DEDUP_CACHE_HITS,
+    DEDUP_CACHE_MISSES,
+    EVENTS_LAG,
+    FORWARD_EVENTS_DURATION,
+    INCOMING_MESSAGES,
+    OUTCOMING_EVENTS,
+)
 
 logger = get_logger()
 
@@ -32,6 +41,11 @@ class SentinelOneLogsConsumer(Thread):
     Each endpoint of SentinelOne logs API is consumed in its own separate thread.
     """
 
+    # Number of events to fetch per request
+    batch_size: int
+    # Type of the events, used as label for the metrics
+    lag_type: str
+
     def __init__(self, connector: "SentinelOneLogsConnector", consumer_type: str):
         super().__init__()
 
@@ -43,14 +57,19 @@ class SentinelOneLogsConsumer(Thread):
         self.consumer_type = consumer_type
         self._stop_event = Event()
 
+        self.data_path = self.get_data_path(consumer_type)
         self.cursor = CheckpointDatetime(
-            path=self.get_data_path(consumer_type),
+            path=self.data_path,
             start_at=timedelta(days=1),
             ignore_older_than=timedelta(days=1),
             lock=self.connector.context_lock,
         )
         self.from_date = self.cursor.offset
-        self.session_events_cache: Cache = self.load_events_cache()
+        self.session_events_cache: DedupCache = self.load_events_cache()
+        self._events_cache_lock = Lock()
+
+        # forward pages while the next ones are fetched
+        self._push_executor = ThreadPoolExecutor(max_workers=max(self.configuration.partitions, 1))
 
     def get_data_path(self, consumer_type: str) -> Path:
         # TEMPORARY SOLUTION ONLY!
@@ -100,18 +119,25 @@ class SentinelOneLogsConsumer(Thread):
             hostname=clean_hostname(self.module.configuration.hostname), api_token=self.module.configuration.api_token
         )
 
-    def load_events_cache(self) -> Cache:
-        events_cache: LRUCache = LRUCache(maxsize=10000)
+    @property
+    def events_cache_path(self) -> Path:
+        return self.data_path / "events_cache.bin"
+
+    def load_events_cache(self) -> DedupCache:
+        events_cache = DedupCache(maxsize=10000)
+
+        if self.events_cache_path.exists():
+            events_cache.load(self.events_cache_path)
+            return events_cache
 
+        # migrate the cache previously persisted as a list of identifiers in the context
         with self.cursor._context as ctx:
-            for cached_id in ctx.get("events_cache", []):
-                events_cache[cached_id] = True
+            events_cache.update(ctx.get("events_cache", []))
 
         return events_cache
 
-    def save_events_cache(self, sessions: Cache) -> None:
-        with self.cursor._context as cache:
-            cache["events_cache"] = list(sessions.keys())
+    def save_events_cache(self, sessions: DedupCache) -> None:
+        sessions.save(self.events_cache_path)
 
     @staticmethod
     def _serialize_events(events: list[Activity] | list[Threat] | list[dict]) -> list:
@@ -123,17 +149,170 @@ class SentinelOneLogsConsumer(Thread):
         Returns:
             list: List of json dumped as strings
         """
-        serialized_events = []
-        for event in events:
-            event_dict = event if isinstance(event, dict) else event.__dict__
-            non_empty_json = {k: v for (k, v) in event_dict.items() if v is not None}
-            non_empty_json_str = json.dumps(non_empty_json)
-            serialized_events.append(non_empty_json_str)
-        return serialized_events
+        return [
+            orjson.dumps(
+                {k: v for (k, v) in (event if isinstance(event, dict) else vars(event)).items() if v is not None}
+            ).decode("utf-8")
+            for event in events
+        ]
+
+    def build_query_filter(self) -> QueryFilter:
+        raise NotImplementedError
 
-    def pull_events(self, last_timestamp: datetime | None) -> list:
+    def fetch_page(self, query_filter: QueryFilter) -> ManagementResponse:
+        raise NotImplementedError
+
+    @staticmethod
+    def get_event_id(event: Activity | Threat | dict) -> str:
         raise NotImplementedError
 
+    def pull_events(self, last_timestamp: datetime | None) -> list:
+        """
+        Fetches the events created since the last timestamp
+
+        When several partitions are configured, the time window is split into slices fetched concurrently.
+        The cursor is then only moved forward once every slice was collected.
+        """
+        partitions = max(self.configuration.partitions, 1)
+        if partitions == 1 or last_timestamp is None:
+            events_ids, _ = self._pull_window(last_timestamp, None, update_cursor=True)
+            return events_ids
+
+        if last_timestamp.tzinfo is None:
+            last_timestamp = last_timestamp.replace(tzinfo=UTC)
+
+        windows = split_time_window(last_timestamp, datetime.now(UTC), partitions)
+        with ThreadPoolExecutor(max_workers=len(windows)) as executor:
+            results = list(
+                executor.map(lambda window: self._pull_window(window[0], window[1], update_cursor=False), windows)
+            )
+
+        events_ids = [event_id for window_events_ids, _ in results for event_id in window_events_ids]
+        latest_timestamps = [latest_timestamp for _, latest_timestamp in results if latest_timestamp is not None]
+        if latest_timestamps:
+            self.cursor.offset = max(latest_timestamps)
+            self.from_date = max(latest_timestamps)
+
+        return events_ids
+
+    def _pull_window(
+        self, start: datetime | None, end: datetime | None, update_cursor: bool
+    ) -> tuple[list, datetime | None]:
+        """
+        Pages through the events created in the time window and forwards them
+
+        The push of a page overlaps the fetch of the next one.
+
+        Returns:
+            tuple[list, datetime | None]: the identifiers of the forwarded events and the most recent event date
+        """
+        query_filter = self.build_query_filter()
+        query_filter.apply(key="limit", val=self.batch_size)
+        query_filter.apply(key="sortBy", val="createdAt")
+        query_filter.apply(key="sortOrder", val="asc")
+
+        if start:
+            query_filter.apply(key="createdAt", val=start.isoformat(), op="gt")
+
+        if end:
+            query_filter.apply(key="createdAt", val=end.isoformat(), op="lte")
+
+        events_ids: list = []
+        latest_timestamp: datetime | None = None
+        pending_push: tuple[Future, datetime | None] | None = None
+
+        try:
+            while self.running:
+                response = self.fetch_page(query_filter)
+                if response is None:
+                    raise SENTINEL_ONE_EMPTY_RESPONSE
+
+                SentinelOneManagementResponseError.create_and_raise(response)
+
+                # data can be None
+                events = response.data or []
+                logger.debug("Collected events", type=self.lag_type, nb=len(events))
+                if len(events) == 0:
+                    break
+
+                self.on_page_collected(events)
+
+                # discard already collected events
+                with self._events_cache_lock:
+                    selected_events = filter_collected_events(events, self.get_event_id, self.session_events_cache)
+                    cache_hits, cache_misses = self.session_events_cache.pop_stats()
+
+                # Send Prometheus metrics
+                DEDUP_CACHE_HITS.labels(intake_key=self.configuration.intake_key).inc(cache_hits)
+                DEDUP_CACHE_MISSES.labels(intake_key=self.configuration.intake_key).inc(cache_misses)
+                OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(selected_events))
+
+                # Wait for the previous page to be forwarded, then push the current one while the next page is fetched
+                if pending_push is not None:
+                    latest_timestamp = self._complete_push(pending_push, events_ids, latest_timestamp, update_cursor)
+
+                push: Future = Future()
+                if len(selected_events) > 0:
+                    push = self._push_executor.submit(
+                        self.connector.push_events_to_intakes, self._serialize_events(selected_events)
+                    )
+                else:
+                    push.set_result([])
+
+                pending_push = (push, get_latest_event_timestamp(selected_events))
+
+                next_cursor = response.pagination["nextCursor"]
+                if next_cursor is None:
+                    break
+
+                query_filter.apply(key="cursor", val=next_cursor)
+
+            if pending_push is not None:
+                latest_timestamp = self._complete_push(pending_push, events_ids, latest_timestamp, update_cursor)
+                pending_push = None
+
+            else:
+                EVENTS_LAG.labels(intake_key=self.configuration.intake_key, type=self.lag_type).set(0)
+
+        finally:
+            if pending_push is not None:
+                pending_push[0].cancel()
+
+        return events_ids, latest_timestamp
+
+    def _complete_push(
+        self,
+        pending_push: tuple[Future, datetime | None],
+        events_ids: list,
+        latest_timestamp: datetime | None,
+        update_cursor: bool,
+    ) -> datetime | None:
+        """
+        Waits for a page to be forwarded and updates the cursor and the lag with its most recent event date
+
+        Returns:
+            datetime | None: the most recent event date seen in the window so far
+        """
+        future, page_latest_timestamp = pending_push
+        events_ids.extend(future.result())
+
+        current_lag: int = 0
+        if page_latest_timestamp is not None:
+            if latest_timestamp is None or page_latest_timestamp > latest_timestamp:
+                latest_timestamp = page_latest_timestamp
+
+            if update_cursor:
+                self.cursor.offset = page_latest_timestamp
+                self.from_date = page_latest_timestamp
+
+            current_lag = int((datetime.now(UTC) - page_latest_timestamp).total_seconds())
+
+        EVENTS_LAG.labels(intake_key=self.configuration.intake_key, type=self.lag_type).set(current_lag)
+        return latest_timestamp
+
+    def on_page_collected(self, events: list) -> None:
+        pass
+
     def next_batch(self) -> None:
         # save the starting time
         batch_start_time = time()
@@ -190,6 +369,8 @@ class SentinelOneLogsConsumer(Thread):
         # save sessions cache to the context
         self.save_events_cache(self.session_events_cache)
 
+        self._push_executor.shutdown(wait=True)
+
         self.connector._executor.shutdown(wait=True)
 
 
@@ -201,64 +382,21 @@ class SentinelOneActivityLogsConsumer(SentinelOneLogsConsumer):
             1000,  # Maximum batch size
         )  # Number of activities to fetch per request
 
-    def pull_events(self, last_timestamp: datetime | None) -> list:
-        """Fetches activities from SentinelOne"""
-        # Set  filters
-        query_filter = ActivitiesFilter()
-        query_filter.apply(key="limit", val=self.batch_size)
-        query_filter.apply(key="sortBy", val="createdAt")
-        query_filter.apply(key="sortOrder", val="asc")
-
-        if last_timestamp:
-            query_filter.apply(key="createdAt", val=last_timestamp.isoformat(), op="gt")
+    lag_type = "activities"
 
-        events_ids = []
-        while self.running:
-            # Fetch activities
-            activities_response: ManagementResponse | None = self.management_client.activities.get(query_filter)
-            if activities_response is None:
-                raise SENTINEL_ONE_EMPTY_RESPONSE
-
-            SentinelOneManagementResponseError.create_and_raise(activities_response)
-
-            # data can be None
-            activities = activities_response.data or []
-            nb_activities = len(activities)
-            logger.debug("Collected activities", nb=nb_activities)
-            if nb_activities == 0:
-                EVENTS_LAG.labels(intake_key=self.configuration.intake_key, type="activities").set(0)
-                break
-
-            INCOMING_MESSAGES.labels(intake_key=self.configuration.intake_key).inc(nb_activities)
-
-            # discard already collected events
-            selected_events = filter_collected_events(
-                activities, lambda activity: activity.id, self.session_events_cache
-            )
-
-            # Push events
-            if len(selected_events) > 0:
-                events_ids.extend(self.connector.push_events_to_intakes(self._serialize_events(selected_events)))
-
-            # Send Prometheus metrics
-            OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(selected_events))
-
-            # Update context with latest event date
-            current_lag: int = 0
-            latest_event_timestamp = get_latest_event_timestamp(selected_events)
-            if latest_event_timestamp is not None:
-                self.cursor.offset = latest_event_timestamp
-                self.from_date = latest_event_timestamp
-                current_lag = int((datetime.now(UTC) - latest_event_timestamp).total_seconds())
+    def build_query_filter(self) -> QueryFilter:
+        return ActivitiesFilter()
 
-            EVENTS_LAG.labels(intake_key=self.configuration.intake_key, type="activities").set(current_lag)
+    def fetch_page(self, query_filter: QueryFilter) -> ManagementResponse:
+        """Fetches activities from SentinelOne"""
+        return self.management_client.activities.get(query_filter)
 
-            if activities_response.pagination["nextCursor"] is None:
-                break
+    @staticmethod
+    def get_event_id(event: Activity | Threat | dict) -> str:
+        return str(event.id)  # type: ignore[union-attr]
 
-            query_filter.apply(key="cursor", val=activities_response.pagination["nextCursor"])
-
-        return events_ids
+    def on_page_collected(self, events: list) -> None:
+        INCOMING_MESSAGES.labels(intake_key=self.configuration.intake_key).inc(len(events))
 
 
 class SentinelOneThreatLogsConsumer(SentinelOneLogsConsumer):
@@ -268,63 +406,18 @@ class SentinelOneThreatLogsConsumer(SentinelOneLogsConsumer):
             max(self.connector.configuration.threats_batch_size, 1), 1000  # Minimum batch size  # Maximum batch size
         )  # Number of threats to fetch per request
 
-    def pull_events(self, last_timestamp: datetime | None):
-        """Fetches threats from SentinelOne"""
-        query_filter = ThreatQueryFilter()
+    lag_type = "threats"
 
-        query_filter.apply(key="limit", val=self.batch_size)
-        query_filter.apply(key="sortBy", val="createdAt")
-        query_filter.apply(key="sortOrder", val="asc")
-
-        if last_timestamp:
-            query_filter.apply(key="createdAt", val=last_timestamp.isoformat(), op="gt")
-
-        events_ids = []
-        while self.running:
-            # Fetch threats
-            threat_response: ManagementResponse | None = self.management_client.client.get(
-                endpoint="threats", params=query_filter.filters
-            )
-
-            if threat_response is None:
-                raise SENTINEL_ONE_EMPTY_RESPONSE
-
-            SentinelOneManagementResponseError.create_and_raise(threat_response)
-
-            # data can be None
-            threats = threat_response.data or []
-            nb_threats = len(threats)
-            logger.debug("Collected nb_threats", nb=nb_threats)
-            if nb_threats == 0:
-                EVENTS_LAG.labels(intake_key=self.configuration.intake_key, type="threats").set(0)
-                break
+    def build_query_filter(self) -> QueryFilter:
+        return ThreatQueryFilter()
 
-            # discard already collected events
-            selected_events = filter_collected_events(threats, lambda threat: threat["id"], self.session_events_cache)
-
-            # Push events
-            if len(selected_events) > 0:
-                events_ids.extend(self.connector.push_events_to_intakes(self._serialize_events(selected_events)))
-
-            # Send Prometheus metrics
-            OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(selected_events))
-
-            # Update context with the latest event date
-            current_lag: int = 0
-            latest_event_timestamp = get_latest_event_timestamp(selected_events)
-            if latest_event_timestamp is not None:
-                self.cursor.offset = latest_event_timestamp
-                self.from_date = latest_event_timestamp
-                current_lag = int((datetime.now(UTC) - latest_event_timestamp).total_seconds())
-
-            EVENTS_LAG.labels(intake_key=self.configuration.intake_key, type="threats").set(current_lag)
-
-            if threat_response.pagination["nextCursor"] is None:
-                break
-
-            query_filter.apply(key="cursor", val=threat_response.pagination["nextCursor"])
+    def fetch_page(self, query_filter: QueryFilter) -> ManagementResponse:
+        """Fetches threats from SentinelOne"""
+        return self.management_client.client.get(endpoint="threats", params=query_filter.filters)
 
-        return events_ids
+    @staticmethod
+    def get_event_id(event: Activity | Threat | dict) -> str:
+        return str(event["id"])  # type: ignore[index]
 
 
 CONSUMER_TYPES = {"activity": SentinelOneActivityLogsConsumer, "threat": SentinelOneThreatLogsConsumer}
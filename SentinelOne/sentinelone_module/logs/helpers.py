@@ -25,3 +25,22 @@ def get_latest_event_timestamp(events: list[Activity | Threat | dict]) -> dateti
                     latest_event_datetime = event_created_at
 
     return latest_event_datetime
+
+
+def split_time_window(start: datetime, end: datetime, partitions: int) -> list[tuple[datetime, datetime]]:
+    """Splits a time window into contiguous slices of the same duration
+
+    Args:
+        start (datetime): Beginning of the window (excluded)
+        end (datetime): End of the window (included)
+        partitions (int): Number of slices
+
+    Returns:
+        list[tuple[datetime, datetime]]: The slices, in chronological order
+    """
+    if partitions <= 1 or end <= start:
+        return [(start, end)]
+
+    step = (end - start) / partitions
+    bounds = [start + step * index for index in range(partitions)] + [end]
+    return list(zip(bounds[:-1], bounds[1:]))
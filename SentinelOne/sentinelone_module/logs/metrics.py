@@ -14,6 +14,20 @@ INCOMING_MESSAGES = Counter(
     labelnames=["intake_key"],
 )
 
+DEDUP_CACHE_HITS = Counter(
+    name="dedup_cache_hits",
+    documentation="Number of events found in the deduplication cache",
+    namespace=prom_namespace_sentinelone,
+    labelnames=["intake_key"],
+)
+
+DEDUP_CACHE_MISSES = Counter(
+    name="dedup_cache_misses",
+    documentation="Number of events not found in the deduplication cache",
+    namespace=prom_namespace_sentinelone,
+    labelnames=["intake_key"],
+)
+
 OUTCOMING_EVENTS = Counter(
     name="forwarded_events",
     documentation="Number of events forwarded to Sekoia.io",
@@ -3,10 +3,10 @@ import time
 from abc import ABC
 from datetime import timedelta
 from functools import cached_property
+from pathlib import Path
 from typing import Any, Optional
 
 import orjson
-from cachetools import Cache, LRUCache
 from dateutil.parser import isoparse
 from loguru import logger
 from sekoia_automation.aio.connector import AsyncConnector
@@ -14,8 +14,15 @@ from sekoia_automation.checkpoint import CheckpointCursor, CheckpointDatetime
 from sekoia_automation.connector import Connector, DefaultConnectorConfiguration
 
 from sentinelone_module.base import SentinelOneModule
+from sentinelone_module.dedup import DedupCache
 from sentinelone_module.helpers import filter_collected_events
-from sentinelone_module.logs.metrics import EVENTS_LAG, FORWARD_EVENTS_DURATION, OUTCOMING_EVENTS
+from sentinelone_module.logs.metrics import (
+    DEDUP_CACHE_HITS,
+    DEDUP_CACHE_MISSES,
+    EVENTS_LAG,
+    FORWARD_EVENTS_DURATION,
+    OUTCOMING_EVENTS,
+)
 from sentinelone_module.singularity.client import SentinelOneServerError, SingularityClient
 
 
@@ -38,7 +45,12 @@ class AbstractSingularityConnector(AsyncConnector, ABC):
             start_at=timedelta(days=7),
             ignore_older_than=timedelta(days=7),
         )
-        self.events_cache: Cache = LRUCache(maxsize=10000)
+        self.events_cache = DedupCache(maxsize=10000)
+        self.events_cache.load(self.events_cache_path)
+
+    @property
+    def events_cache_path(self) -> Path:
+        return Path(self.data_path) / "events_cache.bin"
 
     @cached_property
     def client(self) -> SingularityClient:
@@ -74,6 +86,9 @@ class AbstractSingularityConnector(AsyncConnector, ABC):
             )
 
             alerts = filter_collected_events(data.alerts, lambda alert: alert["id"], self.events_cache)
+            cache_hits, cache_misses = self.events_cache.pop_stats()
+            DEDUP_CACHE_HITS.labels(intake_key=self.configuration.intake_key).inc(cache_hits)
+            DEDUP_CACHE_MISSES.labels(intake_key=self.configuration.intake_key).inc(cache_misses)
 
             detailed_alerts = []
             for alert in alerts:
@@ -98,6 +113,7 @@ class AbstractSingularityConnector(AsyncConnector, ABC):
             has_more_items = data.has_next_page
 
         self.last_event_date.offset = last_event_date
+        self.events_cache.save(self.events_cache_path)
 
         return result
 
@@ -136,6 +136,36 @@ def test_pull_threats_have_errors(threat_consumer, threat_1, threat_2):
         threat_consumer.pull_events(most_recent_datetime_seen)
 
 
+@freeze_time("2024-01-23 12:06:34")
+def test_pull_threats_with_partitions(threat_consumer, threat_1, threat_2):
+    OUTCOMING_EVENTS.labels = MagicMock()
+    EVENTS_LAG.labels = MagicMock()
+    threat_consumer.configuration.partitions = 2
+    most_recent_datetime_seen = datetime.datetime(2024, 1, 23, 11, 6, 34, tzinfo=UTC)
+
+    def get_threats(endpoint: str, params: dict):
+        if params["createdAt__lte"] == "2024-01-23T11:36:34+00:00":
+            return MockResponse(pagination={"nextCursor": None}, data=[threat_1])
+
+        return MockResponse(pagination={"nextCursor": None}, data=[threat_2])
+
+    threat_consumer.management_client.client.get.side_effect = get_threats
+    threat_consumer.connector.push_events_to_intakes.side_effect = lambda events: [str(len(events))]
+    events_ids = threat_consumer.pull_events(most_recent_datetime_seen)
+
+    assert events_ids == ["1", "1"]
+    assert threat_consumer.management_client.client.get.call_count == 2
+    requested_windows = sorted(
+        (request.kwargs["params"]["createdAt__gt"], request.kwargs["params"]["createdAt__lte"])
+        for request in threat_consumer.management_client.client.get.call_args_list
+    )
+    assert requested_windows == [
+        ("2024-01-23T11:06:34+00:00", "2024-01-23T11:36:34+00:00"),
+        ("2024-01-23T11:36:34+00:00", "2024-01-23T12:06:34+00:00"),
+    ]
+    assert threat_consumer.from_date == datetime.datetime.fromisoformat(threat_2["createdAt"])
+
+
 def test_run_consumer(activity_consumer):
     def sleeper(_):
         time.sleep(0.1)
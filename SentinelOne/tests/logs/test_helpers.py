@@ -4,7 +4,7 @@ import pytest
 from management.mgmtsdk_v2.entities.activity import Activity
 from management.mgmtsdk_v2.entities.threat import Threat
 
-from sentinelone_module.logs.helpers import get_latest_event_timestamp
+from sentinelone_module.logs.helpers import get_latest_event_timestamp, split_time_window
 
 
 @pytest.mark.parametrize(
@@ -40,3 +40,16 @@ from sentinelone_module.logs.helpers import get_latest_event_timestamp
 )
 def test_get_lastest_event_timestamp(events, expected_datetime):
     assert get_latest_event_timestamp(events) == expected_datetime
+
+
+def test_split_time_window():
+    start = datetime(2024, 7, 21, 0, 0, 0, tzinfo=timezone.utc)
+    end = datetime(2024, 7, 21, 3, 0, 0, tzinfo=timezone.utc)
+
+    assert split_time_window(start, end, 3) == [
+        (start, datetime(2024, 7, 21, 1, 0, 0, tzinfo=timezone.utc)),
+        (datetime(2024, 7, 21, 1, 0, 0, tzinfo=timezone.utc), datetime(2024, 7, 21, 2, 0, 0, tzinfo=timezone.utc)),
+        (datetime(2024, 7, 21, 2, 0, 0, tzinfo=timezone.utc), end),
+    ]
+    assert split_time_window(start, end, 1) == [(start, end)]
+    assert split_time_window(end, start, 3) == [(end, start)]
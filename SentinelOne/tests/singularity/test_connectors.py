@@ -2,7 +2,7 @@ import itertools
 import json
 from pathlib import Path
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import orjson
 import pytest
@@ -115,5 +115,12 @@ async def test_single_run_connector_discard_already_collected_alerts(custom_test
     alert_ids = ["alert1", "alert2", "alert3", "alert1", "alert4", "alert2"]
     patched_connector = patch_connector(custom_test_connector, alert_ids)
 
-    result = await patched_connector.single_run()
+    with (
+        patch("sentinelone_module.singularity.connectors.DEDUP_CACHE_HITS") as mock_hits,
+        patch("sentinelone_module.singularity.connectors.DEDUP_CACHE_MISSES") as mock_misses,
+    ):
+        result = await patched_connector.single_run()
+
     assert result == 4
+    assert sum(call.args[0] for call in mock_hits.labels.return_value.inc.call_args_list) == 2
+    assert sum(call.args[0] for call in mock_misses.labels.return_value.inc.call_args_list) == 4
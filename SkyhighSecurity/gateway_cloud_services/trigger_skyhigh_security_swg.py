@@ -1,13 +1,16 @@
 import csv
 import os
 import queue
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import cached_property
 from threading import Thread, Lock
 from time import sleep
 
 import requests
 from dateutil.parser import isoparse
 from requests import Response
+from requests.adapters import HTTPAdapter
 from sekoia_automation.connector import Connector, DefaultConnectorConfiguration
 from sekoia_automation.connector.workers import Worker, Workers
 from sekoia_automation.storage import PersistentJSON
@@ -23,13 +26,19 @@ class SkyhighSWGConfig(DefaultConnectorConfiguration):
     timedelta: int = 5  # custom lag of the trigger (ex. fetch events from 5 minutes ago)
     start_time: int = 1
     api_domain_name: str = "msg.mcafeesaas.com"
+    max_concurrent_slices: int = 1
+
+
+# A chunk of events, as the CSV header line and the CSV lines of the events
+CSVChunk = tuple[str, list[str]]
 
 
 class EventCollector(Thread):
-    def __init__(self, connector: "SkyhighSecuritySWGTrigger", events_queue: queue.Queue):
+    def __init__(self, connector: "SkyhighSecuritySWGTrigger", events_queue: queue.Queue, chunk_size: int = 1000):
         super().__init__()
         self.connector = connector
         self.events_queue = events_queue
+        self.chunk_size = chunk_size
         self.trigger_activation: datetime = datetime.now(timezone.utc)
         self.headers = {"Accept": "text/csv", "x-mwg-api-version": "8"}
         self.endpoint: str = "/mwg/api/reporting/forensic/"
@@ -51,6 +60,20 @@ class EventCollector(Thread):
             cache["most_recent_date_seen"] = dt.isoformat()
         self.connector.context_lock.release()
 
+    @cached_property
+    def session(self) -> requests.Session:
+        """
+        The HTTP session, shared by the queries, to reuse the connections to the API
+        """
+        session = requests.Session()
+        session.auth = requests.auth.HTTPBasicAuth(
+            self.configuration.account_name, self.configuration.account_password
+        )
+        session.headers.update(self.headers)
+        session.mount("https://", HTTPAdapter(pool_maxsize=max(self.configuration.max_concurrent_slices, 1)))
+
+        return session
+
     def _update_time_range(self):
         self.save_most_recent_date_seen(self.end_date)
 
@@ -99,15 +122,35 @@ class EventCollector(Thread):
             )
             sleep(difference.total_seconds())
 
-    def query_api(self) -> str | None:
+    def _get_time_slices(self) -> list[tuple[datetime, datetime]]:
+        """
+        Get the time slices to collect.
+
+        When the collector is behind, several adjacent time slices, up to `max_concurrent_slices`,
+        are collected at once.
+        """
+        now = datetime.now(timezone.utc) - timedelta(minutes=self.configuration.timedelta)
+
+        slices = [(self.start_date, self.end_date)]
+        while len(slices) < self.configuration.max_concurrent_slices:
+            slice_start = slices[-1][1]
+            slice_end = slice_start + timedelta(seconds=self.configuration.frequency)
+            if slice_end > now:
+                break
+
+            slices.append((slice_start, slice_end))
+
+        return slices
+
+    def _request_api(self, start_date: datetime, end_date: datetime, stream: bool = False) -> Response | None:
         """
         Contact Skyhigh SWG API with appropriate filters and credentials
-        :return: The response
+        :return: The response, or None if the request failed
         """
         self.log(
             message=f"Querying at {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}"
-            f" messages associated with timerange {self.start_date.strftime('%Y-%m-%d %H:%M:%S')}"
-            f" to {self.end_date.strftime('%Y-%m-%d %H:%M:%S')}",
+            f" messages associated with timerange {start_date.strftime('%Y-%m-%d %H:%M:%S')}"
+            f" to {end_date.strftime('%Y-%m-%d %H:%M:%S')}",
             level="info",
         )
 
@@ -115,12 +158,11 @@ class EventCollector(Thread):
             "https://" + self.configuration.api_domain_name + self.endpoint + str(self.configuration.customer_id)
         )
         params = {
-            "filter.requestTimestampFrom": int(self.start_date.timestamp()),
-            "filter.requestTimestampTo": int(self.end_date.timestamp()),
+            "filter.requestTimestampFrom": int(start_date.timestamp()),
+            "filter.requestTimestampTo": int(end_date.timestamp()),
         }
-        auth = requests.auth.HTTPBasicAuth(self.configuration.account_name, self.configuration.account_password)
         request_start_time = datetime.now(timezone.utc)
-        response: Response = requests.get(url=self.url, headers=self.headers, auth=auth, params=params, timeout=30)
+        response: Response = self.session.get(url=self.url, params=params, timeout=30, stream=stream)
 
         time_elapsed = datetime.now(timezone.utc) - request_start_time
         self.log(
@@ -139,6 +181,18 @@ class EventCollector(Thread):
                 ),
                 level="error",
             )
+            response.close()
+            return None
+
+        return response
+
+    def query_api(self) -> str | None:
+        """
+        Contact Skyhigh SWG API with appropriate filters and credentials
+        :return: The response
+        """
+        response = self._request_api(self.start_date, self.end_date)
+        if response is None:
             return None
 
         content = response.content.decode("utf-8")
@@ -148,23 +202,59 @@ class EventCollector(Thread):
 
         return content
 
+    def collect_time_slice(self, start_date: datetime, end_date: datetime) -> int:
+        """
+        Stream the events of the time slice into the queue, by chunks of `chunk_size` CSV lines
+
+        The response is read on the fly, so the events of the time slice are never held in memory at once.
+        :return: The number of collected events
+        """
+        response = self._request_api(start_date, end_date, stream=True)
+        if response is None:
+            return 0
+
+        nb_events = 0
+        with response:
+            lines = (line.decode("utf-8") for line in response.iter_lines(chunk_size=64 * 1024) if line)
+
+            header = next(lines, None)
+            if header is None:
+                return 0
+
+            chunk: list[str] = []
+            for line in lines:
+                chunk.append(line)
+
+                if len(chunk) >= self.chunk_size:
+                    self.events_queue.put((header, chunk))
+                    nb_events += len(chunk)
+                    chunk = []
+
+            if chunk:
+                self.events_queue.put((header, chunk))
+                nb_events += len(chunk)
+
+        return nb_events
+
     def run(self):  # pragma: no cover
         self.log(message="The Event Collector has started", level="info")
         self._init_time_range()
 
-        while not self._stop_event.is_set():
-            try:
-                response = self.query_api()
+        with ThreadPoolExecutor(max_workers=max(self.configuration.max_concurrent_slices, 1)) as executor:
+            while not self._stop_event.is_set():
+                time_slices = self._get_time_slices()
 
-                if response:
-                    self.events_queue.put(response)
-                else:
-                    self.log(message="No messages to forward", level="info")
-            except Exception as ex:
-                self.log_exception(ex, message="Failed to fetch events")
+                try:
+                    nb_events = sum(executor.map(lambda time_slice: self.collect_time_slice(*time_slice), time_slices))
+
+                    if nb_events == 0:
+                        self.log(message="No messages to forward", level="info")
+                except Exception as ex:
+                    self.log_exception(ex, message="Failed to fetch events")
 
-            self._update_time_range()
-            self._sleep_until_next_batch()
+                self.end_date = time_slices[-1][1]
+                self._update_time_range()
+                self._sleep_until_next_batch()
 
         self.log(message="The Event Collector has stopped", level="info")
 
@@ -192,12 +282,24 @@ class Transformer(Worker):
 
         return event_list
 
+    def _transform_chunk(self, chunk: CSVChunk) -> list[str]:
+        """
+        :param chunk: the CSV header line and the CSV lines of the events
+        :return: events formatted as KV
+        """
+        header, lines = chunk
+        fieldnames = next(csv.reader([header]))
+
+        return [" ".join([f"{k}={v}" for k, v in event.items()]) for event in csv.DictReader(lines, fieldnames)]
+
     def run(self):
         try:
             while self.is_running or self.queue.qsize() > 0:
                 try:
                     response = self.queue.get(block=True, timeout=0.5)
-                    messages = self._transform(response)
+                    messages = (
+                        self._transform(response) if isinstance(response, str) else self._transform_chunk(response)
+                    )
 
                     if len(messages) > 0:
                         INCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(messages))
@@ -284,7 +386,8 @@ class SkyhighSecuritySWGTrigger(Connector):
         transformers.start()
 
         # start the event collector
-        collector = EventCollector(self, collect_queue)
+        collect_chunk_size = int(os.environ.get("COLLECT_CHUNK_SIZE", 1000))
+        collector = EventCollector(self, collect_queue, collect_chunk_size)
         collector.start()
 
         try:
@@ -300,7 +403,7 @@ class SkyhighSecuritySWGTrigger(Connector):
                 # if the collector is down, restart it
                 if not collector.is_alive():
                     self.log(message="Event collector failed", level="error")
-                    collector = EventCollector(self, collect_queue)
+                    collector = EventCollector(self, collect_queue, collect_chunk_size)
                     collector.start()
 
         finally:
@@ -198,3 +198,68 @@ def test_trigger_with_credentials(symphony_storage):
     trigger.stop()
 
     assert trigger.events_queue.qsize() > 0
+
+
+def test_collect_time_slice_streams_chunks(event_collector, events_queue, requests_mock):
+    url = (
+        "https://msg.mcafeesaas.com/mwg/api/reporting/forensic/1234567890"
+        "?filter.requestTimestampFrom=1661251791&filter.requestTimestampTo=1661287731"
+    )
+    csv = b'"user_id","username"\r\n"-1","foo"\r\n"-2","bar"\r\n\r\n"-3","baz"\r\n'
+    requests_mock.get(url, content=csv)
+    event_collector.chunk_size = 2
+
+    nb_events = event_collector.collect_time_slice(
+        datetime.fromtimestamp(1661251791), datetime.fromtimestamp(1661287731)
+    )
+
+    assert nb_events == 3
+    assert events_queue.get(block=False) == ('"user_id","username"', ['"-1","foo"', '"-2","bar"'])
+    assert events_queue.get(block=False) == ('"user_id","username"', ['"-3","baz"'])
+    assert events_queue.qsize() == 0
+
+
+def test_collect_time_slice_without_events(event_collector, events_queue, requests_mock):
+    requests_mock.get("https://msg.mcafeesaas.com/mwg/api/reporting/forensic/1234567890", content=EMPTY_RESPONSE)
+
+    nb_events = event_collector.collect_time_slice(
+        datetime.fromtimestamp(1661251791), datetime.fromtimestamp(1661287731)
+    )
+
+    assert nb_events == 0
+    assert events_queue.qsize() == 0
+
+
+def test_tranformer_with_chunk(trigger, events_queue):
+    input_queue = queue.Queue()
+    transformer = Transformer(trigger, input_queue, events_queue)
+
+    input_queue.put(('"user_id","username","path"', ['"-1","foo","/a,b"', '"-2","bar",""']))
+    transformer.start()
+    time.sleep(0.5)
+    transformer.stop()
+
+    events = events_queue.get(block=False)
+    assert events == ["user_id=-1 username=foo path=/a,b", "user_id=-2 username=bar path="]
+
+
+def test_get_time_slices_when_behind(event_collector):
+    event_collector.configuration.max_concurrent_slices = 3
+    event_collector.end_date = datetime.now(timezone.utc) - timedelta(hours=1)
+    event_collector.start_date = event_collector.end_date - timedelta(seconds=60)
+
+    slices = event_collector._get_time_slices()
+
+    assert slices == [
+        (event_collector.start_date, event_collector.end_date),
+        (event_collector.end_date, event_collector.end_date + timedelta(seconds=60)),
+        (event_collector.end_date + timedelta(seconds=60), event_collector.end_date + timedelta(seconds=120)),
+    ]
+
+
+def test_get_time_slices_when_up_to_date(event_collector):
+    event_collector.configuration.max_concurrent_slices = 3
+    event_collector.end_date = datetime.now(timezone.utc) - timedelta(minutes=event_collector.configuration.timedelta)
+    event_collector.start_date = event_collector.end_date - timedelta(seconds=60)
+
+    assert event_collector._get_time_slices() == [(event_collector.start_date, event_collector.end_date)]
@@ -0,0 +1,115 @@
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Generator, Iterable, Literal
+
+from tenable.errors import TioExportsError
+from tenable.io import TenableIO
+
+
+def iter_export_chunks(
+    client: TenableIO,
+    export_type: Literal["vulns", "assets"],
+    max_workers: int = 4,
+    poll_interval: float = 5,
+    **filters,
+) -> Generator[list[dict], None, None]:
+    """
+    Run an export job and yield its chunks as they are downloaded.
+
+    Up to `max_workers` chunks are downloaded concurrently,
+    and the chunks are yielded in the order they were made available by Tenable.
+
+    :param client: The TenableIO client
+    :param export_type: The type of the export job
+    :param max_workers: The maximum number of chunks downloaded concurrently
+    :param poll_interval: The delay, in seconds, between two status checks of an unfinished export job
+    :param filters: The filters of the export job
+    """
+    export_uuid = getattr(client.exports, export_type)(use_iterator=False, **filters)
+
+    known_chunks: set[int] = set()
+    to_download: deque[int] = deque()
+    pending: deque[Future] = deque()
+    finished = False
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            while True:
+                # refresh the list of available chunks once all the known ones are scheduled
+                if not to_download and not finished:
+                    status = client.exports.status(export_type, export_uuid)
+                    if status.get("status") in ("ERROR", "CANCELLED"):
+                        raise TioExportsError(export_type, export_uuid)
+
+                    finished = status.get("status") == "FINISHED"
+                    new_chunks = sorted(set(status.get("chunks_available") or []) - known_chunks)
+                    known_chunks.update(new_chunks)
+                    to_download.extend(new_chunks)
+
+                while to_download and len(pending) < max_workers:
+                    pending.append(
+                        executor.submit(client.exports.download_chunk, export_type, export_uuid, to_download.popleft())
+                    )
+
+                if pending:
+                    yield pending.popleft().result()
+                elif finished:
+                    return
+                elif not to_download:
+                    time.sleep(poll_interval)
+
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class AssetIndex:
+    """
+    Asset details keyed by asset uuid.
+
+    The index is filled from a bulk export of the assets.
+    Assets missing from the index are fetched one by one and kept in a bounded LRU cache.
+    """
+
+    def __init__(self, client: TenableIO, max_cached: int = 10000):
+        self.client = client
+        self.max_cached = max_cached
+        self.assets: dict[str, dict] = {}
+        self._cache: OrderedDict[str, dict] = OrderedDict()
+
+    def load(self, chunks: Iterable[list[dict]]) -> None:
+        """
+        Index the assets of an export
+
+        :param chunks: The chunks of an assets export
+        """
+        for chunk in chunks:
+            for asset in chunk:
+                self.assets[asset["id"]] = asset
+
+    def get(self, asset_uuid: str) -> dict:
+        """
+        Get the details of an asset
+
+        :param asset_uuid: The uuid of the asset
+        :return: The details of the asset
+        """
+        asset = self.assets.get(asset_uuid)
+        if asset is not None:
+            return asset
+
+        asset = self._cache.get(asset_uuid)
+        if asset is not None:
+            self._cache.move_to_end(asset_uuid)
+            return asset
+
+        asset = self.client.assets.details(asset_uuid)
+        self._cache[asset_uuid] = asset
+        if len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+        return asset
+
+    def __len__(self) -> int:
+        return len(self.assets)
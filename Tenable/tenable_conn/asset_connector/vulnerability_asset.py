@@ -6,6 +6,7 @@ from enum import StrEnum, Enum
 from tenable.io import TenableIO
 
 from sekoia_automation.asset_connector import AssetConnector
+from sekoia_automation.asset_connector.models.connector import DefaultAssetConnectorConfiguration
 from sekoia_automation.checkpoint import CheckpointTimestamp, TimeUnit
 from sekoia_automation.asset_connector.models.ocsf.base import Product, Metadata
 from sekoia_automation.asset_connector.models.ocsf.vulnerability import (
@@ -16,6 +17,7 @@ from sekoia_automation.asset_connector.models.ocsf.vulnerability import (
 )
 
 from tenable_conn import TenableModule
+from tenable_conn.asset_connector.exports import AssetIndex, iter_export_chunks
 
 
 class VulnerabilityState(StrEnum):
@@ -31,8 +33,14 @@ class VulnerabilitySeverity(StrEnum):
     CRITICAL = "critical"
 
 
+class TenableAssetConnectorConfiguration(DefaultAssetConnectorConfiguration):
+    export_workers: int = 4
+    asset_cache_size: int = 10000
+
+
 class TenableAssetConnector(AssetConnector):
     module: TenableModule
+    configuration: TenableAssetConnectorConfiguration
 
     STATES: list[VulnerabilityState] = []
     SEVERITIES: list[VulnerabilitySeverity] = []
@@ -52,8 +60,9 @@ class TenableAssetConnector(AssetConnector):
         )
         self.from_date = self.cursor.offset
         self._latest_time = None
+        self.asset_index: AssetIndex | None = None
 
-    @property
+    @cached_property
     def client(self) -> TenableIO:
         """
         Create and return a TenableIO client instance using the provided configuration.
@@ -192,14 +201,35 @@ class TenableAssetConnector(AssetConnector):
         Returns:
             dict: A dictionary containing asset details.
         """
-        asset_info: dict = self.client.assets.details(asset_uuid)
-        return asset_info
+        if self.asset_index is None:
+            self.asset_index = AssetIndex(self.client, max_cached=self.configuration.asset_cache_size)
+
+        return self.asset_index.get(asset_uuid)
+
+    def _build_asset_index(self) -> AssetIndex:
+        """
+        Build the index of the assets from a bulk export of the assets.
+
+        :return:
+            AssetIndex: The assets keyed by their UUID.
+        """
+        asset_index = AssetIndex(self.client, max_cached=self.configuration.asset_cache_size)
+        asset_index.load(
+            iter_export_chunks(
+                self.client, "assets", max_workers=self.configuration.export_workers, chunk_size=self.num_assets
+            )
+        )
+        self.log(f"Indexed {len(asset_index)} assets from tenable", level="info")
+        return asset_index
 
     def _get_tenable_vul(self) -> Generator[VulnerabilityOCSFModel, None, None]:
         """
         This method retrieves vulnerabilities from Tenable using the pyTenable SDK,
         processes them, and yields them as VulnerabilityOCSFModel instances.
 
+        The chunks of the export are downloaded in parallel and the vulnerabilities are joined
+        against the index of the assets.
+
         :return:
             Generator[VulnerabilityOCSFModel, None, None]: A generator yielding VulnerabilityOCSFModel instances.
         """
@@ -207,13 +237,24 @@ class TenableAssetConnector(AssetConnector):
         recent_timestamp_seen: int = self.from_date
         self.log(f"Getting vulnerabilities from tenable at {self.cursor.offset}", level="info")
 
+        self.asset_index = self._build_asset_index()
+
         # Use pyTenable sdk to get vulnerabilities
-        vulns = self.client.exports.vulns(
-            since=self.cursor.offset, state=self.states, severity=self.severities, num_assets=self.num_assets
+        chunks = iter_export_chunks(
+            self.client,
+            "vulns",
+            max_workers=self.configuration.export_workers,
+            since=self.cursor.offset,
+            state=self.states,
+            severity=self.severities,
+            num_assets=self.num_assets,
         )
 
-        if vulns:
+        has_vulns = False
+        for vulns in chunks:
             for vuln in vulns:
+                has_vulns = True
+
                 # Get the asset information
                 asset_uuid = vuln["asset"]["uuid"]
                 asset_info = self._get_asset_info(asset_uuid)
@@ -223,13 +264,15 @@ class TenableAssetConnector(AssetConnector):
 
                 yield mapped_vuln
 
-                # Update the cursor offset
+                # Update the cursor offset with the most recent vulnerability
                 last_datetime: int = self.extract_timestamp(vuln)
                 if last_datetime > recent_timestamp_seen:
+                    recent_timestamp_seen = last_datetime
                     self._latest_time = last_datetime
-                    self.log(f"Last time updated to {last_datetime}", level="info")
 
-        else:
+            self.log(f"Last time updated to {self._latest_time}", level="info")
+
+        if not has_vulns:
             self.log(f"Getting no assets from tenable at {self.cursor.offset}", level="info")
 
     def get_assets(self) -> Generator[VulnerabilityOCSFModel, None, None]:
@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from tenable.errors import TioExportsError
+
+from tenable_conn.asset_connector.exports import AssetIndex, iter_export_chunks
+
+
+def test_iter_export_chunks_in_order():
+    client = MagicMock()
+    client.exports.vulns.return_value = "export-uuid"
+    client.exports.status.side_effect = [
+        {"status": "PROCESSING", "chunks_available": []},
+        {"status": "PROCESSING", "chunks_available": [2, 1]},
+        {"status": "FINISHED", "chunks_available": [1, 2, 3]},
+    ]
+    client.exports.download_chunk.side_effect = lambda export_type, export_uuid, chunk_id: [{"chunk": chunk_id}]
+
+    with patch("tenable_conn.asset_connector.exports.time.sleep") as mock_sleep:
+        chunks = list(iter_export_chunks(client, "vulns", max_workers=2, since=10))
+
+    assert chunks == [[{"chunk": 1}], [{"chunk": 2}], [{"chunk": 3}]]
+    assert client.exports.download_chunk.call_count == 3
+    client.exports.vulns.assert_called_once_with(use_iterator=False, since=10)
+    mock_sleep.assert_called_once()
+
+
+def test_iter_export_chunks_error():
+    client = MagicMock()
+    client.exports.assets.return_value = "export-uuid"
+    client.exports.status.return_value = {"status": "ERROR", "chunks_available": []}
+
+    with pytest.raises(TioExportsError):
+        list(iter_export_chunks(client, "assets"))
+
+
+def test_asset_index():
+    client = MagicMock()
+    client.assets.details.side_effect = lambda asset_uuid: {"id": asset_uuid, "fetched": True}
+
+    index = AssetIndex(client, max_cached=1)
+    index.load([[{"id": "a"}, {"id": "b"}], [{"id": "c"}]])
+
+    assert len(index) == 3
+    assert index.get("b") == {"id": "b"}
+    client.assets.details.assert_not_called()
+
+    # misses are fetched once and kept in the LRU cache
+    assert index.get("d") == {"id": "d", "fetched": True}
+    assert index.get("d") == {"id": "d", "fetched": True}
+    assert client.assets.details.call_count == 1
+
+    # the cache is bounded
+    index.get("e")
+    index.get("d")
+    assert client.assets.details.call_count == 3
@@ -2,7 +2,6 @@ import pytest
 from unittest.mock import MagicMock, patch, Mock
 
 from sekoia_automation.asset_connector.models.ocsf.vulnerability import VulnerabilityOCSFModel
-from tenable.io.exports.api import ExportsAPI
 
 from tenable_conn.asset_connector.vulnerability_asset import (
     TenableAssetConnector,
@@ -318,10 +317,55 @@ def test_map_vulnerability_fields(tenable_asset_connector, asset_info, vulnerabi
     assert result.vulnerabilities.references[0] == vulnerability["plugin"]["see_also"][0]
 
 
+def export_client(vulns: list[dict], assets: list[dict]) -> MagicMock:
+    client = MagicMock()
+    client.exports.vulns.return_value = "vulns-export"
+    client.exports.assets.return_value = "assets-export"
+    client.exports.status.return_value = {"status": "FINISHED", "chunks_available": [1]}
+    client.exports.download_chunk.side_effect = lambda export_type, export_uuid, chunk_id: (
+        vulns if export_type == "vulns" else assets
+    )
+    return client
+
+
 def test_get_vulnerabilities(tenable_asset_connector, vulnerability, asset_info):
+    asset_info["id"] = vulnerability["asset"]["uuid"]
+    client = export_client([vulnerability], [asset_info])
+    tenable_asset_connector.client = client
+
+    vulns = list(tenable_asset_connector._get_tenable_vul())
+
+    assert len(vulns) == 1
+    assert isinstance(vulns[0], VulnerabilityOCSFModel)
+    assert vulns[0].finding_info.uid == vulnerability["finding_id"]
+    client.assets.details.assert_not_called()
+
+
+def test_get_vulnerabilities_asset_fallback(tenable_asset_connector, vulnerability, asset_info):
+    other_vulnerability = {**vulnerability, "finding_id": "2c8f1d2e-2a4b-4f5e-9c1d-3b2a1f0e9d8c"}
+    client = export_client([vulnerability, other_vulnerability], [])
+    client.assets.details.return_value = asset_info
+    tenable_asset_connector.client = client
+
+    vulns = list(tenable_asset_connector._get_tenable_vul())
+
+    assert [vuln.finding_info.uid for vuln in vulns] == [
+        vulnerability["finding_id"],
+        other_vulnerability["finding_id"],
+    ]
+    client.assets.details.assert_called_once_with(vulnerability["asset"]["uuid"])
+
+
+def test_get_vulnerabilities_keeps_most_recent_time(tenable_asset_connector, vulnerability, asset_info):
+    recent_vulnerability = {**vulnerability, "first_found": "2025-09-01T00:00:00Z"}
+    old_vulnerability = {**vulnerability, "first_found": "2025-08-27T00:00:00Z"}
+    client = export_client([recent_vulnerability, old_vulnerability], [])
+    client.assets.details.return_value = asset_info
+    tenable_asset_connector.client = client
+    tenable_asset_connector.from_date = 0
+
+    list(tenable_asset_connector._get_tenable_vul())
+    tenable_asset_connector.update_checkpoint()
 
-    with patch.object(ExportsAPI, "vulns", return_value=[vulnerability]):
-        with patch.object(tenable_asset_connector, "_get_asset_info", return_value=asset_info):
-            for vuln in tenable_asset_connector._get_tenable_vul():
-                assert isinstance(vuln, VulnerabilityOCSFModel)
-                assert vuln.finding_info.uid == vulnerability["finding_id"]
+    assert tenable_asset_connector._latest_time == tenable_asset_connector.extract_timestamp(recent_vulnerability)
+    assert tenable_asset_connector.from_date == tenable_asset_connector.extract_timestamp(recent_vulnerability)
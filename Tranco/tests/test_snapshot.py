@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from tranco_module.snapshot import ENTERED, LEFT, MOVED, TrancoSnapshot
+
+
+def test_snapshot_diff(tmp_path: Path):
+    previous = TrancoSnapshot.build(tmp_path / "previous", ["a.com", "b.com", "c.com", "d.com", "e.com"])
+    current = TrancoSnapshot.build(tmp_path / "current", ["a.com", "c.com", "b.com", "f.com", "e.com"])
+
+    assert list(previous.diff(current, bucket_size=2)) == [
+        (ENTERED, 4, "f.com"),
+        (MOVED, 2, "c.com"),
+        (MOVED, 3, "b.com"),
+        (LEFT, 4, "d.com"),
+    ]
+    assert list(current.diff(current, bucket_size=2)) == []
+
+
+def test_snapshot_replace(tmp_path: Path):
+    previous = TrancoSnapshot(tmp_path / "previous")
+    assert not previous.exists()
+
+    current = TrancoSnapshot.build(tmp_path / "current", ["a.com"])
+    previous.replace(current)
+
+    assert previous.exists()
+    assert previous.domains_path.read_text() == "a.com\n"
@@ -1,3 +1,5 @@
+import io
+import zipfile
 from pathlib import Path
 import pytest
 import requests_mock
@@ -45,3 +47,33 @@ def test_run(trigger, mock):
         trigger._run()
         # 1 download of the zip, and 3 send events because chunk size = 5 and the zip has 13 domains
         assert mock.call_count == 4
+
+
+def make_archive(domains: list[str]) -> bytes:
+    content = io.BytesIO()
+    with zipfile.ZipFile(content, "w") as zp:
+        zp.writestr("top-1m.csv", "".join(f"{rank},{domain}\n" for rank, domain in enumerate(domains, 1)))
+    return content.getvalue()
+
+
+def test_run_diff(trigger, mock):
+    trigger.configuration = {"interval": 0, "chunk_size": 5, "diff": True, "rank_bucket_size": 2}
+
+    # first run: every domain is sent
+    mock.get(trigger.top_domains_url, content=make_archive(["a.com", "b.com", "c.com", "d.com"]))
+    trigger._run()
+    events = [request.json() for request in mock.request_history if request.url == trigger.callback_url]
+    assert [event["event"]["change_type"] for event in events] == ["entered"]
+    assert events[0]["event"]["chunk_size"] == 4
+    assert trigger.snapshot.exists()
+
+    # second run: only the changes are sent
+    mock.reset_mock()
+    mock.get(trigger.top_domains_url, content=make_archive(["a.com", "c.com", "b.com", "e.com"]))
+    trigger._run()
+    events = [request.json() for request in mock.request_history if request.url == trigger.callback_url]
+    assert [(event["event"]["change_type"], event["event"]["chunk_size"]) for event in events] == [
+        ("entered", 1),
+        ("moved", 2),
+        ("left", 1),
+    ]
@@ -0,0 +1,148 @@
+import hashlib
+import mmap
+import shutil
+from array import array
+from collections.abc import Generator, Iterable
+from pathlib import Path
+
+ENTERED = "entered"
+LEFT = "left"
+MOVED = "moved"
+
+
+def hash_domain(domain: str) -> int:
+    return int.from_bytes(hashlib.blake2b(domain.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _read_array(path: Path, typecode: str) -> array:
+    """
+    Read an array through a memory map, without going through an intermediate bytes object
+    """
+    result = array(typecode)
+    if path.stat().st_size == 0:
+        return result
+
+    with path.open("rb") as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        result.frombytes(mapped)
+
+    return result
+
+
+def _resolve_domains(domains_path: Path, ranks: set[int]) -> dict[int, str]:
+    """
+    Get the domains at the given ranks from a list of domains stored one per line in rank order
+    """
+    result: dict[int, str] = {}
+    if not ranks:
+        return result
+
+    with domains_path.open("r", encoding="utf-8") as fp:
+        for rank, domain in enumerate(fp, start=1):
+            if rank in ranks:
+                result[rank] = domain.rstrip("\n")
+                if len(result) == len(ranks):
+                    break
+
+    return result
+
+
+class TrancoSnapshot:
+    """
+    Compact on-disk snapshot of a ranked list of domains
+
+    The snapshot is made of the hashes of the domains, sorted, the ranks aligned on the hashes and the
+    list of domains in rank order. Diffing two lists walks both sorted hash arrays once.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    @property
+    def hashes_path(self) -> Path:
+        return self.directory / "hashes.bin"
+
+    @property
+    def ranks_path(self) -> Path:
+        return self.directory / "ranks.bin"
+
+    @property
+    def domains_path(self) -> Path:
+        return self.directory / "domains.txt"
+
+    def exists(self) -> bool:
+        return self.hashes_path.exists() and self.ranks_path.exists() and self.domains_path.exists()
+
+    @classmethod
+    def build(cls, directory: Path, domains: Iterable[str]) -> "TrancoSnapshot":
+        """
+        Write a snapshot of the domains, given in rank order
+        """
+        if directory.exists():
+            shutil.rmtree(directory)
+        directory.mkdir(parents=True)
+
+        snapshot = cls(directory)
+        hashes = array("Q")
+        with snapshot.domains_path.open("w", encoding="utf-8") as fp:
+            for domain in domains:
+                hashes.append(hash_domain(domain))
+                fp.write(f"{domain}\n")
+
+        # sort the hashes and keep track of the ranks
+        order = sorted(range(len(hashes)), key=hashes.__getitem__)
+        with snapshot.hashes_path.open("wb") as fp:
+            array("Q", (hashes[index] for index in order)).tofile(fp)
+        with snapshot.ranks_path.open("wb") as fp:
+            array("I", (index + 1 for index in order)).tofile(fp)
+
+        return snapshot
+
+    def replace(self, other: "TrancoSnapshot") -> None:
+        """
+        Replace this snapshot by another one
+        """
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
+        other.directory.rename(self.directory)
+
+    def diff(self, new: "TrancoSnapshot", bucket_size: int) -> Generator[tuple[str, int, str], None, None]:
+        """
+        Yield the changes from this snapshot to the new one, as (change, rank, domain) tuples
+
+        Domains that entered or moved to another rank bucket are reported with their new rank,
+        domains that left the list with their previous rank.
+        """
+        old_hashes, old_ranks = _read_array(self.hashes_path, "Q"), _read_array(self.ranks_path, "I")
+        new_hashes, new_ranks = _read_array(new.hashes_path, "Q"), _read_array(new.ranks_path, "I")
+
+        entered: set[int] = set()
+        moved: set[int] = set()
+        left: set[int] = set()
+
+        old_index, new_index = 0, 0
+        while old_index < len(old_hashes) or new_index < len(new_hashes):
+            if new_index >= len(new_hashes) or (
+                old_index < len(old_hashes) and old_hashes[old_index] < new_hashes[new_index]
+            ):
+                left.add(old_ranks[old_index])
+                old_index += 1
+
+            elif old_index >= len(old_hashes) or new_hashes[new_index] < old_hashes[old_index]:
+                entered.add(new_ranks[new_index])
+                new_index += 1
+
+            else:
+                if (old_ranks[old_index] - 1) // bucket_size != (new_ranks[new_index] - 1) // bucket_size:
+                    moved.add(new_ranks[new_index])
+                old_index += 1
+                new_index += 1
+
+        new_domains = _resolve_domains(new.domains_path, entered | moved)
+        for rank in sorted(entered):
+            yield ENTERED, rank, new_domains[rank]
+        for rank in sorted(moved):
+            yield MOVED, rank, new_domains[rank]
+
+        old_domains = _resolve_domains(self.domains_path, left)
+        for rank in sorted(left):
+            yield LEFT, rank, old_domains[rank]
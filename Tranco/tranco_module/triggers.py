@@ -1,12 +1,19 @@
+import io
+import tempfile
 import time
 import uuid
 import zipfile
-from io import BytesIO
+from collections.abc import Generator, Iterable
+from itertools import groupby, islice
+from operator import itemgetter
+from pathlib import Path
 
 import orjson
 import requests
 from sekoia_automation.trigger import Trigger
 
+from tranco_module.snapshot import ENTERED, TrancoSnapshot
+
 
 class FetchTrancoListTrigger(Trigger):
     top_domains_url = "https://tranco-list.eu/top-1m.csv.zip"
@@ -19,6 +26,18 @@ class FetchTrancoListTrigger(Trigger):
     def interval(self):
         return self.configuration.get("interval", 24) * 3600
 
+    @property
+    def diff(self) -> bool:
+        return self.configuration.get("diff", False)
+
+    @property
+    def rank_bucket_size(self) -> int:
+        return self.configuration.get("rank_bucket_size", 1000)
+
+    @property
+    def snapshot(self) -> TrancoSnapshot:
+        return TrancoSnapshot(self._data_path.joinpath("tranco_snapshot"))
+
     def run(self):
         self.log("Trigger starting")
         try:
@@ -29,18 +48,52 @@ class FetchTrancoListTrigger(Trigger):
 
     def _run(self):
         self.log("Starting run")
-        domains = self.get_top_domains()
-        if not domains:
-            return
+        with tempfile.TemporaryDirectory(dir=self._data_path) as work_dir:
+            archive_path = Path(work_dir).joinpath("top-1m.csv.zip")
+            if not self.download_list(archive_path):
+                return
+
+            if self.diff:
+                self.send_changes(archive_path, Path(work_dir).joinpath("snapshot"))
+            else:
+                self.send_list(archive_path)
+
+        self.log(f"Sleeping for {self.interval} seconds", level="debug")
+        time.sleep(self.interval)
+
+    def send_list(self, archive_path: Path):
         created_events = 0
-        for chunk, offset in self.domain_chunks(domains):
+        for chunk, offset in self.domain_chunks(self.iter_top_domains(archive_path)):
             self.create_event_for_chunk(chunk, offset)
             created_events += 1
         self.log(f"Pushed {created_events} chunk events")
-        self.log(f"Sleeping for {self.interval} seconds", level="debug")
-        time.sleep(self.interval)
 
-    def create_event_for_chunk(self, chunk, offset):
+    def send_changes(self, archive_path: Path, work_dir: Path):
+        """
+        Send only the domains that entered or left the list, or whose rank bucket changed, since the previous run
+        """
+        new_snapshot = TrancoSnapshot.build(work_dir, self.iter_top_domains(archive_path))
+        previous_snapshot = self.snapshot
+
+        if previous_snapshot.exists():
+            changes: Iterable[tuple[str, int, str]] = previous_snapshot.diff(new_snapshot, self.rank_bucket_size)
+        else:
+            # first run: every domain entered the list
+            changes = ((ENTERED, rank, domain) for rank, domain in enumerate(self.iter_top_domains(archive_path), 1))
+
+        created_events = 0
+        nb_changes = 0
+        for change_type, group in groupby(changes, key=itemgetter(0)):
+            for chunk, offset in self.domain_chunks(domain for _, _, domain in group):
+                self.create_event_for_chunk(chunk, offset, change_type=change_type)
+                created_events += 1
+                nb_changes += len(chunk)
+
+        # the new list becomes the reference once every change was sent
+        previous_snapshot.replace(new_snapshot)
+        self.log(f"Pushed {created_events} chunk events for {nb_changes} changes")
+
+    def create_event_for_chunk(self, chunk, offset, change_type: str | None = None):
         chunk_size = min(self.chunk_size, len(chunk))
         work_dir = self._data_path.joinpath("tranco_chunks").joinpath(str(uuid.uuid4()))
         chunk_path = work_dir.joinpath("observables.json")
@@ -50,23 +103,56 @@ class FetchTrancoListTrigger(Trigger):
 
         directory = str(work_dir.relative_to(self._data_path))
         file_path = str(chunk_path.relative_to(work_dir))
+        event = dict(file_path=file_path, chunk_offset=offset, chunk_size=chunk_size)
+        event_name = f"Tranco List Chunk {offset}-{offset+chunk_size}"
+        if change_type is not None:
+            event["change_type"] = change_type
+            event_name = f"Tranco List Changes ({change_type}) {offset}-{offset+chunk_size}"
+
         self.send_event(
-            event_name=f"Tranco List Chunk {offset}-{offset+chunk_size}",
-            event=dict(file_path=file_path, chunk_offset=offset, chunk_size=chunk_size),
+            event_name=event_name,
+            event=event,
             directory=directory,
             remove_directory=True,
         )
 
-    def get_top_domains(self) -> list:
+    def download_list(self, archive_path: Path) -> bool:
+        """
+        Download the archive of the list on disk
+        """
         response = requests.get(self.top_domains_url, stream=True)
         if not response.ok:
             self.log(f"Server answered with {response.status_code}", level="error")
-            return []
-        with zipfile.ZipFile(BytesIO(response.content)) as zp:
+            return False
+
+        with archive_path.open("wb") as fp:
+            for content in response.iter_content(chunk_size=1024 * 1024):
+                fp.write(content)
+
+        return True
+
+    @staticmethod
+    def iter_top_domains(archive_path: Path) -> Generator[str, None, None]:
+        """
+        Read the domains of the list, in rank order
+        """
+        with zipfile.ZipFile(archive_path) as zp:
             with zp.open("top-1m.csv") as fp:
-                # Can't use any generator/iterator since they are not subscriptable
-                return [line.decode("utf-8").split(",")[1].strip() for line in fp.readlines()]
+                for line in io.TextIOWrapper(fp, encoding="utf-8"):
+                    if line.strip():
+                        yield line.split(",", 1)[1].strip()
+
+    def get_top_domains(self) -> list:
+        with tempfile.TemporaryDirectory(dir=self._data_path) as work_dir:
+            archive_path = Path(work_dir).joinpath("top-1m.csv.zip")
+            if not self.download_list(archive_path):
+                return []
+
+            return list(self.iter_top_domains(archive_path))
 
-    def domain_chunks(self, domains):
-        for i in range(0, len(domains), self.chunk_size):
-            yield domains[i : i + self.chunk_size], i
+    def domain_chunks(self, domains: Iterable[str]) -> Generator[tuple[list, int], None, None]:
+        iterator = iter(domains)
+        offset = 0
+        while chunk := list(islice(iterator, self.chunk_size)):
+            yield chunk, offset
+            offset += len(chunk)
@@ -25,6 +25,43 @@ class TrellixEdrConnectorConfig(DefaultConnectorConfiguration):
     ratelimit_per_minute: int = 60
     ratelimit_per_day: int = 2000
     records_per_request: int = 100
+    chunk_size: int = 1000
+    max_concurrent_threats: int = 10
+
+
+class EventsBatch(object):
+    """Buffer of events forwarded to the intake by batches."""
+
+    def __init__(self, connector: "TrellixEdrConnector", batch_size: int) -> None:
+        """
+        Init EventsBatch.
+
+        Args:
+            connector: TrellixEdrConnector
+            batch_size: int
+        """
+        self.connector = connector
+        self.batch_size = batch_size
+        self.events: list[str] = []
+        self.pushed = 0
+
+    async def add(self, events: list[str]) -> None:
+        """
+        Add events to the batch and forward it once full.
+
+        Args:
+            events: list[str]
+        """
+        self.events.extend(events)
+        if len(self.events) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Forward the buffered events."""
+        # swap the buffer before awaiting, so concurrent producers keep filling a new one
+        events, self.events = self.events, []
+        if events:
+            self.pushed += len(await self.connector.push_data_to_intakes(events))
 
 
 class TrellixEdrConnector(AsyncConnector):
@@ -124,14 +161,18 @@ class TrellixEdrConnector(AsyncConnector):
 
         return result, last_event_date
 
-    async def populate_threats(self, end_date: datetime | None = None) -> Tuple[list[str], datetime]:
+    async def populate_threats(self, end_date: datetime | None = None) -> Tuple[int, datetime]:
         """
         Populate threats.
 
+        The detections and the affected hosts of the threats are fetched concurrently,
+        for at most `max_concurrent_threats` threats at once, and all the events are forwarded by batches.
+
         Returns:
-            list[str]
+            Tuple[int, datetime]: the number of forwarded events and the date of the most recent threat
         """
-        result: list[str] = []
+        batch = EventsBatch(self, self.configuration.chunk_size)
+        semaphore = asyncio.Semaphore(self.configuration.max_concurrent_threats)
 
         start_date = self.last_event_date("threats")
 
@@ -140,48 +181,65 @@ class TrellixEdrConnector(AsyncConnector):
 
         most_recent_threat_date = start_date
 
-        offset = 0
-        while True:
-            threats = await self.trellix_client.get_edr_threats(
-                start_date,
-                end_date,
-                self.configuration.records_per_request,
-                offset,
-            )
-            logger.info(
-                "Got {total} threats from {start_date} to {end_date} and offset {offset}",
-                start_date=start_date,
-                end_date=end_date,
-                offset=offset,
-                total=len(threats),
-            )
+        async def expand_threat(threat_id: str, end_date: datetime) -> None:
+            async with semaphore:
+                await asyncio.gather(
+                    self.get_threat_detections(threat_id, start_date, end_date, batch),
+                    self.get_threat_affectedhosts(threat_id, start_date, end_date, batch),
+                )
 
-            result_data = [orjson.dumps(event.dict(exclude_none=True)).decode("utf-8") for event in threats]
-            result.extend(await self.push_data_to_intakes(result_data))
+        tasks: list[asyncio.Task[None]] = []
+        try:
+            offset = 0
+            while True:
+                threats = await self.trellix_client.get_edr_threats(
+                    start_date,
+                    end_date,
+                    self.configuration.records_per_request,
+                    offset,
+                )
+                logger.info(
+                    "Got {total} threats from {start_date} to {end_date} and offset {offset}",
+                    start_date=start_date,
+                    end_date=end_date,
+                    offset=offset,
+                    total=len(threats),
+                )
 
-            for threat in threats:
-                threat_date = isoparse(threat.attributes.lastDetected).replace(tzinfo=timezone.utc)
+                await batch.add([orjson.dumps(event.dict(exclude_none=True)).decode("utf-8") for event in threats])
 
-                if threat_date > most_recent_threat_date:
-                    most_recent_threat_date = threat_date
+                for threat in threats:
+                    threat_date = isoparse(threat.attributes.lastDetected).replace(tzinfo=timezone.utc)
 
-                if threat.id is None:
-                    raise Exception("Threat id is None")
+                    if threat_date > most_recent_threat_date:
+                        most_recent_threat_date = threat_date
 
-                result.extend(await self.get_threat_detections(threat.id, start_date, end_date))
-                result.extend(await self.get_threat_affectedhosts(threat.id, start_date, end_date))
+                    if threat.id is None:
+                        raise Exception("Threat id is None")
 
-            offset = offset + self.configuration.records_per_request
+                    tasks.append(asyncio.create_task(expand_threat(threat.id, end_date)))
 
-            if len(threats) == 0:
-                break
+                offset = offset + self.configuration.records_per_request
+
+                if len(threats) == 0:
+                    break
+
+            await asyncio.gather(*tasks)
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        await batch.flush()
 
         with self.context as cache:
             cache["threats"] = end_date.isoformat()
 
-        return result, most_recent_threat_date
+        return batch.pushed, most_recent_threat_date
 
-    async def get_threat_detections(self, threat_id: str, start_date: datetime, end_date: datetime) -> list[str]:
+    async def get_threat_detections(
+        self, threat_id: str, start_date: datetime, end_date: datetime, batch: EventsBatch | None = None
+    ) -> int:
         """
         Get threat detections.
 
@@ -189,11 +247,13 @@ class TrellixEdrConnector(AsyncConnector):
             threat_id: str
             start_date: datetime
             end_date: datetime
+            batch: EventsBatch | None: the batch to add the events to. If not set, the events are forwarded directly
 
         Returns:
-            list[str]
+            int: the number of detections
         """
-        result = []
+        events_batch = batch or EventsBatch(self, self.configuration.chunk_size)
+        total = 0
 
         offset = 0
         while True:
@@ -218,15 +278,21 @@ class TrellixEdrConnector(AsyncConnector):
                 for event in detections
             ]
 
-            result.extend(await self.push_data_to_intakes(result_data))
+            await events_batch.add(result_data)
+            total += len(result_data)
             offset = offset + self.configuration.records_per_request
 
             if len(detections) == 0:
                 break
 
-        return result
+        if batch is None:
+            await events_batch.flush()
 
-    async def get_threat_affectedhosts(self, threat_id: str, start_date: datetime, end_date: datetime) -> list[str]:
+        return total
+
+    async def get_threat_affectedhosts(
+        self, threat_id: str, start_date: datetime, end_date: datetime, batch: EventsBatch | None = None
+    ) -> int:
         """
         Get threat affectedhosts.
 
@@ -234,11 +300,13 @@ class TrellixEdrConnector(AsyncConnector):
             threat_id: str
             start_date: datetime
             end_date: datetime
+            batch: EventsBatch | None: the batch to add the events to. If not set, the events are forwarded directly
 
         Returns:
-            list[str]
+            int: the number of affectedhosts
         """
-        result = []
+        events_batch = batch or EventsBatch(self, self.configuration.chunk_size)
+        total = 0
 
         offset = 0
         while True:
@@ -263,25 +331,29 @@ class TrellixEdrConnector(AsyncConnector):
                 for event in affectedhosts
             ]
 
-            result.extend(await self.push_data_to_intakes(result_data))
+            await events_batch.add(result_data)
+            total += len(result_data)
             offset = offset + self.configuration.records_per_request
 
             if len(affectedhosts) == 0:
                 break
 
-        return result
+        if batch is None:
+            await events_batch.flush()
+
+        return total
 
     async def async_run(self) -> None:  # pragma: no cover
         while self.running:
             try:
                 processing_start = time.time()
 
-                message_threats_ids, most_recent_threat_date = await self.populate_threats()
+                threats_count, most_recent_threat_date = await self.populate_threats()
                 message_alerts_ids, most_recent_alert_date = await self.populate_alerts()
 
                 processing_end = time.time()
 
-                message_ids = message_alerts_ids + message_threats_ids
+                messages_count = len(message_alerts_ids) + threats_count
 
                 EVENTS_LAG.labels(intake_key=self.configuration.intake_key, type="threats").set(
                     processing_end - most_recent_threat_date.timestamp()
@@ -291,11 +363,11 @@ class TrellixEdrConnector(AsyncConnector):
                     processing_end - most_recent_alert_date.timestamp()
                 )
 
-                OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(len(message_ids))
+                OUTCOMING_EVENTS.labels(intake_key=self.configuration.intake_key).inc(messages_count)
 
                 log_message = "No records to forward"
-                if len(message_ids) > 0:
-                    log_message = "Pushed {0} records".format(len(message_ids))
+                if messages_count > 0:
+                    log_message = "Pushed {0} records".format(messages_count)
 
                 self.log(message=log_message, level="info")
 
@@ -309,7 +381,7 @@ class TrellixEdrConnector(AsyncConnector):
 
                 # compute the remaining sleeping time. If greater than 0 and no messages where fetched, pause the connector
                 delta_sleep = self.configuration.frequency - processing_time
-                if len(message_ids) == 0 and delta_sleep > 0:
+                if messages_count == 0 and delta_sleep > 0:
                     self.log(message=f"Next batch in the future. Waiting {delta_sleep} seconds", level="info")
 
                     await asyncio.sleep(delta_sleep)
@@ -1,5 +1,6 @@
 """Tests for Trellix EDR connector."""
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
@@ -196,6 +197,7 @@ async def test_trellix_connector_get_detection_events(
         )
 
         result = await connector.get_threat_detections(threat_id, start_date, end_date)
+        pushed_events = [event for call in connector.push_data_to_intakes.call_args_list for event in call.args[0]]
 
         total_expected_detections_result = [
             {**event, "threatId": threat_id}
@@ -204,7 +206,8 @@ async def test_trellix_connector_get_detection_events(
             + third_request_expected_detections_result
         ]
 
-        assert result == [orjson.dumps(event).decode("utf-8") for event in total_expected_detections_result]
+        assert result == len(total_expected_detections_result)
+        assert pushed_events == [orjson.dumps(event).decode("utf-8") for event in total_expected_detections_result]
 
 
 @pytest.mark.asyncio
@@ -273,6 +276,7 @@ async def test_trellix_connector_get_affectedhosts_events(
         )
 
         result = await connector.get_threat_affectedhosts(threat_id, start_date, end_date)
+        pushed_events = [event for call in connector.push_data_to_intakes.call_args_list for event in call.args[0]]
 
         total_expected_detections_result = [
             {**event, "threatId": threat_id}
@@ -281,7 +285,8 @@ async def test_trellix_connector_get_affectedhosts_events(
             + third_request_expected_detections_result
         ]
 
-        assert result == [orjson.dumps(event).decode("utf-8") for event in total_expected_detections_result]
+        assert result == len(total_expected_detections_result)
+        assert pushed_events == [orjson.dumps(event).decode("utf-8") for event in total_expected_detections_result]
 
 
 @pytest.mark.asyncio
@@ -453,12 +458,14 @@ async def test_trellix_connector_get_threats_events(
             )
 
         result, result_end_date = await connector.populate_threats(end_date=end_date)
+        pushed_events = [event for call in connector.push_data_to_intakes.call_args_list for event in call.args[0]]
 
         assert result_end_date == max(
             [isoparse(threat.attributes.lastDetected) for threat in [threat_response_1, threat_response_2]]
         )
 
-        assert sorted(result) == sorted(
+        assert result == len(pushed_events)
+        assert sorted(pushed_events) == sorted(
             [
                 orjson.dumps(event).decode("utf-8")
                 for event in [threat_response_1.dict(exclude_none=True), threat_response_2.dict(exclude_none=True)]
@@ -466,3 +473,54 @@ async def test_trellix_connector_get_threats_events(
                 + total_detections_expected_result
             ]
         )
+
+
+@pytest.mark.asyncio
+async def test_trellix_connector_populate_threats_expands_threats_concurrently(
+    connector: TrellixEdrConnector,
+    edr_threat_event_response: TrellixResponse[EdrThreatAttributes],
+):
+    """
+    Test that the threats are expanded concurrently, bounded by `max_concurrent_threats`.
+
+    Args:
+        connector: TrellixEdrConnector
+        edr_threat_event_response: TrellixResponse[EdrThreatAttributes]
+    """
+    connector.configuration.max_concurrent_threats = 3
+    connector.configuration.chunk_size = 5
+    end_date = datetime.now(timezone.utc).replace(microsecond=0)
+
+    threats = []
+    for index in range(10):
+        threat = edr_threat_event_response.copy()
+        threat.id = str(index)
+        threats.append(threat)
+
+    running = 0
+    max_running = 0
+
+    async def expand(threat_id, start_date, end_date, batch):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        await batch.add([threat_id])
+        return 1
+
+    connector._trellix_client = MagicMock()
+    connector._trellix_client.get_edr_threats = AsyncMock(side_effect=[threats, []])
+    connector.get_threat_detections = AsyncMock(side_effect=expand)
+    connector.get_threat_affectedhosts = AsyncMock(side_effect=expand)
+
+    result, _ = await connector.populate_threats(end_date=end_date)
+
+    # 10 threats, 10 detections and 10 affected hosts
+    assert result == 30
+    assert connector.get_threat_detections.await_count == 10
+    # each threat runs its detections and affected hosts concurrently
+    assert max_running == 6
+    assert all(len(call.args[0]) <= 10 for call in connector.push_data_to_intakes.call_args_list)
+    with connector.context as cache:
+        assert cache["threats"] == end_date.isoformat()
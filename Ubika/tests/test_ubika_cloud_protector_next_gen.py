@@ -208,3 +208,16 @@ def test_authorization_error(trigger):
 
         with pytest.raises(AuthorizationError):
             trigger.next_batch()
+
+
+def test_filter_processed_events_reports_dedup_cache_stats(trigger):
+    events = [{"logAlertUid": "1"}, {"logAlertUid": "2"}, {"logAlertUid": "1"}]
+
+    with (
+        patch("ubika_modules.connector_ubika_cloud_protector_next_gen.DEDUP_CACHE_HITS") as mock_hits,
+        patch("ubika_modules.connector_ubika_cloud_protector_next_gen.DEDUP_CACHE_MISSES") as mock_misses,
+    ):
+        assert trigger.filter_processed_events(events) == [{"logAlertUid": "1"}, {"logAlertUid": "2"}]
+
+    mock_hits.labels.return_value.inc.assert_called_once_with(1)
+    mock_misses.labels.return_value.inc.assert_called_once_with(2)
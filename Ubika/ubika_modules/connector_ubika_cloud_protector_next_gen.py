@@ -2,10 +2,10 @@ import time
 from collections.abc import Generator
 from datetime import timedelta
 from functools import cached_property
+from pathlib import Path
 
 import orjson
 import requests
-from cachetools import Cache, LRUCache
 from pydantic.v1 import Field
 from sekoia_automation.checkpoint import CheckpointTimestamp, TimeUnit
 from sekoia_automation.connector import Connector, DefaultConnectorConfiguration
@@ -14,7 +14,15 @@ from sekoia_automation.storage import PersistentJSON
 from . import UbikaModule
 from .client import UbikaCloudProtectorNextGenApiClient
 from .client.auth import AuthorizationError
-from .metrics import EVENTS_LAG, FORWARD_EVENTS_DURATION, INCOMING_MESSAGES, OUTCOMING_EVENTS
+from .dedup import DedupCache
+from .metrics import (
+    DEDUP_CACHE_HITS,
+    DEDUP_CACHE_MISSES,
+    EVENTS_LAG,
+    FORWARD_EVENTS_DURATION,
+    INCOMING_MESSAGES,
+    OUTCOMING_EVENTS,
+)
 
 
 class FetchEventsException(Exception):
@@ -47,31 +55,33 @@ class UbikaCloudProtectorNextGenConnector(Connector):
         self.from_timestamp = self.cursor.offset
 
         self.cache_context = PersistentJSON("cache.json", self.data_path)
-        self.cache_size = 1000
-        self.events_cache: Cache = self.load_events_cache()
+        self.cache_path = Path(self.data_path) / "events_cache.bin"
+        self.cache_size = 10_000
+        self.events_cache: DedupCache = self.load_events_cache()
 
-    def load_events_cache(self) -> Cache:
+    def load_events_cache(self) -> DedupCache:
         """
         Load the events cache.
         """
-        cache: Cache = LRUCache(maxsize=self.cache_size)
+        cache = DedupCache(maxsize=self.cache_size)
 
+        if self.cache_path.exists():
+            cache.load(self.cache_path)
+            return cache
+
+        # migrate the cache previously persisted as a list of identifiers in the context
         with self.cache_context as context:
             # load the cache from the context
             events_cache = context.get("events_cache", [])
 
-        for event_hash in events_cache:
-            cache[event_hash] = True
-
+        cache.update(events_cache)
         return cache
 
     def save_events_cache(self) -> None:
         """
         Save the events cache.
         """
-        with self.cache_context as context:
-            # save the events cache to the context
-            context["events_cache"] = list(self.events_cache.keys())
+        self.events_cache.save(self.cache_path)
 
     def filter_processed_events(self, events: list[dict]) -> list[dict]:
         """
@@ -91,6 +101,10 @@ class UbikaCloudProtectorNextGenConnector(Connector):
                 # Add the event id to the cache
                 self.events_cache[event_id] = True
 
+        cache_hits, cache_misses = self.events_cache.pop_stats()
+        DEDUP_CACHE_HITS.labels(intake_key=self.configuration.intake_key).inc(cache_hits)
+        DEDUP_CACHE_MISSES.labels(intake_key=self.configuration.intake_key).inc(cache_misses)
+
         return filtered_events
 
     @cached_property
@@ -243,3 +243,40 @@ def test_stop_consumers(trigger):
 
     assert consumers["something_new"] is not None
     assert consumers["something_new"].stop.called
+
+
+def test_next_batch_reports_dedup_cache_stats(trigger, api_client, response_2):
+    with (
+        requests_mock.Mocker() as mock_requests,
+        patch("vectra_modules.connector_vectra_entity_scoring.time") as mock_time,
+        patch("vectra_modules.connector_vectra_entity_scoring.DEDUP_CACHE_HITS") as mock_hits,
+        patch("vectra_modules.connector_vectra_entity_scoring.DEDUP_CACHE_MISSES") as mock_misses,
+    ):
+        mock_requests.register_uri(
+            "POST",
+            "https://example.portal.vectra.ai:443/oauth2/token",
+            json={
+                "access_token": "foo-token",
+                "token_type": "bearer",
+                "expires_in": 1799,
+            },
+        )
+
+        mock_requests.register_uri(
+            "GET",
+            "https://example.portal.vectra.ai:443/api/v3.4/events/entity_scoring?type=account&limit=500&event_timestamp_gte=2022-10-11T11%3A59%3A59.000000Z",
+            json=response_2,
+        )
+
+        mock_time.time.side_effect = [1666711174.0, 1666711174.0 + 16]
+
+        consumer = VectraEntityScoringConsumer(connector=trigger, entity_type="account", client=api_client)
+        consumer.events_cache.add(1112)
+        consumer.events_cache.pop_stats()
+        consumer.next_batch()
+
+    # the only event was already collected
+    assert trigger.push_events_to_intakes.call_count == 0
+    mock_hits.labels.assert_called_with(intake_key=trigger.configuration.intake_key, type="account")
+    mock_hits.labels.return_value.inc.assert_called_once_with(1)
+    mock_misses.labels.return_value.inc.assert_called_once_with(0)
@@ -0,0 +1,137 @@
+from pathlib import Path
+
+import pytest
+
+from vectra_modules.dedup import DedupCache
+
+
+def test_dedup_cache_add():
+    cache = DedupCache(maxsize=10)
+
+    assert cache.add("event-1") is True
+    assert cache.add("event-2") is True
+    assert cache.add("event-1") is False
+    assert len(cache) == 2
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_dedup_cache_pop_stats():
+    cache = DedupCache(maxsize=10)
+    cache.add("event-1")
+    cache.add("event-1")
+
+    assert cache.pop_stats() == (1, 1)
+    assert cache.pop_stats() == (0, 0)
+
+    assert "event-1" in cache
+    assert cache.pop_stats() == (1, 0)
+
+
+def test_dedup_cache_mapping_interface():
+    cache = DedupCache(maxsize=10)
+    cache["event-1"] = True
+
+    assert "event-1" in cache
+    assert "event-2" not in cache
+
+
+def test_dedup_cache_evicts_oldest_keys():
+    cache = DedupCache(maxsize=3)
+    cache.update(["a", "b", "c", "d"])
+
+    assert len(cache) == 3
+    assert "a" not in cache
+    assert "b" in cache
+    assert "d" in cache
+
+
+def test_dedup_cache_invalid_size():
+    with pytest.raises(ValueError):
+        DedupCache(maxsize=0)
+
+
+def test_dedup_cache_persistence(tmp_path: Path):
+    cache_path = tmp_path / "events_cache.bin"
+    cache = DedupCache(maxsize=3)
+    cache.update(["a", "b", "c", "d"])
+    cache.save(cache_path)
+
+    assert cache_path.stat().st_size == 3 * DedupCache.ITEM_SIZE
+
+    restored = DedupCache(maxsize=2)
+    restored.load(cache_path)
+
+    assert len(restored) == 2
+    assert "b" not in restored
+    assert "c" in restored
+    assert "d" in restored
+
+    # the eviction order is preserved
+    restored.add("e")
+    assert "c" not in restored
+
+
+def test_dedup_cache_load_missing_file(tmp_path: Path):
+    cache = DedupCache(maxsize=3)
+    cache.load(tmp_path / "missing.bin")
+
+    assert len(cache) == 0
+
+
+def test_dedup_cache_flush_appends_new_keys(tmp_path: Path):
+    path = tmp_path / "cache.bin"
+    cache = DedupCache(maxsize=10)
+
+    cache.update(["a", "b"])
+    cache.flush(path)
+    assert path.stat().st_size == 2 * DedupCache.ITEM_SIZE
+
+    cache.add("c")
+    cache.add("a")
+    cache.flush(path)
+    assert path.stat().st_size == 3 * DedupCache.ITEM_SIZE
+
+    # nothing new to write
+    cache.flush(path)
+    assert path.stat().st_size == 3 * DedupCache.ITEM_SIZE
+
+    restored = DedupCache(maxsize=10)
+    restored.load(path)
+    assert {"a", "b", "c"} <= {key for key in "abcd" if key in restored}
+    assert "d" not in restored
+
+
+def test_dedup_cache_flush_compacts_journal(tmp_path: Path):
+    path = tmp_path / "cache.bin"
+    cache = DedupCache(maxsize=3)
+
+    for key in "abcdefg":
+        cache.add(key)
+        cache.flush(path)
+
+    # the journal never holds more than twice the capacity of the ring
+    assert path.stat().st_size <= 2 * 3 * DedupCache.ITEM_SIZE
+
+    restored = DedupCache(maxsize=3)
+    restored.load(path)
+    assert [key in restored for key in "abcdefg"] == [False] * 4 + [True] * 3
+
+
+def test_dedup_cache_flush_rewrites_truncated_journal(tmp_path: Path):
+    path = tmp_path / "cache.bin"
+    cache = DedupCache(maxsize=10)
+    cache.add("a")
+    cache.flush(path)
+
+    # simulate an interrupted write
+    with path.open("ab") as journal:
+        journal.write(b"\x01\x02\x03")
+
+    cache.add("b")
+    cache.flush(path)
+
+    assert path.stat().st_size == 2 * DedupCache.ITEM_SIZE
+    restored = DedupCache(maxsize=10)
+    restored.load(path)
+    assert "a" in restored and "b" in restored
@@ -1,12 +1,12 @@
 import time
 from datetime import datetime, timedelta, timezone
 from functools import cached_property
+from pathlib import Path
 from threading import Event, Lock, Thread
 from typing import Generator
 
 import orjson
 import requests
-from cachetools import Cache, LRUCache
 from dateutil.parser import isoparse
 from pydantic.v1 import Field
 from requests import Response
@@ -16,8 +16,9 @@ from sekoia_automation.storage import PersistentJSON
 
 from . import VectraModule
 from .client import ApiClient
+from .dedup import DedupCache
 from .helpers import format_boolean
-from .metrics import EVENTS_LAG, FORWARD_EVENTS_DURATION, OUTCOMING_EVENTS
+from .metrics import DEDUP_CACHE_HITS, DEDUP_CACHE_MISSES, EVENTS_LAG, FORWARD_EVENTS_DURATION, OUTCOMING_EVENTS
 
 
 class VectraEntityScoringConnectorConfiguration(DefaultConnectorConfiguration):
@@ -42,8 +43,9 @@ class VectraEntityScoringConsumer(Thread):
 
         self._stop_event = Event()
 
-        self.cache_size = 1000
-        self.events_cache: Cache = self.load_events_cache()
+        self.cache_path = Path(self.connector.data_path) / f"events_cache_{self.entity_type}.bin"
+        self.cache_size = 10_000
+        self.events_cache: DedupCache = self.load_events_cache()
         self.cursor = CheckpointCursor(
             path=self.connector.data_path, lock=self.connector.context_lock, subkey=self.entity_type
         )
@@ -92,25 +94,24 @@ class VectraEntityScoringConsumer(Thread):
 
         return most_recent_date_requested
 
-    def load_events_cache(self) -> Cache:
-        cache: Cache = LRUCache(maxsize=self.cache_size)
+    def load_events_cache(self) -> DedupCache:
+        cache = DedupCache(maxsize=self.cache_size)
 
+        if self.cache_path.exists():
+            cache.load(self.cache_path)
+            return cache
+
+        # migrate the cache previously persisted as a list of identifiers in the context
         with self.connector.context_lock:
             with self.connector.cache_context as context:
                 # load the cache from the context
                 events_cache = context.get(self.entity_type, {}).get("events_cache", [])
 
-        for event_hash in events_cache:
-            cache[event_hash] = True
-
+        cache.update(events_cache)
         return cache
 
     def update_cache(self):
-        with self.connector.cache_context as cache, self.connector.context_lock:
-            if self.entity_type not in cache:
-                cache[self.entity_type] = {}
-
-            cache[self.entity_type]["events_cache"] = list(self.events_cache.keys())
+        self.events_cache.save(self.cache_path)
 
     def filter_processed_events(self, events: list[dict]) -> Generator[dict, None, None]:
         for event in events:
@@ -218,6 +219,12 @@ class VectraEntityScoringConsumer(Thread):
         for events in self.fetch_events():
             batch_of_events = [orjson.dumps(event).decode("utf-8") for event in self.filter_processed_events(events)]
 
+            cache_hits, cache_misses = self.events_cache.pop_stats()
+            DEDUP_CACHE_HITS.labels(intake_key=self.configuration.intake_key, type=self.entity_type).inc(cache_hits)
+            DEDUP_CACHE_MISSES.labels(intake_key=self.configuration.intake_key, type=self.entity_type).inc(
+                cache_misses
+            )
+
             # if the batch is full, push it
             if len(batch_of_events) > 0:
                 self.log(
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 from aioresponses import aioresponses
 
@@ -63,10 +65,17 @@ async def test_wiz_issues_connector_with_duplicates(
         mocked_responses.post(tenant_url + "graphql", status=200, payload={"data": alerts_response_with_next_page})
         mocked_responses.post(tenant_url + "graphql", status=200, payload={"data": alerts_response})
 
-        result = await wiz_issues_connector.single_run()
+        with patch("wiz.DEDUP_CACHE_HITS") as mock_hits, patch("wiz.DEDUP_CACHE_MISSES") as mock_misses:
+            result = await wiz_issues_connector.single_run()
 
         assert result == len(alerts_response["issuesV2"]["nodes"]) + len(
             alerts_response_with_next_page["issuesV2"]["nodes"]
         )
 
+        # the events of the page received twice are found in the deduplication cache
+        assert sum(call.args[0] for call in mock_hits.labels.return_value.inc.call_args_list) == len(
+            alerts_response_with_next_page["issuesV2"]["nodes"]
+        )
+        assert sum(call.args[0] for call in mock_misses.labels.return_value.inc.call_args_list) == result
+
         await wiz_issues_connector._wiz_gql_client.close()
@@ -2,10 +2,11 @@ import asyncio
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any, Callable, Optional, Sequence
 
 import orjson
-from cachetools import Cache, LRUCache
+from cachetools import Cache
 from loguru import logger
 from pydantic.v1 import BaseModel, HttpUrl
 from sekoia_automation.aio.connector import AsyncConnector
@@ -14,7 +15,8 @@ from sekoia_automation.connector import Connector, DefaultConnectorConfiguration
 from sekoia_automation.module import Module
 
 from wiz.client.gql_client import WizErrors, WizGqlClient, WizResult, WizServerError
-from wiz.metrics import EVENTS_LAG, FORWARD_EVENTS_DURATION, OUTCOMING_EVENTS
+from wiz.dedup import DedupCache
+from wiz.metrics import DEDUP_CACHE_HITS, DEDUP_CACHE_MISSES, EVENTS_LAG, FORWARD_EVENTS_DURATION, OUTCOMING_EVENTS
 
 
 class WizModuleConfig(BaseModel):
@@ -56,13 +58,18 @@ class WizConnector(AsyncConnector, ABC):
 
         super().__init__(*args, **kwargs)
         self._wiz_gql_client: WizGqlClient | None = None
-        self.events_cache: Cache = LRUCache(maxsize=10000)
+        self.events_cache = DedupCache(maxsize=10000)
+        self.events_cache.load(self.events_cache_path)
         self.last_event_date = CheckpointDatetime(
             path=self.data_path,
             start_at=timedelta(days=7),
             ignore_older_than=timedelta(days=7),
         )
 
+    @property
+    def events_cache_path(self) -> Path:
+        return Path(self.data_path) / "events_cache.bin"
+
     @property
     def wiz_gql_client(self) -> WizGqlClient:  # pragma: no cover
         """
@@ -103,13 +110,13 @@ class WizConnector(AsyncConnector, ABC):
         while has_next_page:
             result = await self.get_events(start_date=_previous_last_event_date, cursor=end_cursor)
 
+            events = filter_collected_events(result.data, lambda event: event["id"], self.events_cache)
+            cache_hits, cache_misses = self.events_cache.pop_stats()
+            DEDUP_CACHE_HITS.labels(intake_key=self.configuration.intake_key).inc(cache_hits)
+            DEDUP_CACHE_MISSES.labels(intake_key=self.configuration.intake_key).inc(cache_misses)
+
             # Push the collected events
-            pushed_events = await self.push_data_to_intakes(
-                [
-                    orjson.dumps(event).decode("utf-8")
-                    for event in filter_collected_events(result.data, lambda event: event["id"], self.events_cache)
-                ]
-            )
+            pushed_events = await self.push_data_to_intakes([orjson.dumps(event).decode("utf-8") for event in events])
 
             self.last_event_date.offset = result.new_last_event_date
 
@@ -118,6 +125,8 @@ class WizConnector(AsyncConnector, ABC):
             has_next_page = result.has_next_page
             end_cursor = result.end_cursor
 
+        self.events_cache.save(self.events_cache_path)
+
         return total_events
 
     async def async_run(self) -> None:  # pragma: no cover
@@ -183,7 +192,7 @@ class WizConnector(AsyncConnector, ABC):
         loop.run_until_complete(self.async_run())
 
 
-def filter_collected_events(events: Sequence[Any], getter: Callable, cache: Cache) -> list[Any]:
+def filter_collected_events(events: Sequence[Any], getter: Callable, cache: Cache | DedupCache) -> list[Any]:
     """
     Filter events that have already been filter_collected_events
 
@@ -8,6 +8,7 @@ from .dockerfile import DockerfileValidator
 from .logo import LogoValidator
 from .main import MainPYValidator
 from .manifest import ManifestValidator
+from .shared_files import SharedFilesValidator
 from .tests import TestsValidator
 from .triggers_json import TriggersJSONValidator
 
@@ -10,6 +10,7 @@ from . import (
     LogoValidator,
     MainPYValidator,
     ManifestValidator,
+    SharedFilesValidator,
     TestsValidator,
     TriggersJSONValidator,
 )
@@ -46,6 +47,7 @@ class ModuleValidator:
                     ConnectorsJSONValidator,
                     TriggersJSONValidator,
                     MainPYValidator,
+                    SharedFilesValidator,
                 ]
             )
 
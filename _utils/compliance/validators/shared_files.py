@@ -0,0 +1,47 @@
+import argparse
+import shutil
+from functools import partial
+from pathlib import Path
+
+from .base import Validator
+from .models import CheckError, CheckResult
+
+SHARED_PATH = Path(__file__).parent.parent.parent / "shared"
+
+# Files copied in the modules from `_utils/shared`: the name of the reference and, by module, the path of the copy
+SHARED_FILES: dict[str, dict[str, str]] = {
+    "dedup.py": {
+        "Akamai": "akamai_modules/dedup.py",
+        "Mimecast": "mimecast_modules/dedup.py",
+        "SentinelOne": "sentinelone_module/dedup.py",
+        "Ubika": "ubika_modules/dedup.py",
+        "Vectra": "vectra_modules/dedup.py",
+        "Wiz": "wiz/dedup.py",
+    },
+}
+
+
+class SharedFilesValidator(Validator):
+    @classmethod
+    def validate(cls, result: CheckResult, args: argparse.Namespace) -> None:
+        if not result.options.get("path"):
+            return
+
+        module_dir: Path = result.options["path"]
+
+        for name, copies in SHARED_FILES.items():
+            if module_dir.name not in copies:
+                continue
+
+            reference = SHARED_PATH / name
+            copy = module_dir / copies[module_dir.name]
+
+            if not copy.is_file() or copy.read_bytes() != reference.read_bytes():
+                result.errors.append(
+                    CheckError(
+                        filepath=copy,
+                        error=f"Copy of the shared file `{name}` differs from `_utils/shared/{name}`",
+                        fix_label=f"Copy `_utils/shared/{name}`",
+                        fix=partial(shutil.copyfile, reference, copy),
+                    )
+                )